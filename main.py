@@ -1,83 +1,119 @@
 import sys
 import os
+import argparse
 import pandas as pd
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src import data_loader, player_analysis, team_analysis, visualizer
+from src import data_loader, player_analysis, team_analysis
+from src.season_context import SeasonContext
+from src.profiling import Profiler
 
-def generate_report(top_players, team_rankings, output_file='ANALYSIS_REPORT.md'):
+def generate_report(top_players, team_rankings, output_file='ANALYSIS_REPORT.md', formats=None,
+                    simulation=None, sims=None):
     """
-    Generates a markdown report with the analysis results.
+    Generates the analysis report (Markdown, plus HTML and CSV tables
+    under output/, or the given formats) with the analysis results.
     """
+    from src import report
     print("Generating report...")
-    
-    predicted_winner = team_rankings.iloc[0]
-    
-    with open(output_file, 'w') as f:
-        f.write("# NFL 2024 Quantitative Analysis Report\n\n")
-        
-        f.write("## Top 10 Most Impressive Players\n")
-        f.write("This ranking is based on a composite score of Advanced Metrics:\n")
-        f.write("- **QBs**: EPA/Play (60%) + CPOE (40%)\n")
-        f.write("- **RBs**: EPA/Play (50%) + Success Rate (50%)\n")
-        f.write("- **WRs/TEs**: EPA/Target (60%) + Expected YAC EPA (40%)\n\n")
-        
-        f.write("| Rank | Player | Position | Team | Impressiveness Score |\n")
-        f.write("|---|---|---|---|---|\n")
-        for i, (index, row) in enumerate(top_players.iterrows()):
-            f.write(f"| {i+1} | {row['player_name']} | {row['position']} | {row['posteam']} | {row['impressiveness_score']:.2f} |\n")
-        
-        f.write("\n![Top 10 Players](output/top_10_players.png)\n\n")
-        
-        f.write("## Super Bowl Prediction Thesis\n")
-        f.write(f"### Predicted Winner: **{predicted_winner['team']}**\n\n")
-        
-        f.write("**Quantitative Reasoning:**\n")
-        f.write("The prediction model values a balanced team with a slight bias towards elite offense.\n")
-        f.write(f"- **Offensive EPA/Play**: {predicted_winner['off_epa']:.3f} (Z-Score: {predicted_winner['off_z']:.2f})\n")
-        f.write(f"- **Defensive EPA/Play**: {predicted_winner['def_epa']:.3f} (Z-Score: {predicted_winner['def_z']:.2f})\n")
-        f.write(f"- **Composite Prediction Score**: {predicted_winner['prediction_score']:.2f}\n\n")
-        
-        f.write("Historically, teams with top-tier efficiency in both passing offense and pass defense correlate strongly with Super Bowl success.\n")
-        f.write(f"The **{predicted_winner['team']}** currently exhibit the best combination of these metrics.\n\n")
-        
-        f.write("### Team Tiers\n")
-        f.write("The following chart visualizes the offensive vs defensive efficiency of all teams.\n")
-        f.write("![Team Tiers](output/team_tiers.png)\n\n")
-        
-        f.write("### QB Efficiency\n")
-        f.write("Quarterback play is the single most important factor. Here is how the league's QBs stack up:\n")
-        f.write("![QB Efficiency](output/qb_efficiency.png)\n")
-        
+    formats = report.FORMATS if formats is None else formats
+    report.write_analysis_report(top_players, team_rankings, output_file, formats=formats,
+                                 simulation=simulation, sims=sims)
     print(f"Report generated at {output_file}")
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NFL quantitative analysis report.")
+    parser.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+    parser.add_argument('--refresh', action='store_true', help="Re-download seasons even if they are cached.")
+    parser.add_argument('--profile', nargs='?', const='output/profile.json', default=None, metavar='PATH',
+                        help="Time each stage and write a JSON trace (default output/profile.json).")
+    parser.add_argument('--cprofile-dir', default=None,
+                        help="With --profile, also dump per-stage cProfile stats into this directory.")
+    parser.add_argument('--all-charts', action='store_true',
+                        help="Also draw a chart per team and per week (only changed charts are redrawn).")
+    parser.add_argument('--force-charts', action='store_true', help="Redraw charts even if they are up to date.")
+    parser.add_argument('--report-formats', default=None,
+                        help="Comma-separated report outputs: md, html, csv (default all).")
+    parser.add_argument('--league-report', action='store_true',
+                        help="Also write output/LEAGUE_REPORT.* listing every qualifying player and team.")
+    parser.add_argument('--team-ratings', choices=team_analysis.METHODS, default='raw',
+                        help="Score teams on raw mean EPA or on opponent-adjusted ratings.")
+    parser.add_argument('--simulate', type=int, default=0, metavar='N',
+                        help="Simulate the season and playoffs N times and predict the most likely champion.")
+    args = parser.parse_args(argv)
+    load_opts = {'offline': args.offline, 'refresh': args.refresh}
+    profiler = Profiler(enabled=bool(args.profile), cprofile_dir=args.cprofile_dir)
+
     # 1. Load Data
-    pbp = data_loader.load_data([2024])
+    schemas = [player_analysis.PBP_COLUMNS, team_analysis.PBP_COLUMNS]
+    if args.all_charts:
+        schemas.append(team_analysis.WEEKLY_PBP_COLUMNS)
+    columns = data_loader.schema_columns(*schemas)
+    # Play-by-play (and the schedule) are fetched concurrently
+    with profiler.stage('load_data') as record:
+        kinds = ('pbp', 'schedule') if args.simulate else ('pbp',)
+        datasets = data_loader.load_all([2024], kinds=kinds, columns=columns, **load_opts)
+        pbp = datasets['pbp']
+        record['rows'] = None if pbp is None else len(pbp)
     if pbp is None:
         return
-    
-    roster = data_loader.load_roster([2024])
+
+    with profiler.stage('load_roster') as record:
+        roster = data_loader.load_all([2024], kinds=('roster',), **load_opts)['roster']
+        record['rows'] = None if roster is None else len(roster)
+    ctx = SeasonContext(pbp)
     
     # 2. Player Analysis
-    top_10, qb_stats, all_players = player_analysis.analyze_players(pbp, roster)
+    with profiler.stage('analyze_players', rows=len(pbp)):
+        top_10, qb_stats, all_players = player_analysis.analyze_players(ctx, roster)
     print("\nTop 10 Players:")
     print(top_10[['player_name', 'position', 'impressiveness_score']])
     
     # 3. Team Analysis
-    team_rankings = team_analysis.analyze_teams(pbp)
+    with profiler.stage('analyze_teams', rows=len(pbp)):
+        team_rankings = team_analysis.analyze_teams(ctx, method=args.team_ratings)
     print("\nTop 5 Teams:")
     print(team_rankings[['team', 'off_epa', 'def_epa', 'prediction_score']].head())
+
+    simulation = None
+    if args.simulate and datasets['schedule'] is not None:
+        from src import simulator
+        with profiler.stage('simulate_season', rows=args.simulate):
+            simulation = simulator.simulate_season(team_rankings, datasets['schedule'], 2024, args.simulate)
+        print("\nChampionship Probabilities:")
+        print(simulation[['team', 'mean_wins', 'p_playoffs', 'p_super_bowl', 'p_champion']].head())
     
     # 4. Visualization
-    visualizer.plot_top_players(top_10)
-    visualizer.plot_qb_efficiency(qb_stats)
-    visualizer.plot_team_tiers(team_rankings) # Pass full stats for plotting
+    # matplotlib/seaborn are only imported once the analysis has run, so
+    # importing main (as src/cli.py does) stays light
+    from src import visualizer
+    charts = [
+        (visualizer.plot_top_players, top_10),
+        (visualizer.plot_qb_efficiency, qb_stats),
+        (visualizer.plot_team_tiers, team_rankings), # Pass full stats for plotting
+    ]
+    if args.all_charts:
+        weekly = team_analysis.context_weekly_team_stats(ctx)
+        charts += visualizer.team_chart_jobs(weekly) + visualizer.week_chart_jobs(weekly)
+    # One plot_* stage per chart (timed in the worker that drew it), nested in render_charts
+    with profiler.stage('render_charts', rows=sum(len(chart[1]) for chart in charts)):
+        visualizer.render_charts(charts, force=args.force_charts, profiler=profiler)
     
     # 5. Generate Report
-    generate_report(top_10, team_rankings)
+    with profiler.stage('generate_report', rows=len(all_players) + len(team_rankings)):
+        from src import report
+        formats = tuple(args.report_formats.split(',')) if args.report_formats else report.FORMATS
+        generate_report(top_10, team_rankings, formats=formats, simulation=simulation, sims=args.simulate)
+        if args.league_report:
+            report.write_league_report(all_players, team_rankings, formats=formats)
+
+    if args.profile:
+        profiler.write(args.profile)
+        print("\nStage timings:")
+        print(profiler.summary())
+        print(f"Profile trace written to {args.profile}")
 
 if __name__ == "__main__":
     main()
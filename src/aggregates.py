@@ -0,0 +1,123 @@
+import pandas as pd
+
+# Metrics tracked for every player and team in the running aggregate state.
+TRACKED_METRICS = ['epa', 'cpoe', 'success', 'xyac_epa']
+
+# Columns of a partial aggregate that are carried over with 'first' when
+# partials are merged; everything else is an additive sum or count. The
+# player id/name columns are carried by tables keyed on PlayerIndex keys.
+FIRST_COLUMNS = ['posteam'] + [f'{role}_player_{field}' for role in ('passer', 'rusher', 'receiver')
+                               for field in ('id', 'name')]
+
+def _group_first(grouped, out, columns):
+    """
+    Adds the first non-null value per group of each of columns to out (a
+    frame indexed like the groups). pandas falls back to a pure-Python
+    loop for 'first' on categoricals, so those take the first of their
+    codes instead and are rebuilt afterwards.
+    """
+    for col in columns:
+        values = grouped.obj[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.where(values.notna())
+            first = grouped.obj.assign(**{col: codes}).groupby(
+                grouped.keys, level=grouped.level, sort=grouped.sort, observed=True)[col].first()
+            first = pd.Categorical.from_codes(first.fillna(-1).astype(int), dtype=values.dtype)
+        else:
+            first = grouped[col].first()
+        out[col] = first
+    return out
+
+def partial_stats(df, keys, metrics, first=()):
+    """
+    Per-key partial sums for one chunk of plays.
+
+    For every metric the result holds '<metric>_sum', '<metric>_sq' (sum
+    of squares) and '<metric>_n' (non-null count), plus 'plays' (row
+    count) and the first non-null value of each column in first.
+    Partials from different chunks can be merged with combine_partials
+    and turned into means with finalize.
+    """
+    values = df[metrics].astype('float64')
+    for key in keys:
+        values[key] = df[key]
+    for col in first:
+        values[col] = df[col]
+
+    squares = [f'{metric}_sq' for metric in metrics]
+    for metric, square in zip(metrics, squares):
+        values[square] = values[metric] ** 2
+
+    # One cythonized sum and count over all metrics (a named agg per
+    # column is far slower on the many small chunks of a streamed season)
+    grouped = values.groupby(keys, observed=True)
+    sums = grouped[metrics + squares].sum()
+    counts = grouped[metrics].count()
+    out = pd.DataFrame(index=sums.index)
+    for metric, square in zip(metrics, squares):
+        out[f'{metric}_sum'] = sums[metric]
+        out[square] = sums[square]
+        out[f'{metric}_n'] = counts[metric]
+    out['plays'] = grouped.size()
+    return _group_first(grouped, out, first)
+
+def partial_columns(metrics):
+    """
+    The additive columns partial_stats produces for metrics, in order.
+    """
+    return [f'{metric}_{part}' for metric in metrics for part in ('sum', 'sq', 'n')] + ['plays']
+
+def rollup(table, keys, metrics, prefix=''):
+    """
+    Sums a table of finer-grained partials (e.g. one row per team per game)
+    up to keys, giving what partial_stats would have built from the plays.
+    prefix selects a set of prefixed partial columns ('pass_' for
+    'pass_epa_sum', ...), which come back without the prefix.
+    """
+    columns = partial_columns(metrics)
+    out = table.groupby(keys, observed=True)[[prefix + col for col in columns]].sum()
+    out.columns = columns
+    return out
+
+def variance(partial, metric):
+    """
+    Per-key sample variance of a metric, from its sums and sums of squares.
+    """
+    n = partial[f'{metric}_n']
+    mean = partial[f'{metric}_sum'] / n
+    return (partial[f'{metric}_sq'] - n * mean ** 2) / (n - 1)
+
+def combine_partials(partials):
+    """
+    Merges partial aggregates (from partial_stats) keyed on the same index.
+    None entries are skipped, so a running total can start from None.
+    """
+    partials = [p for p in partials if p is not None]
+    if not partials:
+        return None
+    if len(partials) == 1:
+        return partials[0]
+    stacked = pd.concat(partials)
+    first = [col for col in stacked.columns if col in FIRST_COLUMNS]
+    levels = list(range(stacked.index.nlevels))
+    grouped = stacked.groupby(level=levels, sort=False, observed=True)
+    out = grouped[[col for col in stacked.columns if col not in first]].sum()
+    return _group_first(grouped, out, first)[stacked.columns]
+
+def finalize(partial, metrics, spread=False):
+    """
+    Turns a partial aggregate into per-key means, with 'play_id' holding
+    the play count (matching the columns of the original per-play agg).
+    With spread=True, '<metric>_sd' holds each metric's per-play standard
+    deviation, from the sums of squares.
+    """
+    out = pd.DataFrame(index=partial.index)
+    for metric in metrics:
+        out[metric] = partial[f'{metric}_sum'] / partial[f'{metric}_n']
+        if spread:
+            out[f'{metric}_sd'] = variance(partial, metric) ** 0.5
+    out['play_id'] = partial['plays']
+    for col in FIRST_COLUMNS:
+        if col in partial.columns:
+            out[col] = partial[col]
+    return out.reset_index()
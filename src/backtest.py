@@ -0,0 +1,173 @@
+import pandas as pd
+import numpy as np
+import argparse
+import functools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Allow running as a script (python src/backtest.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_loader, team_analysis
+
+# Columns needed to build the per-season team aggregates.
+PBP_COLUMNS = ['season_type'] + team_analysis.PBP_COLUMNS
+
+def build_season_stats(pbp):
+    """
+    Regular-season offensive and defensive EPA/play per team. Playoff
+    games are excluded so the champion's own run does not leak in.
+    """
+    reg = pbp[pbp['season_type'] == 'REG']
+    team_stats = team_analysis.rank_teams(team_analysis.aggregate_teams(reg))
+    team_stats['team'] = team_stats['team'].astype(object)
+    return team_stats[['team', 'off_epa', 'def_epa']].reset_index(drop=True)
+
+def load_season_stats(year, **kwargs):
+    """
+    Returns the team aggregates for one season, cached next to the season
+    data so repeated backtests never touch play-by-play again.
+    """
+    def build():
+        pbp = data_loader.load_season('pbp', year, columns=data_loader.schema_columns(PBP_COLUMNS), **kwargs)
+        return build_season_stats(pbp)
+    return data_loader.load_table('team_season_stats', year, build)
+
+def find_champions(schedule):
+    """
+    Maps season -> Super Bowl winner from schedule results.
+    """
+    sb = schedule[(schedule['game_type'] == 'SB') & schedule['home_score'].notna()]
+    winners = np.where(sb['home_score'] > sb['away_score'], sb['home_team'], sb['away_team'])
+    return dict(zip(sb['season'].astype(int), winners))
+
+def weight_grid(points=100):
+    """
+    Offense/defense weight pairs with offense weight spread evenly over
+    [0, 1] and the defense weight making up the rest. The current default
+    weighting (team_analysis.OFF_WEIGHT) is always included.
+    """
+    off = np.union1d(np.linspace(0, 1, points), [team_analysis.OFF_WEIGHT])
+    return np.column_stack([off, 1 - off])
+
+def evaluate_season(season_stats, champion, weights):
+    """
+    Ranks the champion under every weight pair at once.
+
+    Returns one row per weight pair with the champion's rank (1 = the
+    model would have picked the champion) and the team it would have picked.
+    """
+    off_z = (season_stats['off_epa'] - season_stats['off_epa'].mean()) / season_stats['off_epa'].std()
+    def_z = (season_stats['def_epa'] - season_stats['def_epa'].mean()) / season_stats['def_epa'].std()
+    z = np.column_stack([off_z, -def_z])          # teams x 2
+    scores = z @ np.asarray(weights).T            # teams x weights
+
+    teams = season_stats['team'].to_numpy()
+    champ_rows = np.flatnonzero(teams == champion)
+    if len(champ_rows) == 0:
+        champ_rank = np.full(len(weights), np.nan)
+    else:
+        champ_rank = 1 + (scores > scores[champ_rows[0]]).sum(axis=0)
+
+    return pd.DataFrame({
+        'off_weight': weights[:, 0],
+        'def_weight': weights[:, 1],
+        'champion': champion,
+        'predicted': teams[scores.argmax(axis=0)],
+        'champion_rank': champ_rank,
+    })
+
+def _run_task(task):
+    season, season_stats, champion, weights = task
+    result = evaluate_season(season_stats, champion, weights)
+    result.insert(0, 'season', season)
+    return result
+
+def summarize(details):
+    """
+    Hit-rate and rank-error table per weight pair, best first.
+    """
+    details = details.assign(
+        hit=details['champion_rank'] == 1,
+        top4=details['champion_rank'] <= 4,
+        rank_error=details['champion_rank'] - 1,
+    )
+    summary = details.groupby(['off_weight', 'def_weight']).agg(
+        seasons=('season', 'nunique'),
+        hit_rate=('hit', 'mean'),
+        top4_rate=('top4', 'mean'),
+        mean_rank_error=('rank_error', 'mean'),
+        median_rank_error=('rank_error', 'median'),
+    ).reset_index()
+    return summary.sort_values(['hit_rate', 'mean_rank_error'], ascending=[False, True], ignore_index=True)
+
+def run_backtest(years, weights=None, workers=None, chunk_size=25, **kwargs):
+    """
+    Evaluates the prediction_score ranking against actual champions for
+    every season in years and every weight pair (default: weight_grid()).
+
+    Season loads (the expensive part: play-by-play to per-team stats, or
+    the cached stats) and then chunks of the weight grid per season fan
+    out across one process pool (workers=1 runs in-process). Returns
+    (summary, details).
+    """
+    weights = weight_grid() if weights is None else np.asarray(weights, dtype=float)
+
+    schedule = data_loader.load_schedule(list(years), **kwargs)
+    if schedule is None:
+        return None, None
+    champions = find_champions(schedule)
+    seasons = [year for year in years if year in champions]
+    missing = sorted(set(years) - set(seasons))
+    if missing:
+        print(f"No Super Bowl result for {missing}; skipping.")
+
+    print(f"Backtesting {len(seasons)} seasons x {len(weights)} weightings...")
+    load = functools.partial(load_season_stats, **kwargs)
+
+    def tasks(season_stats):
+        # Per-season stats are ~32 rows, so they travel with each task
+        return [
+            (year, stats, champions[year], weights[start:start + chunk_size])
+            for year, stats in zip(seasons, season_stats)
+            for start in range(0, len(weights), chunk_size)
+        ]
+
+    if workers == 1:
+        results = [_run_task(task) for task in tasks([load(year) for year in seasons])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            season_stats = list(pool.map(load, seasons))
+            results = list(pool.map(_run_task, tasks(season_stats)))
+
+    details = pd.concat(results, ignore_index=True)
+    return summarize(details), details
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the Super Bowl predictor over past seasons.")
+    parser.add_argument('--start', type=int, default=2004)
+    parser.add_argument('--end', type=int, default=2023)
+    parser.add_argument('--grid', type=int, default=100, help="Number of offense/defense weightings.")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+    parser.add_argument('--output', default='output/backtest.csv')
+    args = parser.parse_args()
+
+    summary, details = run_backtest(range(args.start, args.end + 1), weight_grid(args.grid),
+                                    workers=args.workers, offline=args.offline)
+    if summary is None:
+        return
+
+    print("\nBest weightings:")
+    print(summary.head(10).to_string(index=False))
+    current = summary.loc[[(summary['off_weight'] - team_analysis.OFF_WEIGHT).abs().idxmin()]]
+    print("\nClosest to current weighting:")
+    print(current.to_string(index=False))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    summary.to_csv(args.output, index=False)
+    print(f"\nSummary written to {args.output}")
+
+if __name__ == "__main__":
+    main()
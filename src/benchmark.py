@@ -0,0 +1,207 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Allow running as a script (python src/benchmark.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import (data_loader, synthetic, player_analysis, team_analysis,
+                 championship_analysis, game_tables, visualizer)
+from src.profiling import Profiler
+
+BASELINE_PATH = os.path.join(data_loader.ROOT_DIR, 'benchmarks', 'baseline.json')
+
+@contextlib.contextmanager
+def measure(profiler, name, rows):
+    """
+    Times one stage with the profiler while silencing its prints.
+    """
+    with profiler.stage(name, rows) as record, contextlib.redirect_stdout(io.StringIO()):
+        yield record
+
+def run_pipeline(seasons, roster=None, seed=0):
+    """
+    Benchmarks each pipeline stage on a synthetic frame of the given
+    number of seasons. Returns {stage: record}.
+    """
+    pbp, roster_df, _ = synthetic.generate(range(2024 - seasons + 1, 2025), roster, seed=seed)
+    rows = len(pbp)
+    columns = data_loader.schema_columns(
+        player_analysis.PBP_COLUMNS, team_analysis.PBP_COLUMNS, championship_analysis.PBP_COLUMNS)
+    profiler = Profiler()
+
+    with measure(profiler, 'prepare', rows):
+        pbp = data_loader.optimize_dtypes(pbp[columns].copy())
+    with measure(profiler, 'analyze_players', rows):
+        top_10, qb_stats, _ = player_analysis.analyze_players(pbp, roster_df)
+    with measure(profiler, 'analyze_teams', rows):
+        team_rankings = team_analysis.analyze_teams(pbp)
+    with measure(profiler, 'analyze_recent_form', rows):
+        championship_analysis.analyze_recent_form(pbp, None)
+
+    # The streamed path (data_loader.iter_data(by_week=True)): weekly chunks
+    # folded into running partial sums
+    weeks = [week for _, week in pbp.groupby(['season', 'week'], sort=True)]
+    with measure(profiler, 'stream_players', rows):
+        player_analysis.analyze_players(iter(weeks), roster_df)
+    with measure(profiler, 'stream_teams', rows):
+        team_analysis.analyze_teams(iter(weeks))
+    del weeks
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        with measure(profiler, 'visualizer', len(top_10) + len(qb_stats) + len(team_rankings)):
+            visualizer.render_charts([
+                (visualizer.plot_top_players, top_10),
+                (visualizer.plot_qb_efficiency, qb_stats),
+                (visualizer.plot_team_tiers, team_rankings),
+            ], output_dir)
+
+    return {record.pop('stage'): record for record in profiler.stages}
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Lists stages whose wall time or peak RSS regressed by more than
+    tolerance (a fraction) against the baseline.
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage, record in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if base is None:
+                continue
+            for metric in ('wall_s', 'peak_rss_mb'):
+                if base[metric] and record[metric] > base[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{size} seasons / {stage}: {metric} {record[metric]} vs baseline {base[metric]}")
+    return regressions
+
+CLI_PATH = os.path.join(data_loader.ROOT_DIR, 'src', 'cli.py')
+
+# Modules a command that neither plots, downloads nor fits ratings must not import.
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'nfl_data_py', 'scipy']
+
+# CLI startup budgets: name -> (cli.py arguments, median wall seconds,
+# top-level modules the command must not import). rank-teams runs
+# against a cache that already holds the season's game table.
+STARTUP_BUDGETS = {
+    'help': (['--help'], 0.3, HEAVY_MODULES + ['pandas', 'numpy']),
+    'rank-teams': (['rank-teams', '--offline', '--season', '2024'], 2.0, HEAVY_MODULES),
+}
+
+# Runs cli.py and writes the names of the modules it imported to argv[1].
+_STARTUP_RUNNER = """
+import atexit, json, runpy, sys
+path = sys.argv.pop(1)
+atexit.register(lambda: json.dump(sorted(sys.modules), open(path, 'w')))
+sys.argv[0] = {cli!r}
+runpy.run_path(sys.argv[0], run_name='__main__')
+"""
+
+def time_startup(args, cache_dir, runs=5):
+    """
+    Runs cli.py with args in fresh interpreters. Returns (median wall
+    seconds, set of top-level modules imported).
+    """
+    env = dict(os.environ, NFL_CACHE_DIR=cache_dir, NFL_FIXTURE_DIR=cache_dir)
+    runner = _STARTUP_RUNNER.format(cli=CLI_PATH)
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        modules_path = os.path.join(tmp, 'modules.json')
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', runner, modules_path, *args], env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            times.append(time.perf_counter() - start)
+        with open(modules_path) as f:
+            modules = {name.split('.')[0] for name in json.load(f)}
+    return statistics.median(times), modules
+
+def check_startup(runs=5, seed=0):
+    """
+    Times every STARTUP_BUDGETS command against a synthetic season cache.
+    Returns a list of budget violations.
+    """
+    failures = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pbp, _, _ = synthetic.generate([2024], seed=seed)
+        data_loader._store_season(pbp, 'pbp', 2024, cache_dir)
+        game_tables.load_season_game_table(2024, offline=True, cache_dir=cache_dir)
+
+        for name, (args, budget, forbidden) in STARTUP_BUDGETS.items():
+            wall, modules = time_startup(args, cache_dir, runs)
+            imported = sorted(modules.intersection(forbidden))
+            print(f"  {name:<12} {wall:>6.3f}s  (budget {budget:.1f}s)"
+                  f"{'  imports ' + ', '.join(imported) if imported else ''}")
+            if wall > budget:
+                failures.append(f"{name}: {wall:.3f}s over its {budget:.1f}s budget")
+            if imported:
+                failures.append(f"{name}: imports {', '.join(imported)}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic data.")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 5],
+                        help="Synthetic sizes to run, in seasons (1-25).")
+    parser.add_argument('--roster', type=synthetic.parse_roster, default=None, help="e.g. QB=2,RB=3,WR=5,TE=2")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline.")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--output', default=None, help="Also write results as JSON here.")
+    parser.add_argument('--startup', action='store_true',
+                        help="Check CLI startup time and imports against STARTUP_BUDGETS instead.")
+    parser.add_argument('--runs', type=int, default=5, help="Startup runs per command (the median is used).")
+    args = parser.parse_args()
+
+    if args.startup:
+        print("Checking CLI startup...")
+        failures = check_startup(args.runs, args.seed)
+        if failures:
+            print("\nOver budget:")
+            for line in failures:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nStartup within budget.")
+        return
+
+    results = {}
+    for seasons in args.seasons:
+        print(f"Benchmarking {seasons} season(s)...")
+        results[str(seasons)] = run_pipeline(seasons, args.roster, args.seed)
+        for stage, record in results[str(seasons)].items():
+            print(f"  {stage:<22} {record['wall_s']:>8.3f}s  peak {record['peak_rss_mb']:>8.1f} MB  "
+                  f"{record['rows_per_s'] or 0:>12,} rows/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (run with --save-baseline).")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
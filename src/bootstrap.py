@@ -0,0 +1,283 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Allow running as a script (python src/bootstrap.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_loader, player_analysis, team_analysis
+from src.season_context import SeasonContext
+
+# Resamples drawn per vectorized batch inside a task (bounds peak memory),
+# and per pool task (fixed, so results do not depend on the worker count).
+BATCH_SIZE = 64
+TASK_SIZE = 256
+
+def group_sample(plays, keys, metrics, min_plays=0):
+    """
+    Lays out the plays of each group with at least min_plays plays
+    contiguously, so a group's plays can be resampled by offset.
+
+    Returns a dict with the group labels, per-row group codes, group
+    start offsets and sizes, and the metric values (rows x metrics).
+    """
+    plays = plays.dropna(subset=keys)
+    codes = plays.groupby(keys, observed=True, sort=True).ngroup().to_numpy()
+    sizes = np.bincount(codes)
+    keep = np.flatnonzero(sizes >= min_plays)
+    remap = np.full(len(sizes), -1)
+    remap[keep] = np.arange(len(keep))
+    codes = remap[codes]
+    rows = codes >= 0
+    order = np.argsort(codes[rows], kind='stable')
+    codes = codes[rows][order]
+    values = plays[metrics].to_numpy(dtype=float)[rows][order]
+
+    first = plays[rows].iloc[order]
+    starts = np.searchsorted(codes, np.arange(len(keep)))
+    sizes = sizes[keep]
+    labels = first.iloc[starts][keys + (['posteam'] if 'posteam' not in keys and 'posteam' in plays else [])]
+    missing = np.isnan(values)
+    return {
+        'labels': labels.reset_index(drop=True),
+        'codes': codes,
+        'starts': starts,
+        'sizes': sizes,
+        'metrics': metrics,
+        # Missing values are summed as 0 and left out of the counts.
+        'filled': np.where(missing, 0.0, values),
+        'valid': (~missing).astype(float),
+        'has_missing': missing.any(axis=0),
+        # Per-row bounds used when drawing resampled offsets.
+        'row_size': sizes[codes].astype(np.float32),
+        'row_last': (sizes[codes] - 1).astype(np.int32),
+        'row_start': starts[codes].astype(np.int32),
+    }
+
+def _group_means(sample, offsets):
+    """
+    Per-group means of every metric for a (batch x rows) array of row
+    offsets, skipping missing values. Returns batch x groups x metrics.
+    """
+    batch = offsets.shape[0]
+    n_groups = len(sample['sizes'])
+    key = ('flat', batch)
+    if key not in sample:
+        sample[key] = (np.arange(batch)[:, None] * n_groups + sample['codes']).ravel()
+    flat = sample[key]
+    means = np.empty((batch, n_groups, len(sample['metrics'])))
+    for m in range(len(sample['metrics'])):
+        total = np.bincount(flat, sample['filled'][offsets, m].ravel(), batch * n_groups)
+        if sample['has_missing'][m]:
+            count = np.bincount(flat, sample['valid'][offsets, m].ravel(), batch * n_groups)
+        else:
+            count = np.tile(sample['sizes'], batch)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means[..., m] = (total / count).reshape(batch, n_groups)
+    return means
+
+def _zscore(x):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (x - np.nanmean(x, axis=1, keepdims=True)) / np.nanstd(x, axis=1, ddof=1, keepdims=True)
+
+def _player_scores(samples, offsets):
+    scores = []
+    for name, weights in player_analysis.SCORE_WEIGHTS.items():
+        means = _group_means(samples[name], offsets[name])
+        score = 0.0
+        for m, metric in enumerate(samples[name]['metrics']):
+            values = means[..., m]
+            if metric in player_analysis.FILL_ZERO.get(name, []):
+                values = np.nan_to_num(values, nan=0.0)
+            score = score + weights[metric] * _zscore(values)
+        scores.append(score)
+    return np.concatenate(scores, axis=1)
+
+def _team_scores(samples, offsets, off_weight, def_weight, def_order):
+    off = _group_means(samples['off'], offsets['off'])[..., 0]
+    dfn = _group_means(samples['def'], offsets['def'])[..., def_order, 0]
+    return off_weight * _zscore(off) - def_weight * _zscore(dfn)
+
+def _draw(sample, rng, batch):
+    """
+    Resampled row offsets: each row is replaced by a uniformly drawn row
+    of the same group, for batch resamples at once.
+    """
+    draws = rng.random((batch, len(sample['codes'])), dtype=np.float32)
+    draws *= sample['row_size']
+    offsets = draws.astype(np.int32)
+    np.minimum(offsets, sample['row_last'], out=offsets)  # float32 rounding can hit the size
+    offsets += sample['row_start']
+    return offsets
+
+def _identity(sample):
+    return np.arange(len(sample['codes']))[None, :]
+
+# Samples shared with pool workers once, via the initializer.
+_SAMPLES = {}
+
+def _init_worker(samples):
+    global _SAMPLES
+    _SAMPLES = samples
+
+def _run_task(task):
+    kind, seed, count, options = task
+    rng = np.random.default_rng(seed)
+    out = []
+    for start in range(0, count, BATCH_SIZE):
+        batch = min(BATCH_SIZE, count - start)
+        offsets = {name: _draw(sample, rng, batch) for name, sample in _SAMPLES.items()}
+        if kind == 'players':
+            out.append(_player_scores(_SAMPLES, offsets))
+        else:
+            out.append(_team_scores(_SAMPLES, offsets, **options))
+    return np.concatenate(out)
+
+def _resample(kind, samples, resamples, seed, workers, options=None):
+    """
+    Runs resamples across a process pool (workers=1 runs in-process).
+    Task seeds are spawned from seed, so results do not depend on workers.
+    """
+    counts = [min(TASK_SIZE, resamples - start) for start in range(0, resamples, TASK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    tasks = [(kind, s, count, options or {}) for s, count in zip(seeds, counts)]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        _init_worker(samples)
+        results = [_run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(samples,)) as pool:
+            results = list(pool.map(_run_task, tasks))
+    return np.concatenate(results)
+
+def summarize_scores(labels, observed, draws, top=10, alpha=0.05):
+    """
+    Confidence intervals and rank distribution per entity.
+
+    Returns (summary, rank_probs): summary has the observed score, the
+    [alpha/2, 1 - alpha/2] percentile interval, mean and median rank and
+    P(top N); rank_probs has P(rank == k) for k = 1..top.
+    """
+    filled = np.where(np.isnan(draws), -np.inf, draws)
+    ranks = np.empty_like(filled, dtype=np.int64)
+    order = np.argsort(-filled, axis=1, kind='stable')
+    np.put_along_axis(ranks, order, np.arange(1, draws.shape[1] + 1)[None, :], axis=1)
+
+    top = min(top, draws.shape[1])
+    in_top = ranks <= top
+    entity = np.broadcast_to(np.arange(draws.shape[1]), ranks.shape)[in_top]
+    counts = np.bincount(entity * top + (ranks[in_top] - 1), minlength=draws.shape[1] * top)
+    probs = counts.reshape(draws.shape[1], top) / draws.shape[0]
+
+    summary = labels.copy()
+    summary['score'] = observed
+    summary['ci_low'] = np.nanpercentile(draws, 100 * alpha / 2, axis=0)
+    summary['ci_high'] = np.nanpercentile(draws, 100 * (1 - alpha / 2), axis=0)
+    summary['mean_rank'] = ranks.mean(axis=0)
+    summary['median_rank'] = np.median(ranks, axis=0)
+    summary[f'p_top{top}'] = in_top.mean(axis=0)
+    rank_probs = pd.concat([labels, pd.DataFrame(probs, columns=[f'rank_{k}' for k in range(1, top + 1)])], axis=1)
+
+    order = np.argsort(-np.nan_to_num(observed, nan=-np.inf), kind='stable')
+    return summary.iloc[order].reset_index(drop=True), rank_probs.iloc[order].reset_index(drop=True)
+
+def _views(pbp):
+    if isinstance(pbp, SeasonContext):
+        return pbp.pbp, pbp.plays, pbp.run_plays, pbp.pass_plays
+    plays = pbp[pbp['play_type'].isin(['pass', 'run'])]
+    return pbp, plays, plays[plays['play_type'] == 'run'], plays[plays['play_type'] == 'pass']
+
+def bootstrap_players(pbp, resamples=10000, seed=0, workers=None, top=10, alpha=0.05, roster=None):
+    """
+    Bootstraps plays within each qualifying player and recomputes the
+    impressiveness composites (z-scores within position) per resample.
+
+    pbp may be a DataFrame or a SeasonContext; with a roster (DataFrame or
+    PlayerIndex) players are labelled by position as in
+    player_analysis.rank_players. Returns (summary, rank_probs) as
+    described in summarize_scores, ranked across positions.
+    """
+    _, plays, run_plays, pass_plays = _views(pbp)
+    sources = {'qb': plays, 'rb': run_plays, 'wr': pass_plays}
+    index = player_analysis.player_index(roster)
+    samples = {}
+    labels = []
+    for name, weights in player_analysis.SCORE_WEIGHTS.items():
+        keys = player_analysis.PLAYER_GROUPS[name][0]
+        samples[name] = group_sample(sources[name], keys, list(weights), player_analysis.MIN_PLAYS[name])
+        group_labels = player_analysis.roster_positions(samples[name]['labels'], name, index)
+        labels.append(pd.DataFrame({
+            'player_id': group_labels[keys[0]].astype(object).to_numpy(),
+            'player_name': group_labels[keys[1]].astype(object).to_numpy(),
+            'position': group_labels['position'].to_numpy(),
+            'posteam': group_labels['posteam'].astype(object).to_numpy(),
+        }))
+    labels = pd.concat(labels, ignore_index=True)
+
+    observed = _player_scores(samples, {name: _identity(s) for name, s in samples.items()})[0]
+    draws = _resample('players', samples, resamples, seed, workers)
+    summary, rank_probs = summarize_scores(labels, observed, draws, top, alpha)
+    return summary.rename(columns={'score': 'impressiveness_score'}), rank_probs
+
+def bootstrap_teams(pbp, resamples=10000, seed=0, workers=None, top=5, alpha=0.05,
+                    off_weight=team_analysis.OFF_WEIGHT, def_weight=team_analysis.DEF_WEIGHT):
+    """
+    Bootstraps plays within each offense and defense and recomputes the
+    prediction score per resample. Returns (summary, rank_probs); rank_1
+    is the probability the team would be the predicted champion.
+    """
+    pbp, _, _, _ = _views(pbp)
+    samples = {
+        'off': group_sample(pbp, ['posteam'], ['epa']),
+        'def': group_sample(pbp, ['defteam'], ['epa']),
+    }
+    off_teams = samples['off']['labels']['posteam'].astype(object).to_numpy()
+    def_teams = pd.Index(samples['def']['labels']['defteam'].astype(object))
+    def_order = def_teams.get_indexer(off_teams)
+    if len(def_teams) != len(off_teams) or (def_order < 0).any():
+        print("Offense and defense team lists differ; cannot bootstrap team scores.")
+        return None, None
+    labels = pd.DataFrame({'team': off_teams})
+
+    options = {'off_weight': off_weight, 'def_weight': def_weight, 'def_order': def_order}
+    observed = _team_scores(samples, {name: _identity(s) for name, s in samples.items()}, **options)[0]
+    draws = _resample('teams', samples, resamples, seed, workers, options)
+    summary, rank_probs = summarize_scores(labels, observed, draws, top, alpha)
+    return summary.rename(columns={'score': 'prediction_score'}), rank_probs
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals for player and team scores.")
+    parser.add_argument('--season', type=int, default=2024)
+    parser.add_argument('--resamples', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+    args = parser.parse_args()
+
+    columns = data_loader.schema_columns(player_analysis.PBP_COLUMNS, team_analysis.PBP_COLUMNS)
+    datasets = data_loader.load_all([args.season], kinds=('pbp', 'roster'), columns=columns, offline=args.offline)
+    pbp, roster = datasets['pbp'], datasets['roster']
+    if pbp is None:
+        return
+    ctx = SeasonContext(pbp)
+
+    print(f"Bootstrapping {args.resamples} resamples...")
+    players, _ = bootstrap_players(ctx, args.resamples, args.seed, args.workers, roster=roster)
+    teams, team_ranks = bootstrap_teams(ctx, args.resamples, args.seed, args.workers)
+
+    pd.set_option('display.width', 160)
+    print("\nTop 10 Players (95% CI):")
+    print(players.head(10)[['player_name', 'position', 'impressiveness_score', 'ci_low', 'ci_high',
+                            'median_rank', 'p_top10']].round(3).to_string(index=False))
+    if teams is not None:
+        print("\nTeams (95% CI, P(predicted champion)):")
+        print(teams.head(10).assign(p_champion=team_ranks['rank_1'].head(10))[
+            ['team', 'prediction_score', 'ci_low', 'ci_high', 'median_rank', 'p_champion']
+        ].round(3).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
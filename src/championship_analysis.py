@@ -1,14 +1,42 @@
-import nfl_data_py as nfl
 import pandas as pd
+import numpy as np
 import ssl
+import sys
+import os
+
+# Allow running as a script (python src/championship_analysis.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import aggregates, data_loader, game_tables
+from src.form import FormEngine
+from src.player_index import PBP_ID_COLUMNS, PlayerIndex
+from src.season_context import SeasonContext
+
+# Play-by-play columns this analysis reads (see data_loader.schema_columns).
+PBP_COLUMNS = [
+    'week', 'play_type', 'posteam', 'defteam', 'epa', 'success',
+    'passer_player_name', 'rusher_player_name', 'receiver_player_name',
+    'passer_player_id', 'rusher_player_id', 'receiver_player_id',
+    'season_type', 'game_id', 'drive',
+]
 
 # Fix SSL issue for mac
 ssl._create_default_https_context = ssl._create_unverified_context
 
-def get_roster_config():
+def get_roster_config(path=None):
     """
-    Returns the user's specific roster configuration.
+    Returns the user's specific roster configuration, or the roster in
+    path (a CSV or JSON file, see lineup.load_rosters) when given.
     """
+    if path is not None:
+        from src import lineup
+        entries = lineup.load_rosters(path)
+        if entries is None:
+            return None
+        if 'team' in entries.columns and entries['team'].nunique() > 1:
+            print(f"{path} holds several rosters; optimize them with src/lineup.py")
+            return None
+        return {position: list(group['player']) for position, group in entries.groupby('position', sort=False)}
     return {
         'QB': ['B.Purdy'],
         'RB': ['C.McCaffrey', 'A.Jeanty', 'T.Henderson', 'T.Tracy'],
@@ -18,209 +46,388 @@ def get_roster_config():
         'DST': ['Buf'] # Abbreviation for Bills
     }
 
-def load_data():
+def load_data(**kwargs):
     """
-    Loads 2025 Play-by-Play and Schedule data.
+    Loads 2025 Play-by-Play, Schedule and Roster data (fetched
+    concurrently, through the season cache).
     """
     print("Loading 2025 Data...")
-    pbp = nfl.import_pbp_data([2025])
-    schedule = nfl.import_schedules([2025])
-    return pbp, schedule
+    data = data_loader.load_all([2025], kinds=('pbp', 'schedule', 'roster'),
+                                columns=data_loader.schema_columns(PBP_COLUMNS), **kwargs)
+    return data['pbp'], data['schedule'], data['roster']
 
-def analyze_recent_form(pbp, player_names, weeks=5):
+# (role, name column, play type) for each way a player can be involved in a play.
+PLAYER_ROLES = [
+    ('passer', 'passer_player_name', 'pass'),
+    ('rusher', 'rusher_player_name', 'run'),
+    ('receiver', 'receiver_player_name', 'pass'),
+]
+
+def melt_player_roles(pbp):
     """
-    Calculates EPA and Success Rate for the last N weeks for the given players.
+    Reshapes plays into one long table with a row per (play, involved player):
+    player, role, week, epa, success, posteam (plus season and player_id
+    when the plays have them). Rows are ordered by role, then play.
     """
-    # Get max week
-    current_week = pbp['week'].max()
-    start_week = max(1, current_week - weeks + 1)
-    
-    print(f"Analyzing form from Week {start_week} to {current_week}...")
-    
-    recent_data = pbp[pbp['week'] >= start_week]
-    
-    player_stats = []
-    
-    for player in player_names:
-        # Check as passer
-        pass_stats = recent_data[(recent_data['passer_player_name'] == player) & (recent_data['play_type'] == 'pass')]
-        # Check as rusher
-        rush_stats = recent_data[(recent_data['rusher_player_name'] == player) & (recent_data['play_type'] == 'run')]
-        # Check as receiver
-        rec_stats = recent_data[(recent_data['receiver_player_name'] == player) & (recent_data['play_type'] == 'pass')]
-        
-        # Combine distinct play IDs to get total involvement
-        # Note: receiver plays are subset of pass plays, but we care about the specific player's EPA
-        
-        # Calculate Weighted EPA
-        total_plays = len(pass_stats) + len(rush_stats) + len(rec_stats)
-        
-        if total_plays == 0:
-            print(f"No recent data for {player}")
-            continue
-            
-        avg_epa = 0
-        success_rate = 0
-        
-        # Aggregate stats
-        # Simply average EPA across all opportunities (Pass + Rush + Target)
-        # For receivers, we use their EPA on targets
-        
-        # Collect all relevant EPA values
-        epas = pd.concat([
-            pass_stats['epa'],
-            rush_stats['epa'],
-            rec_stats['epa']
-        ])
-        
-        successes = pd.concat([
-            pass_stats['success'],
-            rush_stats['success'],
-            rec_stats['success']
-        ])
-        
-        avg_epa = epas.mean()
-        success_rate = successes.mean()
-        
-        team = None
-        if not pass_stats.empty: team = pass_stats['posteam'].iloc[0]
-        elif not rush_stats.empty: team = rush_stats['posteam'].iloc[0]
-        elif not rec_stats.empty: team = rec_stats['posteam'].iloc[0]
-        
-        player_stats.append({
-            'player': player,
-            'team': team,
-            'avg_epa': avg_epa,
-            'success_rate': success_rate,
-            'usage_count': total_plays
+    frames = []
+    for role, name_col, play_type in PLAYER_ROLES:
+        rows = pbp[(pbp['play_type'] == play_type) & pbp[name_col].notna()]
+        frame = pd.DataFrame({
+            'player': rows[name_col].astype(object).to_numpy(),
+            'role': role,
+            'week': rows['week'].to_numpy(),
+            'epa': rows['epa'].to_numpy(),
+            'success': rows['success'].to_numpy(),
+            'posteam': rows['posteam'].astype(object).to_numpy(),
         })
-        
-    return pd.DataFrame(player_stats)
+        if 'season' in rows.columns:
+            frame['season'] = rows['season'].to_numpy()
+        id_col = PBP_ID_COLUMNS[role][0]
+        if id_col in rows.columns:
+            frame['player_id'] = rows[id_col].astype(object).to_numpy()
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
 
-def get_week_17_opponents(schedule, player_teams):
+def roles_by_id(roles, names=()):
     """
-    Finds the opponent for Week 17 for each player's team.
+    The role table keyed by gsis id instead of name (name where the id is
+    missing, or where the name is one of names), so players who share an
+    abbreviated name are kept apart. The name is kept in 'player_name'.
     """
-    w17 = schedule[schedule['week'] == 17]
-    matchups = {}
-    
-    for team in player_teams:
-        if not team: continue
-        
-        # Find game where team is home or away
-        game = w17[(w17['home_team'] == team) | (w17['away_team'] == team)]
-        if game.empty:
-            matchups[team] = 'BYE' # Should not happen in week 17 usually
-            continue
-            
-        row = game.iloc[0]
-        if row['home_team'] == team:
-            matchups[team] = row['away_team']
-        else:
-            matchups[team] = row['home_team']
-            
-    return matchups
-
-def analyze_matchup_difficulty(pbp, opponent, position):
+    if 'player_id' not in roles.columns:
+        return roles
+    name = roles['player_name'] if 'player_name' in roles.columns else roles['player']
+    player = roles['player_id'].fillna(name)
+    if len(names):
+        player = player.where(~name.isin(list(names)), name)
+    return roles.assign(player=player, player_name=name)
+
+def context_player_roles(ctx):
+    """
+    The melted role table for a whole SeasonContext, built once.
+    """
+    return ctx.memo('player_roles', lambda: melt_player_roles(ctx.plays))
+
+def context_form_engine(ctx, by_id=False):
+    """
+    The FormEngine for a whole SeasonContext, built once and shared by
+    every window and decay query (keyed by gsis id when by_id is set).
+    """
+    if by_id:
+        return ctx.memo('form_engine_by_id', lambda: FormEngine(roles_by_id(context_player_roles(ctx))))
+    return ctx.memo('form_engine', lambda: FormEngine(context_player_roles(ctx)))
+
+def analyze_recent_form(pbp, player_names=None, weeks=5, halflife=None, index=None, positions=None):
+    """
+    Calculates EPA and Success Rate for the last N weeks for the given players
+    (or every player involved in a play when player_names is None).
+
+    With halflife set, weeks are instead weighted by exponential decay
+    (see FormEngine.decayed). pbp may be a SeasonContext or a FormEngine,
+    in which case the per-week sums are built once and shared across calls
+    with different windows.
+
+    With a PlayerIndex, player_names are resolved to gsis ids (full or
+    abbreviated names, see PlayerIndex.resolve; shared names are narrowed
+    by positions, a {name: position} dict, and the season) and matched by
+    id. Names it cannot resolve, or that stay ambiguous, fall back to
+    matching the play-by-play name, over every player who has it. A
+    FormEngine passed with an index must be built from roles_by_id.
+    """
+    by_id = index is not None and player_names is not None
+    if isinstance(pbp, FormEngine):
+        engine = pbp
+    elif isinstance(pbp, SeasonContext):
+        engine = context_form_engine(pbp, by_id)
+    else:
+        roles = melt_player_roles(pbp)
+        engine = FormEngine(roles_by_id(roles) if by_id else roles)
+
+    requested = player_names
+    if by_id:
+        positions = positions or {}
+        # FormEngine numbers seasons 0 when the plays have no season column
+        season = int(engine.slot_season[-1]) if len(engine.slot_season) and engine.slot_season[-1] else None
+        keys = index.resolve(player_names, [positions.get(name) for name in player_names], season)
+        ids = index.players['player_id'].to_numpy(dtype=object)[keys]
+        player_names = list(np.where(keys >= 0, ids, np.asarray(requested, dtype=object)))
+        requested_by_key = dict(zip(player_names, requested))
+        fallback = [name for name, key in zip(requested, keys) if key < 0]
+        if fallback:
+            engine = FormEngine(roles_by_id(engine.roles, fallback))
+
+    # Get max week
+    end = engine.slot()
+    current_week = engine.slot_week[end] if end is not None else 0
+    if halflife is None:
+        start_week = max(1, current_week - weeks + 1)
+        print(f"Analyzing form from Week {start_week} to {current_week}...")
+        form = engine.window(weeks, players=player_names)
+    else:
+        print(f"Analyzing decay-weighted form through Week {current_week} (half-life {halflife} weeks)...")
+        form = engine.decayed(halflife, players=player_names)
+
+    if by_id:
+        form['player'] = form['player'].map(requested_by_key)
+    if requested is not None:
+        found = set(form['player'])
+        for player in requested:
+            if player not in found:
+                print(f"No recent data for {player}")
+
+    return form[['player', 'team', 'avg_epa', 'success_rate', 'usage_count']]
+
+def build_schedule_index(schedule):
+    """
+    Builds a (season, week, team) index of each team's opponent and
+    location ('home', 'away' or 'neutral'), one row per team per game.
+    """
+    games = schedule[['season', 'week', 'home_team', 'away_team']]
+    if 'location' in schedule.columns:
+        neutral = schedule['location'].eq('Neutral').to_numpy()
+    else:
+        neutral = np.zeros(len(schedule), dtype=bool)
+    home = games.rename(columns={'home_team': 'team', 'away_team': 'opponent'})
+    home['location'] = np.where(neutral, 'neutral', 'home')
+    away = games.rename(columns={'away_team': 'team', 'home_team': 'opponent'})
+    away['location'] = np.where(neutral, 'neutral', 'away')
+    index = pd.concat([home, away], ignore_index=True)
+    return index.set_index(['season', 'week', 'team']).sort_index()
+
+def get_week_opponents(schedule_index, player_teams, week, season=None):
+    """
+    Finds the opponent in the given week for each player's team
+    ('BYE' if the team does not play that week).
+    """
+    if season is None:
+        season = schedule_index.index.get_level_values('season').max()
+    opponents = schedule_index['opponent']
+    return {
+        team: opponents.get((season, week, team), 'BYE')
+        for team in player_teams if team
+    }
+
+# Play type used to measure a defense against each fantasy position.
+# QBs and pass catchers face the secondary; RBs face the run defense.
+POSITION_PLAY_TYPES = {'QB': 'pass', 'RB': 'run', 'WR': 'pass', 'TE': 'pass'}
+
+def build_defense_table(pbp):
+    """
+    Builds the defense x position x play_type table of Avg EPA allowed
+    (with play counts) in one grouped pass over the plays.
+    """
+    by_type = (
+        pbp[pbp['play_type'].isin(['pass', 'run'])]
+        .groupby(['defteam', 'play_type'], observed=True)['epa']
+        .agg(epa_allowed='mean', plays='size')
+        .reset_index()
+    )
+    return _defense_positions(by_type)
+
+def defense_table_from_games(games):
+    """
+    build_defense_table, rolled up from the pass/run splits of the game
+    table (see src/game_tables.py).
+    """
+    frames = []
+    for play_type in game_tables.SPLITS:
+        sums = aggregates.rollup(games, ['defteam'], ['epa'], prefix=f'{play_type}_')
+        sums = sums[sums['plays'] > 0]
+        frames.append(pd.DataFrame({
+            'defteam': sums.index,
+            'play_type': play_type,
+            'epa_allowed': sums['epa_sum'].to_numpy() / sums['epa_n'].to_numpy(),
+            'plays': sums['plays'].to_numpy(),
+        }))
+    return _defense_positions(pd.concat(frames, ignore_index=True))
+
+def _defense_positions(by_type):
+    by_type['defteam'] = by_type['defteam'].astype(object)
+    by_type['play_type'] = by_type['play_type'].astype(object)
+    positions = pd.DataFrame(list(POSITION_PLAY_TYPES.items()), columns=['position', 'play_type'])
+    table = by_type.merge(positions, on='play_type')
+    return table[['defteam', 'position', 'play_type', 'epa_allowed', 'plays']].sort_values(['defteam', 'position'], ignore_index=True)
+
+def load_defense_table(pbp):
+    """
+    Returns the defense table for pbp, cached next to the season data
+    (see data_loader.load_table) when pbp is exactly one cached season;
+    several seasons or a filtered season are built without the cache.
+    pbp may be a SeasonContext, in which case it is rolled up from the
+    context's game table.
+    """
+    if isinstance(pbp, SeasonContext):
+        ctx = pbp
+        return ctx.memo('defense_table', lambda: defense_table_from_games(game_tables.load_game_table(ctx)))
+    seasons = pbp['season'].unique()
+    if len(seasons) != 1:
+        return build_defense_table(pbp)
+    return data_loader.load_table('defense', int(seasons[0]), lambda: build_defense_table(pbp), rows=len(pbp))
+
+def defense_lookup(defense_table):
+    """
+    Indexes the defense table by (defteam, position) for O(1) lookups.
+    """
+    return defense_table.set_index(['defteam', 'position'])['epa_allowed']
+
+def analyze_matchup_difficulty(pbp, opponent, position, lookup=None):
     """
     Calculates how the opponent defense performs against this position.
     Returns Avg EPA allowed. Lower is harder for offense.
+
+    Pass a prebuilt lookup (defense_lookup) or a SeasonContext to make
+    repeated calls a hash lookup instead of a scan of pbp.
     """
-    # Simply get avg EPA allowed by this team when on defense
-    def_plays = pbp[pbp['defteam'] == opponent]
-    
-    if position == 'QB':
-        # EPA on pass plays
-        return def_plays[def_plays['play_type'] == 'pass']['epa'].mean()
-    elif position == 'RB':
-        # EPA on run plays
-        return def_plays[def_plays['play_type'] == 'run']['epa'].mean()
-    elif position in ['WR', 'TE']:
-        # EPA on pass plays (general secondary strength)
-        return def_plays[def_plays['play_type'] == 'pass']['epa'].mean()
-        
-    return 0
+    if position not in POSITION_PLAY_TYPES:
+        return 0
+    if lookup is None and isinstance(pbp, SeasonContext):
+        ctx = pbp
+        lookup = ctx.memo('defense_lookup', lambda: defense_lookup(load_defense_table(ctx)))
+    elif lookup is None:
+        lookup = defense_lookup(build_defense_table(pbp))
+    return lookup.get((opponent, position), float('nan'))
+
+def score_matchups(form_df, player_pos, defense_table, schedule_index, weeks, season=None):
+    """
+    Scores every player in form_df against his team's opponent in each of
+    the given weeks with one vectorized join over the form, schedule and
+    defense tables.
+
+    player_pos maps player -> position (unknown players count as FLEX).
+    Returns one row per (player, week); teams on bye get Opponent 'BYE'
+    and a NaN score.
+    """
+    if season is None:
+        season = schedule_index.index.get_level_values('season').max()
+
+    players = form_df.assign(position=form_df['player'].map(player_pos).fillna('FLEX'))
+    slate = players.merge(pd.DataFrame({'week': list(weeks)}), how='cross')
+
+    games = schedule_index.xs(season, level='season').reset_index()
+    slate = slate.merge(games, on=['week', 'team'], how='left')
+    slate['opponent'] = slate['opponent'].fillna('BYE').where(slate['team'].notna(), 'N/A')
+
+    slate = slate.merge(
+        defense_table[['defteam', 'position', 'epa_allowed']],
+        left_on=['opponent', 'position'], right_on=['defteam', 'position'], how='left',
+    )
+    # Positions without a defensive split (K, DST, FLEX) get a neutral matchup
+    slate.loc[~slate['position'].isin(list(POSITION_PLAY_TYPES)), 'epa_allowed'] = 0
+
+    # Score Calculation (Primitive)
+    # Form (0.7) + Matchup (0.3); EPA ranges -0.5 to 0.5 roughly.
+    slate['score'] = (slate['avg_epa'] * 0.7) + (slate['epa_allowed'] * 0.3)
+
+    return slate.rename(columns={
+        'player': 'Player', 'position': 'Position', 'team': 'Team', 'week': 'Week',
+        'opponent': 'Opponent', 'location': 'Location', 'avg_epa': 'Form_EPA',
+        'success_rate': 'Success_Rate', 'epa_allowed': 'Opp_EPA_Allowed', 'score': 'Composite_Score',
+    })[['Player', 'Position', 'Team', 'Week', 'Opponent', 'Location',
+        'Form_EPA', 'Success_Rate', 'Opp_EPA_Allowed', 'Composite_Score']]
 
-def main():
+def week_projections(matchups, player_pos):
+    """
+    Projected score per player from one week of score_matchups output:
+    the Composite_Score, NaN on a bye or without recent form. Positions
+    without play-by-play form (K, DST) get a neutral 0 so they can still
+    fill their lineup slots.
+    """
+    positions = pd.Series(player_pos, dtype=object)
+    scores = matchups.drop_duplicates('Player').set_index('Player')['Composite_Score']
+    projections = pd.Series(positions.index.map(scores), index=positions.index, dtype=float)
+    projections[~positions.isin(list(POSITION_PLAY_TYPES)) & projections.isna()] = 0.0
+    return projections
+
+def project_week(ctx, player_pos, schedule_index, week, form_weeks=5, halflife=None, index=None):
+    """
+    Recent form and week's matchup for every player in player_pos (player
+    -> position). Returns (score_matchups output, week_projections).
+    """
+    names = [player for player, position in player_pos.items() if position in POSITION_PLAY_TYPES]
+    form_df = analyze_recent_form(ctx, names, weeks=form_weeks, halflife=halflife, index=index, positions=player_pos)
+    matchups = score_matchups(form_df, player_pos, load_defense_table(ctx), schedule_index, [week])
+    return matchups, week_projections(matchups, player_pos)
+
+def project_players(players, week=17, form_weeks=5, halflife=None, **kwargs):
+    """
+    week_projections for a frame of players (player and position columns),
+    e.g. every roster of a league at once. kwargs go to load_data. Returns
+    None if the data cannot be loaded.
+    """
+    pbp, schedule, roster_df = load_data(**kwargs)
+    if pbp is None or schedule is None:
+        return None
+    ctx = SeasonContext(pbp)
+    index = PlayerIndex(roster_df, pbp) if roster_df is not None else None
+    player_pos = dict(zip(players['player'], players['position']))
+    _, projections = project_week(ctx, player_pos, build_schedule_index(schedule), week, form_weeks, halflife, index)
+    return projections
+
+def rank_rest_of_season(matchups):
+    """
+    Collapses score_matchups output over weeks into a rest-of-season
+    ranking: total and mean Composite_Score per player (byes excluded).
+    """
+    games = matchups[matchups['Opponent'] != 'BYE']
+    ranking = games.groupby(['Player', 'Position', 'Team'], sort=False).agg(
+        Games=('Week', 'size'),
+        Total_Score=('Composite_Score', 'sum'),
+        Mean_Score=('Composite_Score', 'mean'),
+    ).reset_index()
+    return ranking.sort_values('Total_Score', ascending=False, ignore_index=True)
+
+def main(week=17, form_weeks=5, halflife=None, roster_path=None):
     try:
-        pbp, schedule = load_data()
-        roster = get_roster_config()
+        pbp, schedule, roster_df = load_data()
+        if pbp is None or schedule is None:
+            return
+        roster = get_roster_config(roster_path)
+        if roster is None:
+            return
         
         # Flatten roster for easy iteration
-        all_players = []
         player_pos = {}
         for pos, names in roster.items():
             for name in names:
-                all_players.append(name)
                 player_pos[name] = pos
         
-        # 1. Recent Form
-        form_df = analyze_recent_form(pbp, all_players)
+        ctx = SeasonContext(pbp)
+
+        # Resolve roster names through the league rosters when available
+        index = PlayerIndex(roster_df, pbp) if roster_df is not None else None
+
+        # 1. Recent Form and 2. Matchups
+        # Higher EPA allowed = Easier matchup
+        schedule_index = build_schedule_index(schedule)
+        results_df, projections = project_week(ctx, player_pos, schedule_index, week, form_weeks, halflife, index)
         
-        if form_df.empty:
+        if results_df.empty:
             print("No player data found to analyze.")
             return
 
-        # 2. Matchups
-        unique_teams = form_df['team'].unique()
-        opponents = get_week_17_opponents(schedule, unique_teams)
-        
-        results = []
-        
-        print("\n--- Championship Matchup Analysis ---\n")
-        
-        for _, row in form_df.iterrows():
-            player = row['player']
-            team = row['team']
-            pos = player_pos.get(player, 'FLEX')
-            
-            opp = opponents.get(team, 'N/A')
-            
-            # Defense strength (EPA allowed)
-            # Higher EPA allowed = Easier matchup
-            def_epa = analyze_matchup_difficulty(pbp, opp, pos)
-            
-            # Score Calculation (Primitive)
-            # Form (0.6) + Matchup (0.4)
-            # Normalize inputs roughly? 
-            # EPA ranges -0.5 to 0.5 roughly.
-            
-            score = (row['avg_epa'] * 0.7) + (def_epa * 0.3)
-            
-            results.append({
-                'Player': player,
-                'Position': pos,
-                'Team': team,
-                'Opponent': opp,
-                'Form_EPA': round(row['avg_epa'], 3),
-                'Success_Rate': round(row['success_rate'], 3),
-                'Opp_EPA_Allowed': round(def_epa, 3),
-                'Composite_Score': round(score, 3)
-            })
-            
-        results_df = pd.DataFrame(results)
+        results_df = results_df.drop(columns=['Week', 'Location']).round(3)
         results_df = results_df.sort_values('Composite_Score', ascending=False)
         
+        print(f"\n--- Championship Matchup Analysis (Week {week}) ---\n")
         print(results_df.to_string(index=False))
         
-        # Recommendation Logic
-        print("\n--- RECOMMENDATIONS ---")
-        print("Based on Composite Score (High = Better Start)\n")
-        
-        # RB Choice
-        rbs = results_df[results_df['Position'] == 'RB']
-        print("Running Backs:")
-        print(rbs[['Player', 'Opponent', 'Composite_Score']].to_string(index=False))
-        
-        # WR Choice
-        wrs = results_df[results_df['Position'] == 'WR']
-        print("\nWide Receivers:")
-        print(wrs[['Player', 'Opponent', 'Composite_Score']].to_string(index=False))
+        # 3. Optimal Lineup (see src/lineup.py)
+        from src import lineup
+        entries = pd.DataFrame({'player': list(player_pos), 'position': list(player_pos.values())})
+        lineups = lineup.optimize_rosters(entries.assign(projection=entries['player'].map(projections)))
+
+        print("\n--- OPTIMAL LINEUP ---")
+        print("Starters maximize the total Composite Score (High = Better Start)\n")
+        starters = lineups[lineups['slot'] != 'BENCH']
+        print(starters[['slot', 'player', 'position', 'projection']].round(3).to_string(index=False))
+        empty = len(lineup.slot_list()) - len(starters)
+        if empty:
+            print(f"\n{empty} slot(s) left empty: no eligible player with a projection.")
         
-        # Flex Candidates (RB + WR + TE)
-        flex = results_df[results_df['Position'].isin(['RB', 'WR', 'TE'])]
-        print("\nFlex Rankings (All Eligible):")
-        print(flex[['Player', 'Position', 'Composite_Score']].head(5).to_string(index=False))
+        bench = lineups[lineups['slot'] == 'BENCH']
+        if not bench.empty:
+            print("\nBench:")
+            print(bench[['player', 'position', 'projection']].round(3).to_string(index=False))
 
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -228,4 +435,13 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Start/sit matchup analysis for a fantasy roster.")
+    parser.add_argument('--week', type=int, default=17)
+    parser.add_argument('--form-weeks', type=int, default=5, help="Weeks of recent form to use.")
+    parser.add_argument('--halflife', type=float, default=None,
+                        help="Use decay-weighted form with this half-life in weeks instead of a fixed window.")
+    parser.add_argument('--roster', default=None,
+                        help="Roster CSV or JSON file (see src/lineup.py) instead of the built-in roster.")
+    args = parser.parse_args()
+    main(args.week, args.form_weeks, args.halflife, args.roster)
@@ -0,0 +1,186 @@
+import argparse
+import os
+import sys
+
+# Allow running as a script (python src/cli.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Only argparse is imported up front: pandas, the analyses, plotting and
+# nfl_data_py are imported inside the subcommands that use them, so
+# `--help` and cache-served commands start quickly (see
+# `python src/benchmark.py --startup`).
+
+def _load_opts(args):
+    return {'offline': args.offline, 'refresh': args.refresh}
+
+def fetch(args):
+    """
+    Downloads (or refreshes) seasons into the cache, concurrently.
+    """
+    from src import data_loader
+    datasets = data_loader.load_all(args.seasons, kinds=args.kinds, workers=args.workers, **_load_opts(args))
+    for kind, df in datasets.items():
+        print(f"{kind:<9} {'failed' if df is None else f'{len(df):,} rows'}")
+    return 0 if all(df is not None for df in datasets.values()) else 1
+
+def rank_players(args):
+    """
+    Prints the top players of a season.
+    """
+    import pandas as pd
+    from src import data_loader, player_analysis
+    from src.season_context import SeasonContext
+
+    datasets = data_loader.load_all([args.season], kinds=('pbp', 'roster'),
+                                    columns=data_loader.schema_columns(player_analysis.PBP_COLUMNS),
+                                    **_load_opts(args))
+    if datasets['pbp'] is None:
+        return 1
+    ctx = SeasonContext(datasets['pbp'])
+    _, _, all_players = player_analysis.rank_players(player_analysis.context_player_aggregates(ctx), datasets['roster'])
+    if args.position:
+        all_players = all_players[all_players['position'] == args.position.upper()]
+    ranked = all_players.sort_values('impressiveness_score', ascending=False).head(args.top)
+    pd.set_option('display.width', 160)
+    print(ranked.to_string(index=False))
+    return 0
+
+def rank_teams(args):
+    """
+    Prints teams ranked by prediction score, from the cached game table
+    (play-by-play is only read when the table has to be built).
+    """
+    import pandas as pd
+    from src import game_tables, team_analysis
+
+    try:
+        games = game_tables.load_season_game_table(args.season, **_load_opts(args))
+    except Exception as e:
+        print(f"Error loading {args.season}: {e}")
+        return 1
+    rankings = team_analysis.rank_game_table(games, args.method)
+    pd.set_option('display.width', 160)
+    print(rankings[['team', 'off_epa', 'def_epa', 'prediction_score']].head(args.top).to_string(index=False))
+    return 0
+
+def simulate(args):
+    """
+    Monte Carlo rest-of-season and playoff probabilities.
+    """
+    import pandas as pd
+    from src import simulator
+
+    table = simulator.run(args.season, args.sims, args.method, args.seed, args.workers or None, **_load_opts(args))
+    if table is None:
+        return 1
+    pd.set_option('display.width', 160)
+    print(table.head(args.top).round(3).to_string(index=False))
+    return 0
+
+def matchups(args):
+    """
+    Start/sit matchup analysis for the fantasy roster.
+    """
+    from src import championship_analysis
+    championship_analysis.main(args.week, args.form_weeks, args.halflife, args.roster)
+    return 0
+
+def lineups(args):
+    """
+    Optimal lineups for one roster or a whole league.
+    """
+    import pandas as pd
+    from src import lineup
+
+    slots = lineup.parse_slots(args.slots) if args.slots else lineup.SLOTS
+    result = lineup.run(args.rosters, slots, args.week, args.form_weeks, args.halflife, **_load_opts(args))
+    if result is None:
+        return 1
+    pd.set_option('display.width', 160)
+    print(lineup.lineup_totals(result).head(args.top).round(3).to_string(index=False))
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"\nLineups written to {args.output}")
+    return 0
+
+def report(args):
+    """
+    The full analysis report (main.py), with main.py's options.
+    """
+    import main as report_main
+    report_main.main(args.options)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description="NFL quantitative analysis.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def command(name, func, help, data=True):
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.set_defaults(func=func)
+        if data:
+            sub.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+            sub.add_argument('--refresh', action='store_true', help="Re-download seasons even if they are cached.")
+        return sub
+
+    sub = command('fetch', fetch, "Download seasons into the local cache.")
+    sub.add_argument('--seasons', type=int, nargs='+', default=[2024])
+    sub.add_argument('--kinds', nargs='+', default=['pbp', 'roster', 'schedule'], choices=['pbp', 'roster', 'schedule'])
+    sub.add_argument('--workers', type=int, default=8, help="Concurrent downloads.")
+
+    sub = command('rank-players', rank_players, "Rank players by impressiveness score.")
+    sub.add_argument('--season', type=int, default=2024)
+    sub.add_argument('--top', type=int, default=10)
+    sub.add_argument('--position', default=None, help="Only this position (QB, RB, WR, TE).")
+
+    sub = command('rank-teams', rank_teams, "Rank teams by Super Bowl prediction score.")
+    sub.add_argument('--season', type=int, default=2024)
+    sub.add_argument('--top', type=int, default=32)
+    sub.add_argument('--method', choices=['raw', 'adjusted'], default='raw',
+                     help="Raw mean EPA or opponent-adjusted ratings.")
+
+    sub = command('simulate', simulate, "Simulate the season and playoffs for playoff and title odds.")
+    sub.add_argument('--season', type=int, default=2024)
+    sub.add_argument('--sims', type=int, default=100000)
+    sub.add_argument('--top', type=int, default=32)
+    sub.add_argument('--method', choices=['raw', 'adjusted'], default='raw',
+                     help="Rate teams on raw mean EPA or on opponent-adjusted ratings.")
+    sub.add_argument('--workers', type=int, default=1, help="Processes to simulate on (0 = every CPU).")
+    sub.add_argument('--seed', type=int, default=0)
+
+    sub = command('matchups', matchups, "Start/sit matchup analysis for the fantasy roster.", data=False)
+    sub.add_argument('--week', type=int, default=17)
+    sub.add_argument('--form-weeks', type=int, default=5, help="Weeks of recent form to use.")
+    sub.add_argument('--halflife', type=float, default=None,
+                     help="Use decay-weighted form with this half-life in weeks instead of a fixed window.")
+    sub.add_argument('--roster', default=None, help="Roster CSV or JSON file instead of the built-in roster.")
+
+    sub = command('lineups', lineups, "Optimal start/sit lineups for a roster or league file.")
+    sub.add_argument('rosters', help="Roster CSV (team, player, position[, projection]) or JSON file.")
+    sub.add_argument('--slots', default=None, help="Starters per slot, e.g. QB=1,RB=2,WR=3,TE=1,FLEX=1,K=1,DST=1.")
+    sub.add_argument('--week', type=int, default=17)
+    sub.add_argument('--form-weeks', type=int, default=5, help="Weeks of recent form to project from.")
+    sub.add_argument('--halflife', type=float, default=None,
+                     help="Use decay-weighted form with this half-life in weeks instead of a fixed window.")
+    sub.add_argument('--top', type=int, default=10)
+    sub.add_argument('--output', default=None, help="Write every lineup as CSV here.")
+
+    sub = commands.add_parser('report', help="Write the analysis report and charts (options as for main.py).",
+                              add_help=False)
+    sub.set_defaults(func=report)
+    sub.add_argument('options', nargs=argparse.REMAINDER, help="main.py options, e.g. --offline --league-report.")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    # Options after `report` belong to main.py, including ones argparse
+    # would otherwise claim (e.g. --help)
+    args, extra = parser.parse_known_args(argv)
+    if args.func is report:
+        args.options = extra + args.options
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
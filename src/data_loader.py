@@ -1,32 +1,426 @@
-import nfl_data_py as nfl
 import pandas as pd
+import pyarrow.parquet as pq
+import io
+import json
 import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
 
-def load_data(years=[2024]):
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Season cache: one Parquet file per (dataset, season) plus a JSON manifest.
+#   cache/pbp/season=2024.parquet
+#   cache/manifest.json
+CACHE_DIR = os.environ.get('NFL_CACHE_DIR', os.path.join(ROOT_DIR, 'cache'))
+# Fixture directory with the same layout, used when the cache is cold and
+# the network is unavailable (or when running offline).
+FIXTURE_DIR = os.environ.get('NFL_FIXTURE_DIR', os.path.join(ROOT_DIR, 'fixtures'))
+MANIFEST_FILE = 'manifest.json'
+# Optional mirror with the cache layout (<url>/pbp/season=2024.parquet),
+# e.g. src/fixture_server.py; when unset, seasons come from nflverse.
+DATA_URL = os.environ.get('NFL_DATA_URL')
+
+# Concurrent fetching: at most FETCH_WORKERS downloads at a time, each
+# retried FETCH_RETRIES times with exponential backoff (FETCH_BACKOFF
+# seconds, doubling, with jitter).
+FETCH_WORKERS = int(os.environ.get('NFL_FETCH_WORKERS', 8))
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 1.0
+FETCH_TIMEOUT = 60
+
+# Guards read-modify-write of the manifest when seasons load concurrently.
+_MANIFEST_LOCK = threading.RLock()
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread lock only
+    fcntl = None
+
+@contextmanager
+def _manifest_lock(cache_dir):
+    """
+    Serializes manifest updates across threads and, where supported,
+    across processes sharing the cache (e.g. backtest pool workers).
+    """
+    with _MANIFEST_LOCK:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, MANIFEST_FILE + '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+# nfl_data_py download function for each dataset. nfl_data_py is only
+# imported when a season actually has to be downloaded (see _fetcher).
+FETCHERS = {
+    'pbp': 'import_pbp_data',
+    'roster': 'import_seasonal_rosters',
+    'schedule': 'import_schedules',
+}
+
+def _fetcher(kind):
+    import nfl_data_py as nfl
+    return getattr(nfl, FETCHERS[kind])
+
+# Low-cardinality string columns stored as categoricals after load.
+CATEGORICAL_COLUMNS = [
+    'posteam', 'defteam', 'play_type', 'season_type',
+    'passer_player_id', 'passer_player_name',
+    'rusher_player_id', 'rusher_player_name',
+    'receiver_player_id', 'receiver_player_name',
+]
+# Always kept when projecting so frames can be split by season and week.
+KEY_COLUMNS = ['season', 'week']
+
+def schema_columns(*schemas):
+    """
+    Merges the column schemas of several analyses into one projection,
+    keeping the first-seen order.
+    """
+    columns = list(KEY_COLUMNS)
+    for schema in schemas:
+        for col in schema:
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+def optimize_dtypes(df):
+    """
+    Stores team, play type and player columns as categoricals and
+    downcasts float64 columns to float32, in place.
+    """
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+        elif df[col].dtype == 'float64':
+            df[col] = df[col].astype('float32')
+    return df
+
+def _project(df, columns):
+    if columns is None:
+        return df
+    return df[[col for col in columns if col in df.columns]]
+
+def _read_parquet(path, columns=None, filters=None):
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in available]
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+def _season_path(base_dir, kind, year):
+    return os.path.join(base_dir, kind, f'season={year}.parquet')
+
+def read_manifest(cache_dir=CACHE_DIR):
+    """
+    Returns the cache manifest, keyed by '<kind>/<season>'.
+    """
+    path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def _write_manifest(manifest, cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, MANIFEST_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _store_season(df, kind, year, cache_dir, **extra):
+    path = _season_path(cache_dir, kind, year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    with _manifest_lock(cache_dir):
+        manifest = read_manifest(cache_dir)
+        manifest[f'{kind}/{year}'] = {
+            'kind': kind,
+            'season': year,
+            'path': os.path.relpath(path, cache_dir),
+            'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'rows': len(df),
+            'schema': {col: str(dtype) for col, dtype in df.dtypes.items()},
+            **extra,
+        }
+        _write_manifest(manifest, cache_dir)
+
+def _fetch_url(url):
+    with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+        return pd.read_parquet(io.BytesIO(response.read()))
+
+def fetch_season(kind, year, base_url=DATA_URL):
+    """
+    Downloads one season of a dataset, from base_url when set and from
+    nflverse otherwise. Failures are retried with exponential backoff;
+    a missing file (HTTP 404) is not.
+    """
+    for attempt in range(FETCH_RETRIES + 1):
+        try:
+            if base_url:
+                return _fetch_url(f"{base_url.rstrip('/')}/{kind}/season={year}.parquet")
+            return _fetcher(kind)([year])
+        except Exception as e:
+            if attempt == FETCH_RETRIES or (isinstance(e, urllib.error.HTTPError) and e.code == 404):
+                raise
+            delay = FETCH_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.0)
+            print(f"Fetching {kind} {year} failed ({e}); retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+def load_season(kind, year, columns=None, offline=False, refresh=False,
+                cache_dir=CACHE_DIR, fixture_dir=FIXTURE_DIR, base_url=DATA_URL):
+    """
+    Loads one season of a dataset ('pbp', 'roster' or 'schedule').
+
+    Order of preference: the local cache (unless refresh), nflverse or the
+    base_url mirror (unless offline, and the full season is written back
+    to the cache), then the fixture directory. Raises FileNotFoundError if
+    none of them can serve the season. If columns is given, only those
+    columns are read.
+    """
+    df = _load_season_raw(kind, year, columns, offline, refresh, cache_dir, fixture_dir, base_url)
+    if kind == 'pbp':
+        df = optimize_dtypes(df)
+    return df
+
+def _load_season_raw(kind, year, columns, offline, refresh, cache_dir, fixture_dir, base_url):
+    cache_path = _season_path(cache_dir, kind, year)
+    if not refresh and os.path.exists(cache_path):
+        return _read_parquet(cache_path, columns)
+
+    fetch_error = None
+    if not offline:
+        try:
+            df = fetch_season(kind, year, base_url)
+            _store_season(df, kind, year, cache_dir)
+            return _project(df, columns).copy()
+        except Exception as e:
+            fetch_error = e
+            print(f"Could not fetch {kind} {year}: {e}")
+
+    fixture_path = _season_path(fixture_dir, kind, year)
+    if os.path.exists(fixture_path):
+        print(f"Using fixture for {kind} {year}.")
+        return _read_parquet(fixture_path, columns)
+
+    if fetch_error is not None:
+        raise fetch_error
+    raise FileNotFoundError(f"No cached or fixture {kind} data for {year} (offline).")
+
+def load_week(year, week, columns=None, offline=False, refresh=False, cache_dir=CACHE_DIR, **kwargs):
+    """
+    Loads one week of a season's play-by-play. A cached season is read
+    for that week's rows only; the season is re-fetched (see load_season)
+    only when it is not cached yet or its copy predates the week.
+    """
+    path = _season_path(cache_dir, 'pbp', year)
+    if not refresh and os.path.exists(path):
+        df = _read_parquet(path, columns, filters=[('week', '==', week)])
+        if len(df) or offline:
+            return optimize_dtypes(df)
+        print(f"Cached {year} play-by-play has no week {week} yet; re-fetching.")
+        refresh = True
+    season = load_season('pbp', year, columns, offline=offline, refresh=refresh, cache_dir=cache_dir, **kwargs)
+    return season[season['week'] == week]
+
+def _concat_seasons(frames):
+    """
+    Concatenates season frames, unifying categorical columns first so they
+    stay categorical instead of falling back to object dtype.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    for col in frames[0].columns:
+        if frames[0][col].dtype.name != 'category':
+            continue
+        categories = pd.api.types.union_categoricals(
+            [f[col] for f in frames if col in f.columns], ignore_order=True
+        ).categories
+        for f in frames:
+            if col in f.columns:
+                f[col] = f[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+def load_seasons(jobs, workers=FETCH_WORKERS, **kwargs):
+    """
+    Loads several seasons concurrently on a pool of at most `workers`
+    threads, so a cold start takes about as long as the slowest download
+    rather than the sum of all of them.
+
+    jobs are (kind, year) or (kind, year, columns) tuples; kwargs are
+    passed to load_season. Returns one entry per job, in order: the frame,
+    or the exception that job raised.
+    """
+    jobs = [tuple(job) + (None,) * (3 - len(job)) for job in jobs]
+
+    def run(job):
+        kind, year, columns = job
+        try:
+            return load_season(kind, year, columns=columns, **kwargs)
+        except Exception as e:
+            return e
+
+    if len(jobs) <= 1 or workers <= 1:
+        return [run(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(run, jobs))
+
+def _load(kind, years, columns=None, workers=FETCH_WORKERS, **kwargs):
+    frames = load_seasons([(kind, year, columns) for year in years], workers, **kwargs)
+    for frame in frames:
+        if isinstance(frame, Exception):
+            raise frame
+    return _concat_seasons(frames)
+
+def load_all(years=[2024], kinds=('pbp', 'roster', 'schedule'), columns=None, workers=FETCH_WORKERS, **kwargs):
+    """
+    Loads several datasets for several seasons with every (dataset,
+    season) fetched concurrently (see load_seasons). columns projects the
+    play-by-play only. Returns {kind: frame}, with None for a dataset
+    that could not be loaded.
+    """
+    print(f"Loading {', '.join(kinds)} for years: {years}...")
+    jobs = [(kind, year, columns if kind == 'pbp' else None) for kind in kinds for year in years]
+    results = dict(zip([(kind, year) for kind, year, _ in jobs], load_seasons(jobs, workers, **kwargs)))
+
+    datasets = {}
+    for kind in kinds:
+        frames = [results[(kind, year)] for year in years]
+        errors = [frame for frame in frames if isinstance(frame, Exception)]
+        if errors:
+            print(f"Error loading {kind}: {errors[0]}")
+            datasets[kind] = None
+        else:
+            datasets[kind] = _concat_seasons(frames)
+    return datasets
+
+def load_data(years=[2024], **kwargs):
     """
     Loads play-by-play data for the specified years.
+
+    Seasons are served from the local cache when present; see load_season
+    for the columns, offline, refresh and fixture options. Pass
+    columns=schema_columns(...) to read only what the analyses need.
     """
     print(f"Loading data for years: {years}...")
     try:
-        pbp = nfl.import_pbp_data(years)
+        pbp = _load('pbp', years, **kwargs)
         print("Data loaded successfully.")
         return pbp
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
 
-def load_roster(years=[2024]):
+def iter_data(years=[2024], by_week=False, **kwargs):
+    """
+    Streams play-by-play data one season at a time (or one week at a time
+    with by_week=True), so only a single season is resident in memory.
+    Accepts the same options as load_season.
+    """
+    for year in years:
+        print(f"Streaming data for {year}...")
+        season = load_season('pbp', year, **kwargs)
+        if not by_week:
+            yield season
+            continue
+        for _, week_df in season.groupby('week', sort=True):
+            yield week_df
+        del season
+
+def load_table(name, year, build, cache_dir=CACHE_DIR, rows=None):
+    """
+    Loads a per-season table derived from play-by-play (e.g. the defense
+    matchup table), building it with build() on first use and caching it
+    next to the season. The cached copy is rebuilt whenever that season's
+    pbp has been re-fetched since; tables built from uncached pbp (e.g.
+    fixtures) are not stored.
+
+    rows is the number of plays build() reads, when it is given a frame
+    rather than loading the season itself. The cache is then only used
+    if that is the whole cached season: a filtered frame (e.g. some weeks)
+    has fewer rows, and its table is built without touching the cache.
+    """
+    manifest = read_manifest(cache_dir)
+    if rows is not None and manifest.get(f'pbp/{year}', {}).get('rows') != rows:
+        return build()
+    source = manifest.get(f'pbp/{year}', {}).get('fetched_at')
+    entry = manifest.get(f'{name}/{year}', {})
+    path = _season_path(cache_dir, name, year)
+    if source is not None and entry.get('source_fetched_at') == source and os.path.exists(path):
+        return pd.read_parquet(path)
+
+    table = build()
+    # build() may have fetched (and cached) the season itself
+    source = read_manifest(cache_dir).get(f'pbp/{year}', {}).get('fetched_at')
+    if source is not None:
+        _store_season(table, name, year, cache_dir, source_fetched_at=source)
+    return table
+
+def load_roster(years=[2024], **kwargs):
     """
     Loads roster data to identify player positions.
     """
     print(f"Loading roster for years: {years}...")
     try:
-        roster = nfl.import_seasonal_rosters(years)
+        roster = _load('roster', years, **kwargs)
         return roster
     except Exception as e:
         print(f"Error loading roster: {e}")
         return None
 
+def load_schedule(years=[2024], **kwargs):
+    """
+    Loads schedule (and result) data for the specified years.
+    """
+    print(f"Loading schedule for years: {years}...")
+    try:
+        schedule = _load('schedule', years, **kwargs)
+        return schedule
+    except Exception as e:
+        print(f"Error loading schedule: {e}")
+        return None
+
+def invalidate_cache(years=None, kinds=None, cache_dir=CACHE_DIR):
+    """
+    Removes cached seasons (and tables derived from them) so the next load
+    fetches them again. With no arguments the whole cache is cleared.
+    """
+    with _manifest_lock(cache_dir):
+        manifest = read_manifest(cache_dir)
+        if kinds is None:
+            # Every dataset and derived table directory
+            kinds = os.listdir(cache_dir) if os.path.isdir(cache_dir) else []
+        removed = []
+        for kind in kinds:
+            kind_dir = os.path.join(cache_dir, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for fname in os.listdir(kind_dir):
+                if not fname.startswith('season=') or not fname.endswith('.parquet'):
+                    continue
+                year = int(fname[len('season='):-len('.parquet')])
+                if years is not None and year not in years:
+                    continue
+                os.remove(os.path.join(kind_dir, fname))
+                manifest.pop(f'{kind}/{year}', None)
+                removed.append(f'{kind}/{year}')
+        _write_manifest(manifest, cache_dir)
+    print(f"Invalidated {len(removed)} cached season(s).")
+    return removed
+
 if __name__ == "__main__":
     # Test the loader
     df = load_data()
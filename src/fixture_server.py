@@ -0,0 +1,73 @@
+import argparse
+import functools
+import os
+import random
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Allow running as a script (python src/fixture_server.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_loader
+
+# Local stand-in for the nflverse downloads: serves a fixture (or cache)
+# directory over HTTP in the layout data_loader expects from a mirror
+# (<url>/pbp/season=2024.parquet), optionally with latency and failures
+# so concurrent fetching, retries and backoff can be exercised offline.
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """
+    Serves files from the fixture directory, sleeping `latency` seconds
+    per request and answering 503 to a `fail_rate` share of requests.
+    """
+
+    def __init__(self, *args, latency=0.0, fail_rate=0.0, verbose=False, **kwargs):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            self.send_error(503, "Simulated failure")
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+def serve(directory=data_loader.FIXTURE_DIR, port=0, latency=0.0, fail_rate=0.0, verbose=False):
+    """
+    Starts a fixture server on a background thread. Returns (server, url);
+    pass the url as base_url (or NFL_DATA_URL) and call server.shutdown()
+    when done. port=0 picks a free port.
+    """
+    handler = functools.partial(FixtureHandler, directory=directory, latency=latency,
+                                fail_rate=fail_rate, verbose=verbose)
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fixture seasons over HTTP as a stand-in for nflverse.")
+    parser.add_argument('--dir', default=data_loader.FIXTURE_DIR, help="Directory laid out like the season cache.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to wait before each response.")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Share of requests answered with HTTP 503.")
+    args = parser.parse_args()
+
+    server, url = serve(args.dir, args.port, args.latency, args.fail_rate, verbose=True)
+    print(f"Serving {args.dir} at {url} (set NFL_DATA_URL={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+class FormEngine:
+    """
+    Player form from per-player, per-week aggregates.
+
+    Built once from the melted role table (championship_analysis.
+    melt_player_roles: player, week, epa, success, posteam and optionally
+    season). The weeks of all seasons are laid out on one timeline of
+    slots and each per-week sum is stored as a players x slots prefix sum,
+    so any rolling window is a difference of two columns and
+    exponentially decayed form is one column of a decayed running sum:
+    every query is O(players), whatever the window length.
+
+    Windows and decay stop at the season boundary unless cross_seasons=True.
+
+    A window credits each player to the team of their first passing play
+    in it, else their first rushing, else first receiving play (the order
+    roles are listed in), as analyze_recent_form always has. Decayed form,
+    which has no window start, uses the team of their latest week.
+    """
+
+    def __init__(self, roles):
+        # Kept so a differently keyed engine can be built from the same plays
+        self.roles = roles
+        roles = roles.copy()
+        if 'season' not in roles.columns:
+            roles['season'] = 0
+        roles['season'] = roles['season'].astype(int)
+        roles['week'] = roles['week'].astype(int)
+
+        slots = roles[['season', 'week']].drop_duplicates().sort_values(['season', 'week'], ignore_index=True)
+        self.slot_season = slots['season'].to_numpy()
+        self.slot_week = slots['week'].to_numpy()
+        n_slots = len(slots)
+        # First slot of the season each slot belongs to.
+        first = np.r_[True, self.slot_season[1:] != self.slot_season[:-1]]
+        self.season_start = np.maximum.accumulate(np.where(first, np.arange(n_slots), 0))
+
+        player_codes, self.players = pd.factorize(roles['player'].astype(object), sort=True)
+        slot_codes = pd.MultiIndex.from_frame(slots).get_indexer(pd.MultiIndex.from_frame(roles[['season', 'week']]))
+        n_players = len(self.players)
+        flat = player_codes * n_slots + slot_codes
+        size = n_players * n_slots
+
+        epa = roles['epa'].to_numpy(dtype=float)
+        success = roles['success'].to_numpy(dtype=float)
+        weekly = {
+            'epa_sum': np.bincount(flat, np.nan_to_num(epa), size),
+            'epa_n': np.bincount(flat, ~np.isnan(epa), size),
+            'success_sum': np.bincount(flat, np.nan_to_num(success), size),
+            'success_n': np.bincount(flat, ~np.isnan(success), size),
+            'usage': np.bincount(flat, minlength=size).astype(float),
+        }
+        self.weekly = {name: values.reshape(n_players, n_slots) for name, values in weekly.items()}
+        self.cumulative = {
+            name: np.hstack([np.zeros((n_players, 1)), np.cumsum(values, axis=1)])
+            for name, values in self.weekly.items()
+        }
+
+        # Team as of each slot: the player's team in their latest week so far.
+        team_codes, self.teams = pd.factorize(roles['posteam'].astype(object))
+        latest = np.full(size, -1)
+        _, first_play = np.unique(flat, return_index=True)
+        latest[flat[first_play]] = team_codes[first_play]
+        latest = latest.reshape(n_players, n_slots)
+        seen = np.where(latest >= 0, np.arange(n_slots), 0)
+        self._team_slot = np.maximum.accumulate(seen, axis=1)
+        self._team_code = latest
+
+        # Per role: the team of the player's first play in each slot, and
+        # the next slot (n_slots if none) from each slot on with a play.
+        role_codes = pd.factorize(roles['role'])[0] if 'role' in roles.columns else np.zeros(len(roles), dtype=int)
+        self._role_teams = []
+        for code in range(role_codes.max() + 1 if len(roles) else 0):
+            in_role = np.flatnonzero(role_codes == code)
+            cells, first_play = np.unique(flat[in_role], return_index=True)
+            first_team = np.full(size, -1)
+            first_team[cells] = team_codes[in_role[first_play]]
+            played = np.full(size, n_slots)
+            played[cells] = cells % n_slots
+            next_slot = np.minimum.accumulate(played.reshape(n_players, n_slots)[:, ::-1], axis=1)[:, ::-1]
+            self._role_teams.append((next_slot, first_team.reshape(n_players, n_slots)))
+        self._decayed = {}
+
+    def slot(self, week=None, season=None):
+        """
+        Timeline slot of the last week with plays up to (season, week);
+        defaults to the latest week of the latest season.
+        """
+        season = self.slot_season[-1] if season is None else season
+        in_season = np.flatnonzero(self.slot_season == season)
+        if len(in_season) == 0:
+            return None
+        if week is None:
+            return in_season[-1]
+        upto = in_season[self.slot_week[in_season] <= week]
+        return upto[-1] if len(upto) else None
+
+    def _empty(self):
+        return pd.DataFrame(columns=['player', 'team', 'avg_epa', 'success_rate', 'usage_count'])
+
+    def _window_teams(self, start, end):
+        rows = np.arange(len(self.players))
+        team_codes = np.full(len(rows), -1)
+        for next_slot, first_team in self._role_teams:
+            slot = next_slot[:, start]
+            found = (team_codes < 0) & (slot <= end)
+            team_codes[found] = first_team[rows[found], slot[found]]
+        return team_codes
+
+    def _frame(self, sums, end, players, start=None):
+        rows = np.arange(len(self.players))
+        if start is None:
+            team_codes = self._team_code[rows, self._team_slot[:, end]]
+        else:
+            team_codes = self._window_teams(start, end)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            form = pd.DataFrame({
+                'player': self.players,
+                'team': np.where(team_codes >= 0, self.teams.to_numpy(dtype=object)[team_codes], None),
+                'avg_epa': sums['epa_sum'] / sums['epa_n'],
+                'success_rate': sums['success_sum'] / sums['success_n'],
+                'usage_count': sums['usage'],
+            })
+        form = form[form['usage_count'] > 0]
+        if players is not None:
+            present = set(form['player'])
+            form = form.set_index('player').reindex([p for p in players if p in present]).reset_index()
+        return form.reset_index(drop=True)
+
+    def window(self, weeks, week=None, season=None, players=None, cross_seasons=False):
+        """
+        Form over the last `weeks` weeks ending at (season, week): one row
+        per player with plays in the window (player, team, avg_epa,
+        success_rate, usage_count).
+        """
+        end = self.slot(week, season)
+        if end is None:
+            return self._empty()
+        if cross_seasons:
+            start = max(0, end - weeks + 1)
+        else:
+            # Calendar weeks of this season, so byes and gaps count as weeks.
+            first = self.season_start[end]
+            start = first + np.searchsorted(self.slot_week[first:end + 1], self.slot_week[end] - weeks + 1)
+        sums = {name: cum[:, end + 1] - cum[:, start] for name, cum in self.cumulative.items()}
+        form = self._frame(sums, end, players, start)
+        form['usage_count'] = form['usage_count'].astype(int)
+        return form
+
+    def _decayed_sums(self, halflife, cross_seasons):
+        key = (halflife, cross_seasons)
+        if key not in self._decayed:
+            decay = 0.5 ** (1 / halflife)
+            n_slots = len(self.slot_week)
+            decayed = {}
+            for name, values in self.weekly.items():
+                running = np.empty_like(values)
+                running[:, 0] = values[:, 0]
+                for t in range(1, n_slots):
+                    carry = 0.0 if (not cross_seasons and self.season_start[t] == t) else decay
+                    running[:, t] = values[:, t] + carry * running[:, t - 1]
+                decayed[name] = running
+            self._decayed[key] = decayed
+        return self._decayed[key]
+
+    def decayed(self, halflife, week=None, season=None, players=None, cross_seasons=False):
+        """
+        Exponentially decayed form at (season, week): each earlier week's
+        plays count half as much every `halflife` weeks. usage_count is the
+        decayed (effective) number of plays.
+        """
+        end = self.slot(week, season)
+        if end is None:
+            return self._empty()
+        sums = {name: running[:, end] for name, running in self._decayed_sums(halflife, cross_seasons).items()}
+        return self._frame(sums, end, players)
+
+    def compare(self, windows=(3, 5, 8), halflife=None, week=None, season=None, players=None):
+        """
+        Side-by-side EPA/play and success rate for several windows (and a
+        decayed form when halflife is given), one row per player.
+        """
+        views = [(f'{n}w', self.window(n, week, season, players)) for n in windows]
+        if halflife is not None:
+            views.append((f'hl{halflife:g}', self.decayed(halflife, week, season, players)))
+
+        table = None
+        for label, form in views:
+            form = form.set_index('player')[['team', 'avg_epa', 'success_rate', 'usage_count']].rename(columns={
+                'avg_epa': f'epa_{label}', 'success_rate': f'success_{label}', 'usage_count': f'usage_{label}',
+            })
+            if table is None:
+                table = form
+            else:
+                table = table.join(form.drop(columns='team'), how='outer')
+                table['team'] = table['team'].fillna(form['team'])
+        return table.reset_index()
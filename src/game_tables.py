@@ -0,0 +1,84 @@
+import pandas as pd
+
+from src import aggregates, data_loader
+from src.season_context import SeasonContext
+
+# Play-by-play columns the game and drive tables are built from.
+PBP_COLUMNS = ['season_type', 'game_id', 'drive', 'play_type', 'posteam', 'defteam', 'epa', 'success']
+
+# Metrics summed in both tables, for all plays and for pass and run plays.
+METRICS = ['epa', 'success']
+SPLITS = ['pass', 'run']
+
+GAME_KEYS = ['season', 'season_type', 'week', 'game_id', 'posteam', 'defteam']
+DRIVE_KEYS = GAME_KEYS + ['drive']
+
+def build_table(pbp, keys):
+    """
+    Partial sums of METRICS (see aggregates.partial_stats) per keys, for
+    all plays and, with 'pass_' / 'run_' prefixes, for each play type.
+    One row per team per game (or drive), so team-level questions can be
+    answered with aggregates.rollup instead of a pass over the plays.
+    """
+    table = aggregates.partial_stats(pbp, keys, METRICS)
+    for play_type in SPLITS:
+        rows = pbp[pbp['play_type'] == play_type]
+        split = aggregates.partial_stats(rows, keys, METRICS).add_prefix(f'{play_type}_')
+        table = table.join(split)
+    split_columns = [c for c in table.columns if c.startswith(tuple(f'{t}_' for t in SPLITS))]
+    table[split_columns] = table[split_columns].fillna(0)
+    table = table.reset_index()
+    for col in ('plays', *[f'{t}_plays' for t in SPLITS], *[c for c in table.columns if c.endswith('_n')]):
+        table[col] = table[col].astype('int64')
+    return table
+
+def build_game_table(pbp):
+    """
+    Per-game, per-offense aggregates: one row per (game, posteam).
+    """
+    return build_table(pbp, GAME_KEYS)
+
+def build_drive_table(pbp):
+    """
+    Per-drive aggregates: one row per (game, drive, posteam).
+    """
+    return build_table(pbp, DRIVE_KEYS)
+
+def _load(name, pbp, build):
+    frames = []
+    for season in sorted(pbp['season'].unique()):
+        rows = pbp[pbp['season'] == season]
+        frames.append(data_loader.load_table(name, int(season), lambda rows=rows: build(rows), rows=len(rows)))
+    return pd.concat(frames, ignore_index=True)
+
+def load_game_table(pbp):
+    """
+    The game table for every season in pbp, cached per season next to the
+    season data (see data_loader.load_table) when pbp holds that whole
+    cached season; seasons filtered to some weeks are built uncached.
+    """
+    if isinstance(pbp, SeasonContext):
+        ctx = pbp
+        return ctx.memo('game_table', lambda: load_game_table(ctx.pbp))
+    return _load('games', pbp, build_game_table)
+
+def load_season_game_table(year, **kwargs):
+    """
+    The game table for one season straight from the cache: the season's
+    play-by-play is only read (or fetched; kwargs go to
+    data_loader.load_season) when the table has to be rebuilt.
+    """
+    def build():
+        return build_game_table(data_loader.load_season(
+            'pbp', year, columns=data_loader.schema_columns(PBP_COLUMNS), **kwargs))
+    cache_dir = kwargs.get('cache_dir', data_loader.CACHE_DIR)
+    return data_loader.load_table('games', year, build, cache_dir=cache_dir)
+
+def load_drive_table(pbp):
+    """
+    The drive table for every season in pbp, cached like load_game_table.
+    """
+    if isinstance(pbp, SeasonContext):
+        ctx = pbp
+        return ctx.memo('drive_table', lambda: load_drive_table(ctx.pbp))
+    return _load('drives', pbp, build_drive_table)
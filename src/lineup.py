@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+# Allow running as a script (python src/lineup.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Starting lineup: slot -> number of starters.
+SLOTS = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'FLEX': 1, 'K': 1, 'DST': 1}
+
+# Positions that can fill each slot (anything else fills only its own).
+SLOT_POSITIONS = {'FLEX': ['RB', 'WR', 'TE']}
+
+# Assignment value of an ineligible (player, slot) pair: low enough that
+# it is only chosen when a slot cannot be filled, and is then left empty.
+INELIGIBLE = -1e9
+
+def parse_slots(spec):
+    """
+    Parses 'QB=1,RB=2,WR=3,TE=1,FLEX=1' into a slots dict.
+    """
+    slots = {}
+    for part in spec.split(','):
+        slot, count = part.split('=')
+        slots[slot.strip().upper()] = int(count)
+    return slots
+
+def slot_list(slots=SLOTS):
+    """
+    One entry per starter: {'RB': 2} -> ['RB', 'RB'].
+    """
+    return [slot for slot, count in slots.items() for _ in range(count)]
+
+def eligibility(positions, slots):
+    """
+    (players x slots) mask of which player can fill which slot.
+    """
+    positions = np.asarray(positions, dtype=object)
+    mask = np.zeros((len(positions), len(slots)), dtype=bool)
+    for col, slot in enumerate(slots):
+        mask[:, col] = np.isin(positions, SLOT_POSITIONS.get(slot, [slot]))
+    return mask
+
+def assign(projections, positions, slots):
+    """
+    The lineup with the highest total projection: solves the players x
+    slots assignment problem (scipy's linear_sum_assignment). Players
+    without a projection are never started; slots no eligible player can
+    fill stay empty.
+
+    Returns (player rows, slot columns) of the starters.
+    """
+    projections = np.asarray(projections, dtype=float)
+    value = np.where(eligibility(positions, slots) & ~np.isnan(projections)[:, None],
+                     np.nan_to_num(projections)[:, None], INELIGIBLE)
+    rows, cols = linear_sum_assignment(value, maximize=True)
+    filled = value[rows, cols] > INELIGIBLE
+    return rows[filled], cols[filled]
+
+def optimize_rosters(entries, slots=SLOTS):
+    """
+    Optimal lineups for every roster in entries, one row per roster
+    player (columns team, player, position and projection; team is the
+    fantasy team and may be absent for a single roster).
+
+    Returns the entries with a 'slot' column (the slot started in, or
+    'BENCH'), starters first in slot order.
+    """
+    slots = slot_list(slots)
+    if 'team' not in entries.columns:
+        entries = entries.assign(team='')
+    entries = entries.sort_values('team', kind='stable', ignore_index=True)
+    projections = entries['projection'].to_numpy(dtype=float)
+    positions = entries['position'].str.upper().to_numpy(dtype=object)
+
+    slot_index = np.full(len(entries), len(slots))          # len(slots) = bench
+    teams, starts = np.unique(entries['team'].to_numpy(dtype=object), return_index=True)
+    bounds = np.r_[starts, len(entries)]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        rows, cols = assign(projections[start:end], positions[start:end], slots)
+        slot_index[start + rows] = cols
+
+    lineups = entries.assign(slot=np.asarray(slots + ['BENCH'], dtype=object)[slot_index], _order=slot_index)
+    lineups = lineups.sort_values(['team', '_order'], kind='stable', ignore_index=True).drop(columns='_order')
+    return lineups[['team', 'slot', 'player', 'position', 'projection']]
+
+def lineup_totals(lineups):
+    """
+    Projected points of each roster's starters, best first.
+    """
+    starters = lineups[lineups['slot'] != 'BENCH']
+    totals = starters.groupby('team', sort=False).agg(starters=('player', 'size'), total=('projection', 'sum'))
+    return totals.reset_index().sort_values('total', ascending=False, ignore_index=True)
+
+def _entries(rosters):
+    """
+    Long entries from {team: {position: [players]}}.
+    """
+    rows = [(team, player, position.upper())
+            for team, roster in rosters.items()
+            for position, players in roster.items()
+            for player in players]
+    return pd.DataFrame(rows, columns=['team', 'player', 'position'])
+
+def load_rosters(path):
+    """
+    Reads rosters from a CSV file (columns team, player, position and
+    optionally projection; team may be omitted for one roster) or a JSON
+    file holding one roster ({position: [players]}, the shape of
+    championship_analysis.get_roster_config) or several ({team: roster}).
+    Returns the long entries, or None on error.
+    """
+    try:
+        if path.endswith('.json'):
+            with open(path) as f:
+                data = json.load(f)
+            if all(isinstance(players, list) for players in data.values()):
+                data = {'': data}
+            return _entries(data)
+        entries = pd.read_csv(path)
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Error reading rosters from {path}: {e}")
+        return None
+    entries.columns = entries.columns.str.lower()
+    missing = {'player', 'position'} - set(entries.columns)
+    if missing:
+        print(f"Error reading rosters from {path}: missing columns {sorted(missing)}")
+        return None
+    if 'team' in entries.columns:
+        entries['team'] = entries['team'].fillna('').astype(str)
+    entries['position'] = entries['position'].str.upper()
+    return entries
+
+def run(path, slots=SLOTS, week=17, form_weeks=5, halflife=None, **kwargs):
+    """
+    Optimal lineups for the rosters in path. Players are projected with
+    championship_analysis.project_players unless the file has a
+    projection column. Returns the lineups, or None on error.
+    """
+    entries = load_rosters(path)
+    if entries is None:
+        return None
+    if 'projection' not in entries.columns:
+        from src import championship_analysis
+        projections = championship_analysis.project_players(
+            entries[['player', 'position']], week, form_weeks, halflife, **kwargs)
+        if projections is None:
+            return None
+        entries = entries.assign(projection=entries['player'].map(projections))
+    return optimize_rosters(entries, slots)
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimal fantasy lineups for one roster or a whole league.")
+    parser.add_argument('rosters', help="Roster CSV (team, player, position[, projection]) or JSON file.")
+    parser.add_argument('--slots', type=parse_slots, default=SLOTS, help="e.g. QB=1,RB=2,WR=2,TE=1,FLEX=1,K=1,DST=1")
+    parser.add_argument('--week', type=int, default=17)
+    parser.add_argument('--form-weeks', type=int, default=5, help="Weeks of recent form to project from.")
+    parser.add_argument('--halflife', type=float, default=None,
+                        help="Use decay-weighted form with this half-life in weeks instead of a fixed window.")
+    parser.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+    parser.add_argument('--output', default=None, help="Write every lineup as CSV here.")
+    args = parser.parse_args()
+
+    lineups = run(args.rosters, args.slots, args.week, args.form_weeks, args.halflife, offline=args.offline)
+    if lineups is None:
+        return
+    totals = lineup_totals(lineups)
+    pd.set_option('display.width', 160)
+    if len(totals) > 1:
+        print(f"\nOptimized {len(totals)} lineups. Highest projected:")
+        print(totals.head(10).round(3).to_string(index=False))
+    else:
+        print(lineups.drop(columns='team').round(3).to_string(index=False))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        lineups.to_csv(args.output, index=False)
+        print(f"\nLineups written to {args.output}")
+
+if __name__ == "__main__":
+    main()
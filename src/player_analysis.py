@@ -1,81 +1,196 @@
 import pandas as pd
 import numpy as np
 
-def analyze_players(pbp_df, roster_df):
+from src import aggregates
+from src.player_index import PlayerIndex
+from src.season_context import SeasonContext
+
+# Play-by-play columns this analysis reads (see data_loader.schema_columns).
+PBP_COLUMNS = [
+    'play_type', 'posteam', 'epa', 'cpoe', 'success', 'xyac_epa',
+    'passer_player_id', 'passer_player_name',
+    'rusher_player_id', 'rusher_player_name',
+    'receiver_player_id', 'receiver_player_name',
+]
+
+# Group keys and scored metrics for each player table. All tables also
+# carry partial sums for aggregates.TRACKED_METRICS.
+PLAYER_GROUPS = {
+    'qb': (['passer_player_id', 'passer_player_name'], ['epa', 'cpoe']),
+    'rb': (['rusher_player_id', 'rusher_player_name'], ['epa', 'success']),
+    'wr': (['receiver_player_id', 'receiver_player_name'], ['epa', 'xyac_epa']),
+}
+
+# Play-by-play role of the players in each table (the '<role>_player_key'
+# column PlayerIndex.attach adds), the roster positions a table reports
+# as themselves, and the label used for everyone else (players who are
+# not on the roster, or who play out of position, e.g. rushing QBs).
+GROUP_ROLES = {'qb': 'passer', 'rb': 'rusher', 'wr': 'receiver'}
+GROUP_POSITIONS = {'qb': ['QB'], 'rb': ['RB', 'FB'], 'wr': ['WR', 'TE']}
+GROUP_LABELS = {'qb': 'QB', 'rb': 'RB', 'wr': 'WR/TE'}
+
+# Minimum plays (passes, rushes, targets) for a player to be scored, and
+# the weights of each metric's z-score in the composite score (60% EPA,
+# 40% CPOE for QBs). A missing mean of a metric in FILL_ZERO (receivers
+# without xyac_epa) is scored as 0. src/bootstrap.py scores resamples
+# with the same tables.
+MIN_PLAYS = {'qb': 100, 'rb': 50, 'wr': 30}
+SCORE_WEIGHTS = {
+    'qb': {'epa': 0.6, 'cpoe': 0.4},
+    'rb': {'epa': 0.5, 'success': 0.5},
+    'wr': {'epa': 0.6, 'xyac_epa': 0.4},
+}
+FILL_ZERO = {'wr': ['xyac_epa']}
+Z_COLUMNS = {'epa': 'epa_z', 'cpoe': 'cpoe_z', 'success': 'success_z', 'xyac_epa': 'xyac_z'}
+
+def roster_positions(stats, group, index=None):
     """
-    Analyzes player performance to determine the most impressive players.
+    Sets 'position' to each player's roster position when it belongs in
+    the table (WR or TE in the receiving table), and to the table's label
+    otherwise or when no index is given. Tables hold everyone in the role,
+    so a scrambling QB is also in the rushing table, labelled 'RB' there:
+    a player's rows in different tables never share a position.
+    """
+    default = GROUP_LABELS[group]
+    if index is None:
+        return stats.assign(position=default)
+    key_col = f'{GROUP_ROLES[group]}_player_key'
+    keys = stats[key_col] if key_col in stats.columns else index.keys(stats[PLAYER_GROUPS[group][0][0]])
+    positions = index.positions(keys)
+    return stats.assign(position=np.where(np.isin(positions, GROUP_POSITIONS[group]), positions, default))
+
+def player_index(roster_df, pbp=None):
+    """
+    A PlayerIndex from a roster frame (passed through if it already is one);
+    with pbp, ids in it that are not on the roster get keys too.
+    """
+    if roster_df is None or isinstance(roster_df, PlayerIndex):
+        return roster_df
+    return PlayerIndex(roster_df, pbp)
+
+def aggregate_players(pbp_df, index=None):
+    """
+    Builds mergeable per-player partial sums for one chunk of plays
+    (a season, a week, or a whole concatenated frame).
+
+    With a PlayerIndex covering every player id in the chunk, tables are
+    grouped on its integer keys (PlayerIndex.attach) instead of the id and
+    name columns, which are carried along. Such tables only merge with
+    tables keyed on the same index.
     """
-    print("Analyzing player performance...")
-    
     # Filter for relevant plays (passes and runs)
     plays = pbp_df[pbp_df['play_type'].isin(['pass', 'run'])]
-    
-    # --- QB Analysis ---
-    # Filter for QBs with at least 100 plays
-    qb_stats = plays.groupby(['passer_player_id', 'passer_player_name']).agg({
-        'epa': 'mean',
-        'cpoe': 'mean',
-        'play_id': 'count',
-        'posteam': 'first'
-    }).reset_index()
-    
-    qb_stats = qb_stats[qb_stats['play_id'] >= 100].copy()
-    
-    # Normalize metrics
-    qb_stats['epa_z'] = (qb_stats['epa'] - qb_stats['epa'].mean()) / qb_stats['epa'].std()
-    qb_stats['cpoe_z'] = (qb_stats['cpoe'] - qb_stats['cpoe'].mean()) / qb_stats['cpoe'].std()
-    
-    # Composite score for QBs (60% EPA, 40% CPOE)
-    qb_stats['impressiveness_score'] = (0.6 * qb_stats['epa_z']) + (0.4 * qb_stats['cpoe_z'])
-    qb_stats['position'] = 'QB'
-    
-    # --- RB/WR/TE Analysis ---
-    # Group by receiver/rusher
-    # Note: 'fantasy_player_id' or similar might be better, but we'll use rusher/receiver IDs
-    
-    # Rusher stats
     run_plays = plays[plays['play_type'] == 'run']
-    rb_stats = run_plays.groupby(['rusher_player_id', 'rusher_player_name']).agg({
-        'epa': 'mean',
-        'success': 'mean',
-        'play_id': 'count',
-        'posteam': 'first'
-    }).reset_index()
-    rb_stats = rb_stats[rb_stats['play_id'] >= 50].copy() # Lower threshold for RBs
-    
-    # Receiver stats
     pass_plays = plays[plays['play_type'] == 'pass']
-    wr_stats = pass_plays.groupby(['receiver_player_id', 'receiver_player_name']).agg({
-        'epa': 'mean',
-        'xyac_epa': 'mean', # Expected YAC EPA
-        'play_id': 'count',
-        'posteam': 'first'
-    }).reset_index()
-    wr_stats = wr_stats[wr_stats['play_id'] >= 30].copy() # Targets
-    
-    # Normalize and score RBs
-    rb_stats['epa_z'] = (rb_stats['epa'] - rb_stats['epa'].mean()) / rb_stats['epa'].std()
-    rb_stats['success_z'] = (rb_stats['success'] - rb_stats['success'].mean()) / rb_stats['success'].std()
-    rb_stats['impressiveness_score'] = (0.5 * rb_stats['epa_z']) + (0.5 * rb_stats['success_z'])
-    rb_stats['position'] = 'RB' # Simplified, could check roster for actual pos
-    
-    # Normalize and score WRs
-    wr_stats['epa_z'] = (wr_stats['epa'] - wr_stats['epa'].mean()) / wr_stats['epa'].std()
-    # Handle missing xyac_epa
-    wr_stats['xyac_epa'] = wr_stats['xyac_epa'].fillna(0)
-    wr_stats['xyac_z'] = (wr_stats['xyac_epa'] - wr_stats['xyac_epa'].mean()) / wr_stats['xyac_epa'].std()
-    wr_stats['impressiveness_score'] = (0.6 * wr_stats['epa_z']) + (0.4 * wr_stats['xyac_z'])
-    wr_stats['position'] = 'WR/TE'
-    
+    return _aggregate_views(plays, run_plays, pass_plays, index)
+
+def _aggregate_views(plays, run_plays, pass_plays, index=None):
+    sources = {'qb': plays, 'rb': run_plays, 'wr': pass_plays}
+    return {name: _aggregate_group(sources[name], name, index) for name in PLAYER_GROUPS}
+
+def _aggregate_group(plays, group, index=None):
+    keys = PLAYER_GROUPS[group][0]
+    metrics = aggregates.TRACKED_METRICS
+    if index is not None:
+        key_col = f'{GROUP_ROLES[group]}_player_key'
+        keyed = index.attach(plays[keys + metrics + ['posteam']])
+        known = keyed[key_col] >= 0
+        # Plays without an id are left out, as when grouping on the id
+        # columns; an id the index does not know keeps the id/name grouping
+        if (known | keyed[keys[0]].isna()).all():
+            return aggregates.partial_stats(keyed[known], [key_col], metrics, first=['posteam'] + keys)
+    return aggregates.partial_stats(plays, keys, metrics, first=['posteam'])
+
+def combine_player_aggregates(parts):
+    """
+    Merges several aggregate_players results into one.
+    """
+    parts = [p for p in parts if p is not None]
+    return {
+        name: aggregates.combine_partials([p[name] for p in parts])
+        for name in PLAYER_GROUPS
+    }
+
+def _finalize(partial, group, spread=False):
+    keys, metrics = PLAYER_GROUPS[group]
+    stats = aggregates.finalize(partial, metrics, spread)
+    # Tables keyed on PlayerIndex keys carry the id and name as columns
+    return stats[keys + [col for col in stats.columns if col not in keys]]
+
+def score_group(stats, group):
+    """
+    Adds the z-score of each scored metric of a player table and their
+    weighted sum, the impressiveness_score.
+    """
+    score = 0.0
+    for metric, weight in SCORE_WEIGHTS[group].items():
+        if metric in FILL_ZERO.get(group, []):
+            stats[metric] = stats[metric].fillna(0)
+        z = Z_COLUMNS[metric]
+        stats[z] = (stats[metric] - stats[metric].mean()) / stats[metric].std()
+        score = score + weight * stats[z]
+    stats['impressiveness_score'] = score
+    return stats
+
+def rank_players(player_aggs, roster_df=None, spread=False):
+    """
+    Scores players from aggregated partial sums.
+
+    With a roster (DataFrame or PlayerIndex; the index the tables are
+    keyed on, if they are), players are labelled with their true position.
+    With spread=True, every table also carries the per-play standard
+    deviation of each metric (epa_sd, ...), and all_players its epa_sd.
+    """
+    index = player_index(roster_df)
+    stats = {}
+    for group in PLAYER_GROUPS:
+        table = _finalize(player_aggs[group], group, spread)
+        # Filter for players with enough plays (passes, rushes or targets)
+        table = roster_positions(table[table['play_id'] >= MIN_PLAYS[group]], group, index)
+        stats[group] = score_group(table, group)
+
     # Combine all
     # Rename columns to match
-    qb_final = qb_stats[['passer_player_name', 'position', 'impressiveness_score', 'posteam']].rename(columns={'passer_player_name': 'player_name'})
-    rb_final = rb_stats[['rusher_player_name', 'position', 'impressiveness_score', 'posteam']].rename(columns={'rusher_player_name': 'player_name'})
-    wr_final = wr_stats[['receiver_player_name', 'position', 'impressiveness_score', 'posteam']].rename(columns={'receiver_player_name': 'player_name'})
-    
-    all_players = pd.concat([qb_final, rb_final, wr_final], ignore_index=True)
-    
+    final = ['position', 'impressiveness_score', 'posteam'] + (['epa_sd'] if spread else [])
+    all_players = pd.concat([
+        stats[group][[f'{role}_player_name'] + final].rename(columns={f'{role}_player_name': 'player_name'})
+        for group, role in GROUP_ROLES.items()
+    ], ignore_index=True)
+
     # Sort by score
     top_10 = all_players.sort_values('impressiveness_score', ascending=False).head(10)
-    
-    return top_10, qb_stats, all_players
+
+    return top_10, stats['qb'], all_players
+
+def context_player_aggregates(ctx, index=None):
+    """
+    Player aggregates for a SeasonContext, built once (per index) from its
+    shared views.
+    """
+    name = 'player_aggregates' if index is None else ('player_aggregates', index)
+    return ctx.memo(name, lambda: _aggregate_views(ctx.plays, ctx.run_plays, ctx.pass_plays, index))
+
+def analyze_players(pbp_df, roster_df):
+    """
+    Analyzes player performance to determine the most impressive players.
+
+    pbp_df may be a DataFrame, a SeasonContext, or an iterable of
+    DataFrame chunks (see data_loader.iter_data); chunks are folded into
+    running partial sums so only one chunk is held in memory at a time.
+    A frame or context is grouped on PlayerIndex keys when a roster is
+    given; chunks keep the id/name keys, so their partials merge.
+    """
+    print("Analyzing player performance...")
+
+    if isinstance(pbp_df, SeasonContext):
+        index = player_index(roster_df, pbp_df.pbp)
+        return rank_players(context_player_aggregates(pbp_df, index), index)
+    if isinstance(pbp_df, pd.DataFrame):
+        index = player_index(roster_df, pbp_df)
+        return rank_players(aggregate_players(pbp_df, index), index)
+
+    player_aggs = None
+    for chunk in pbp_df:
+        player_aggs = combine_player_aggregates([player_aggs, aggregate_players(chunk)])
+
+    return rank_players(player_aggs, roster_df)
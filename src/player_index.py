@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+# Play-by-play id columns, one per way a player can be involved in a play.
+PBP_ID_COLUMNS = {
+    'passer': ('passer_player_id', 'passer_player_name'),
+    'rusher': ('rusher_player_id', 'rusher_player_name'),
+    'receiver': ('receiver_player_id', 'receiver_player_name'),
+}
+
+def _normalize(names):
+    """Case- and whitespace-insensitive form of a name, for lookups."""
+    return pd.Series(names, dtype=object).astype(str).str.lower().str.replace(r'\s+', '', regex=True)
+
+def abbreviate(first_names, last_names):
+    """
+    Play-by-play style names ('C.McCaffrey') from first and last names.
+    """
+    first = pd.Series(first_names, dtype=object).fillna('').astype(str).str[:1]
+    return (first + '.' + pd.Series(last_names, dtype=object).fillna('').astype(str)).to_numpy()
+
+class PlayerIndex:
+    """
+    Player identities built once from seasonal rosters.
+
+    Every gsis id gets an integer key; players holds the canonical name,
+    play-by-play abbreviation and latest position per key, and stints the
+    (key, season, team, position) rows. Ids seen in play-by-play but not
+    on any roster (pass pbp=...) get keys too, with no position.
+
+    Lookups (keys, positions, resolve) are vectorized index operations, and
+    attach() adds integer key columns to a play-by-play frame.
+    """
+
+    def __init__(self, roster, pbp=None):
+        roster = roster.dropna(subset=['player_id'])
+        if 'season' in roster.columns:
+            roster = roster.sort_values('season', kind='stable')
+        latest = roster.drop_duplicates('player_id', keep='last')
+
+        first = latest['football_name'].fillna(latest['first_name']) if 'football_name' in latest else latest['first_name']
+        players = pd.DataFrame({
+            'player_id': latest['player_id'].astype(str).to_numpy(),
+            'player_name': latest['player_name'].astype(object).to_numpy(),
+            'abbrev': abbreviate(first, latest['last_name']),
+            'position': latest['position'].astype(object).to_numpy(),
+        })
+
+        if pbp is not None:
+            players = pd.concat([players, self._unrostered(pbp, set(players['player_id']))], ignore_index=True)
+        self.players = players
+        self._ids = pd.Index(players['player_id'])
+
+        stints = roster[[c for c in ('season', 'team', 'position') if c in roster.columns]].copy()
+        stints.insert(0, 'key', self._ids.get_indexer(roster['player_id'].astype(str)))
+        self.stints = stints.drop_duplicates().reset_index(drop=True)
+
+        # name (full or abbreviated, normalized) -> candidate keys
+        keys = np.arange(len(players))
+        names = pd.concat([
+            pd.DataFrame({'name': _normalize(players['player_name']).to_numpy(), 'key': keys}),
+            pd.DataFrame({'name': _normalize(players['abbrev']).to_numpy(), 'key': keys}),
+        ]).drop_duplicates()
+        self._names = names.groupby('name')['key'].agg(list)
+
+    @staticmethod
+    def _unrostered(pbp, known):
+        frames = []
+        for id_col, name_col in PBP_ID_COLUMNS.values():
+            if id_col in pbp.columns:
+                # One row per distinct id before converting to objects
+                seen = pbp[[c for c in (id_col, name_col) if c in pbp.columns]].drop_duplicates(id_col)
+                frames.append(pd.DataFrame({
+                    'player_id': seen[id_col].astype(object).to_numpy(),
+                    'abbrev': seen[name_col].astype(object).to_numpy() if name_col in seen.columns else None,
+                }))
+        seen = pd.concat(frames, ignore_index=True).dropna(subset=['player_id']).drop_duplicates('player_id')
+        seen['player_id'] = seen['player_id'].astype(str)
+        seen = seen[~seen['player_id'].isin(known)]
+        return pd.DataFrame({
+            'player_id': seen['player_id'].to_numpy(),
+            'player_name': seen['abbrev'].to_numpy(),
+            'abbrev': seen['abbrev'].to_numpy(),
+            'position': None,
+        })
+
+    def __len__(self):
+        return len(self.players)
+
+    def keys(self, player_ids):
+        """
+        Integer keys for gsis ids (-1 for unknown or missing ids).
+        """
+        if isinstance(getattr(player_ids, 'dtype', None), pd.CategoricalDtype):
+            # Look up each category once and index by the codes
+            codes = np.asarray(player_ids.cat.codes if isinstance(player_ids, pd.Series) else player_ids.codes)
+            return np.append(self.keys(player_ids.dtype.categories), -1)[codes]
+        ids = pd.Series(player_ids, dtype=object)
+        keys = self._ids.get_indexer(ids.astype(str))
+        keys[ids.isna().to_numpy()] = -1
+        return keys
+
+    def positions(self, keys):
+        """
+        Roster positions for keys (None for -1 or unrostered players).
+        """
+        keys = np.asarray(keys)
+        positions = np.append(self.players['position'].to_numpy(dtype=object), None)
+        return positions[np.where(keys >= 0, keys, len(self.players))]
+
+    def names(self, keys, abbreviated=False):
+        """
+        Canonical (or play-by-play style) names for keys.
+        """
+        keys = np.asarray(keys)
+        names = np.append(self.players['abbrev' if abbreviated else 'player_name'].to_numpy(dtype=object), None)
+        return names[np.where(keys >= 0, keys, len(self.players))]
+
+    def resolve(self, names, positions=None, season=None):
+        """
+        Keys for player names: gsis ids, full names or abbreviated names
+        ('C.McCaffrey'), ignoring case and spacing. Names shared by several
+        players are narrowed to those with a stint at the name's position
+        (positions: one per name, e.g. from a fantasy roster; None skips
+        a name) and in season, if given; names that stay ambiguous or are
+        unknown resolve to -1.
+        """
+        names = list(names)
+        positions = [None] * len(names) if positions is None else list(positions)
+        by_id = self._ids.get_indexer(pd.Index(names, dtype=object).astype(str))
+        candidates = self._names.reindex(_normalize(names).to_numpy())
+        keys = np.full(len(names), -1)
+        for i, (key, found) in enumerate(zip(by_id, candidates.to_numpy())):
+            if key >= 0:
+                keys[i] = key
+            elif isinstance(found, list):
+                if len(found) > 1:
+                    stints = self.stints[self.stints['key'].isin(found)]
+                    if positions[i] is not None and 'position' in stints.columns:
+                        stints = stints[stints['position'] == positions[i]]
+                    if season is not None and 'season' in stints.columns:
+                        stints = stints[stints['season'] == season]
+                    found = stints['key'].unique().tolist()
+                if len(found) == 1:
+                    keys[i] = found[0]
+        return keys
+
+    def attach(self, pbp):
+        """
+        Adds an integer '<role>_player_key' column (-1 when missing) for
+        each player id column in pbp.
+        """
+        pbp = pbp.copy()
+        for role, (id_col, _) in PBP_ID_COLUMNS.items():
+            if id_col in pbp.columns:
+                pbp[f'{role}_player_key'] = self.keys(pbp[id_col]).astype(np.int32)
+        return pbp
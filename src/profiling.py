@@ -0,0 +1,150 @@
+import contextlib
+import cProfile
+import json
+import os
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+
+def reset_peak_rss():
+    """
+    Resets the kernel's peak-RSS counter for this process (Linux only), so
+    the next peak_rss_mb() reading covers just what runs in between.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def _proc_status_mb(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def rss_mb():
+    """
+    Current resident set size in MB (falls back to the peak off Linux).
+    """
+    current = _proc_status_mb('VmRSS')
+    return current if current is not None else peak_rss_mb()
+
+def peak_rss_mb():
+    """
+    Peak resident set size in MB since the last reset_peak_rss().
+    """
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+class Profiler:
+    """
+    Records wall time, CPU time, rows processed and memory per pipeline
+    stage, and writes them as a JSON trace.
+
+    Usage:
+        with profiler.stage('load_data') as record:
+            pbp = data_loader.load_data(...)
+            record['rows'] = len(pbp)
+
+    With cprofile_dir set, each stage is also run under cProfile and the
+    stats are dumped to <cprofile_dir>/<stage>.prof. A disabled profiler
+    records nothing and adds no overhead beyond the context manager.
+    """
+
+    def __init__(self, enabled=True, cprofile_dir=None):
+        self.enabled = enabled
+        self.cprofile_dir = cprofile_dir
+        self.stages = []
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        record = {'stage': name, 'rows': rows}
+        if not self.enabled:
+            yield record
+            return
+
+        profile = cProfile.Profile() if self.cprofile_dir else None
+        reset_peak_rss()
+        rss_before = rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profile:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile:
+                profile.disable()
+            wall = time.perf_counter() - wall_start
+            record.update({
+                'wall_s': round(wall, 4),
+                'cpu_s': round(time.process_time() - cpu_start, 4),
+                'rss_before_mb': round(rss_before, 1),
+                'rss_delta_mb': round(rss_mb() - rss_before, 1),
+                'peak_rss_mb': round(peak_rss_mb(), 1),
+            })
+            if record['rows'] is not None and wall > 0:
+                record['rows_per_s'] = round(record['rows'] / wall)
+            if profile:
+                os.makedirs(self.cprofile_dir, exist_ok=True)
+                path = os.path.join(self.cprofile_dir, f"{len(self.stages):02d}_{name}.prof")
+                profile.dump_stats(path)
+                record['cprofile'] = path
+            self.stages.append(record)
+
+    def add(self, name, wall_s, cpu_s, rows=None, parent=None, **fields):
+        """
+        Records a stage timed elsewhere (e.g. one chart drawn in a worker
+        process). A stage with a parent ran inside that stage, so it is
+        listed but not counted again in the total.
+        """
+        if not self.enabled:
+            return
+        record = {'stage': name, 'rows': rows, 'wall_s': round(wall_s, 4), 'cpu_s': round(cpu_s, 4), **fields}
+        if parent is not None:
+            record['parent'] = parent
+        if rows is not None and wall_s > 0:
+            record['rows_per_s'] = round(rows / wall_s)
+        self.stages.append(record)
+
+    def trace(self):
+        """
+        The recorded stages as a JSON-serializable dict.
+        """
+        return {
+            'started_at': self.started_at,
+            'argv': sys.argv,
+            'total_wall_s': round(sum(s['wall_s'] for s in self.stages if 'parent' not in s), 4),
+            'stages': self.stages,
+        }
+
+    def write(self, path):
+        """
+        Writes the JSON trace to path.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f, indent=2)
+
+    def summary(self):
+        """
+        One line per stage, slowest first.
+        """
+        lines = [f"{'Stage':<24}{'Wall (s)':>10}{'CPU (s)':>10}{'Rows':>10}{'dRSS (MB)':>11}{'Peak (MB)':>11}"]
+        for s in sorted(self.stages, key=lambda s: s['wall_s'], reverse=True):
+            rows = '' if s['rows'] is None else s['rows']
+            memory = (f"{s['rss_delta_mb']:>11.1f}{s['peak_rss_mb']:>11.1f}" if 'rss_delta_mb' in s
+                      else f"{'':>11}{'':>11}")
+            lines.append(f"{s['stage']:<24}{s['wall_s']:>10.3f}{s['cpu_s']:>10.3f}{rows:>10}{memory}")
+        return '\n'.join(lines)
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+# Ridge penalty, in plays: every rating is shrunk toward the league average
+# as if the team had this many extra plays of exactly average EPA.
+RIDGE = 100.0
+
+def design_matrix(off_codes, def_codes, season_codes, n_teams, n_seasons):
+    """
+    Sparse design with, per row, a 1 in the offense's column, a 1 in the
+    defense's column (offset by n_teams) and a 1 in the season intercept's
+    column (offset by 2 * n_teams).
+    """
+    rows = np.arange(len(off_codes))
+    cols = np.concatenate([off_codes, n_teams + def_codes, 2 * n_teams + season_codes])
+    return sparse.csr_matrix(
+        (np.ones(3 * len(rows)), (np.tile(rows, 3), cols)),
+        shape=(len(rows), 2 * n_teams + n_seasons),
+    )
+
+def fit_ratings(off_codes, def_codes, season_codes, epa_sum, epa_n, n_teams, n_seasons, ridge=RIDGE):
+    """
+    Jointly fits offense and defense ratings by ridge-regularized weighted
+    least squares: each row's EPA/play (epa_sum / epa_n, weighted by epa_n)
+    is modelled as season average + offense rating + defense rating.
+
+    Rows can be single plays (epa_n = 1) or any pre-summed group of plays
+    (e.g. a team's plays in one game); both give the same fit. Season
+    intercepts are not penalized. Returns (off, def, intercepts).
+    """
+    X = design_matrix(off_codes, def_codes, season_codes, n_teams, n_seasons)
+    penalty = np.r_[np.full(2 * n_teams, float(ridge)), np.zeros(n_seasons)]
+    lhs = (X.T @ sparse.diags(np.asarray(epa_n, dtype=float)) @ X + sparse.diags(penalty)).tocsc()
+    rhs = X.T @ np.asarray(epa_sum, dtype=float)
+    beta = spsolve(lhs, rhs)
+    return beta[:n_teams], beta[n_teams:2 * n_teams], beta[2 * n_teams:]
+
+def _ratings(season, posteam, defteam, epa_sum, epa_n, ridge):
+    """
+    Ratings per team (per season and team when there are several seasons)
+    from parallel row arrays.
+    """
+    season = np.asarray(season)
+    season_codes, seasons = pd.factorize(season, sort=True)
+    multi = len(seasons) > 1
+    # Offense and defense share one (season, team) code space
+    codes, teams = pd.MultiIndex.from_arrays([
+        np.concatenate([season, season]),
+        np.concatenate([np.asarray(posteam, dtype=object), np.asarray(defteam, dtype=object)]),
+    ]).factorize(sort=True)
+    off_codes, def_codes = codes[:len(season)], codes[len(season):]
+
+    off, dfn, intercepts = fit_ratings(off_codes, def_codes, season_codes, epa_sum, epa_n,
+                                       len(teams), len(seasons), ridge)
+    team_season = teams.get_level_values(0).to_numpy()
+    average = intercepts[np.searchsorted(np.asarray(seasons), team_season)]
+    out = pd.DataFrame({
+        'season': team_season,
+        'team': teams.get_level_values(1).to_numpy(),
+        # Adjusted EPA/play against (for) an average opponent
+        'off_epa': average + off,
+        'def_epa': average + dfn,
+        'off_plays': np.bincount(off_codes, epa_n, len(teams)).astype(int),
+        'def_plays': np.bincount(def_codes, epa_n, len(teams)).astype(int),
+    })
+    return out if multi else out.drop(columns='season')
+
+def adjusted_ratings(games, ridge=RIDGE):
+    """
+    Opponent-adjusted offense and defense EPA/play per team from the game
+    table (see src/game_tables.py). With several seasons, every season's
+    teams are fitted jointly and rated per season (with a 'season' column).
+    """
+    games = games[games['epa_n'] > 0]
+    return _ratings(games['season'].to_numpy(), games['posteam'].to_numpy(), games['defteam'].to_numpy(),
+                    games['epa_sum'].to_numpy(), games['epa_n'].to_numpy(), ridge)
+
+def play_ratings(pbp, ridge=RIDGE):
+    """
+    adjusted_ratings fitted on individual plays instead of the game table.
+    """
+    plays = pbp[pbp['posteam'].notna() & pbp['defteam'].notna() & pbp['epa'].notna()]
+    return _ratings(plays['season'].to_numpy(), plays['posteam'].to_numpy(), plays['defteam'].to_numpy(),
+                    plays['epa'].to_numpy(dtype=float), np.ones(len(plays)), ridge)
+
+def weekly_ratings(games, ridge=RIDGE):
+    """
+    Ratings re-fitted after every week of the game table (using all games
+    up to and including that week), stacked with a 'week' column.
+    """
+    frames = []
+    for week in np.sort(games['week'].unique()):
+        ratings = adjusted_ratings(games[games['week'] <= week], ridge)
+        ratings.insert(0, 'week', week)
+        frames.append(ratings)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,294 @@
+import html
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ('md', 'html', 'csv')
+
+# Report templates are Markdown with str.format placeholders ({team},
+# {off_epa:.3f}) and '@table <name>' lines where a table is rendered.
+ANALYSIS_TEMPLATE = """\
+# NFL {season} Quantitative Analysis Report
+
+## Top 10 Most Impressive Players
+This ranking is based on a composite score of Advanced Metrics:
+- **QBs**: EPA/Play (60%) + CPOE (40%)
+- **RBs**: EPA/Play (50%) + Success Rate (50%)
+- **WRs/TEs**: EPA/Target (60%) + Expected YAC EPA (40%)
+
+@table top_players
+
+![Top 10 Players](output/top_10_players.png)
+
+## Super Bowl Prediction Thesis
+### Predicted Winner: **{team}**
+
+**Quantitative Reasoning:**
+The prediction model values a balanced team with a slight bias towards elite offense.
+- **Offensive EPA/Play**: {off_epa:.3f} (Z-Score: {off_z:.2f})
+- **Defensive EPA/Play**: {def_epa:.3f} (Z-Score: {def_z:.2f})
+- **Composite Prediction Score**: {prediction_score:.2f}
+
+Historically, teams with top-tier efficiency in both passing offense and pass defense correlate strongly with Super Bowl success.
+The **{team}** currently exhibit the best combination of these metrics.
+
+### Team Tiers
+The following chart visualizes the offensive vs defensive efficiency of all teams.
+![Team Tiers](output/team_tiers.png)
+
+### QB Efficiency
+Quarterback play is the single most important factor. Here is how the league's QBs stack up:
+![QB Efficiency](output/qb_efficiency.png)
+"""
+
+SIMULATION_TEMPLATE = """\
+
+### Season Simulation
+The predicted winner above is the most likely champion over {sims:,} Monte Carlo simulations of the
+season and playoff bracket, with every game drawn from the two teams' offensive and defensive EPA/play
+(see `src/simulator.py`). The **{team}** win the Super Bowl in {p_champion:.1%} of them.
+
+@table simulation
+"""
+
+LEAGUE_TEMPLATE = """\
+# NFL {seasons} League Report
+
+## Players
+Every player above the play-count thresholds, ranked by impressiveness score.
+
+@table players
+
+## Teams
+Every team, ranked by prediction score.
+
+@table teams
+"""
+
+# Table columns: (header, source column or None for a 1-based rank, printf format).
+PLAYER_COLUMNS = [
+    ('Rank', None, '%d'),
+    ('Player', 'player_name', '%s'),
+    ('Position', 'position', '%s'),
+    ('Team', 'posteam', '%s'),
+    ('Impressiveness Score', 'impressiveness_score', '%.2f'),
+]
+
+TEAM_COLUMNS = [
+    ('Rank', None, '%d'),
+    ('Team', 'team', '%s'),
+    ('Off EPA/Play', 'off_epa', '%.3f'),
+    ('Def EPA/Play', 'def_epa', '%.3f'),
+    ('Off Z', 'off_z', '%.2f'),
+    ('Def Z', 'def_z', '%.2f'),
+    ('Prediction Score', 'prediction_score', '%.2f'),
+]
+
+SIMULATION_COLUMNS = [
+    ('Rank', None, '%d'),
+    ('Team', 'team', '%s'),
+    ('Division', 'division', '%s'),
+    ('Mean Wins', 'mean_wins', '%.1f'),
+    ('Playoffs', 'p_playoffs', '%.3f'),
+    ('Division Title', 'p_division', '%.3f'),
+    ('Super Bowl', 'p_super_bowl', '%.3f'),
+    ('Champion', 'p_champion', '%.3f'),
+]
+
+_HEADING = re.compile(r'^(#{1,6}) (.*)$')
+_IMAGE = re.compile(r'^!\[([^\]]*)\]\(([^)]*)\)$')
+_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC = re.compile(r'\*(.+?)\*')
+
+def _inline_html(text):
+    text = html.escape(text, quote=False)
+    return _ITALIC.sub(r'<em>\1</em>', _BOLD.sub(r'<strong>\1</strong>', text))
+
+def _escape_cells(cells):
+    for char, entity in (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;')):
+        cells = np.char.replace(cells, char, entity)
+    return cells
+
+def table_cells(df, columns):
+    """
+    Formats every column of a table at once into arrays of strings.
+    """
+    cells = []
+    for _, source, fmt in columns:
+        values = np.arange(1, len(df) + 1) if source is None else df[source].to_numpy()
+        if fmt == '%s':
+            cells.append(np.asarray(values, dtype=object).astype(str))
+        else:
+            cells.append(np.char.mod(fmt, values))
+    return cells
+
+def _join_rows(cells, prefix, sep, suffix):
+    rows = np.asarray(cells[0], dtype=object)
+    for col in cells[1:]:
+        rows = rows + sep + np.asarray(col, dtype=object)
+    return '\n'.join((prefix + rows + suffix).tolist())
+
+class ReportWriter:
+    """
+    Streams a report to Markdown, HTML and CSV in one pass.
+
+    Lines are written to every open format as soon as they are produced;
+    tables are formatted column-wise in bulk and also saved as one CSV per
+    table (<csv_dir>/<report name>_<table>.csv).
+    """
+
+    def __init__(self, path, formats=FORMATS, csv_dir=None, title='Report'):
+        self.stem = os.path.splitext(path)[0]
+        self.formats = formats
+        self.csv_dir = csv_dir or os.path.dirname(path) or '.'
+        self.title = title
+        self.paths = {}
+        self._files = {}
+        self._in_list = False
+
+    def __enter__(self):
+        for fmt in ('md', 'html'):
+            if fmt in self.formats:
+                path = f"{self.stem}.{fmt}"
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                self._files[fmt] = open(path, 'w', encoding='utf-8')
+                self.paths[fmt] = path
+        if 'html' in self._files:
+            self._files['html'].write(
+                f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                f'<title>{html.escape(self.title)}</title>\n</head>\n<body>\n')
+        return self
+
+    def __exit__(self, *exc):
+        if 'html' in self._files:
+            self._close_list()
+            self._files['html'].write('</body>\n</html>\n')
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def _close_list(self):
+        if self._in_list:
+            self._files['html'].write('</ul>\n')
+            self._in_list = False
+
+    def line(self, text):
+        """
+        Writes one Markdown line (heading, bullet, image or text).
+        """
+        if 'md' in self._files:
+            self._files['md'].write(text + '\n')
+        if 'html' not in self._files:
+            return
+
+        out = self._files['html']
+        if text.startswith('- '):
+            if not self._in_list:
+                out.write('<ul>\n')
+                self._in_list = True
+            out.write(f'<li>{_inline_html(text[2:])}</li>\n')
+            return
+        self._close_list()
+        heading = _HEADING.match(text)
+        image = _IMAGE.match(text)
+        if heading:
+            level = len(heading.group(1))
+            out.write(f'<h{level}>{_inline_html(heading.group(2))}</h{level}>\n')
+        elif image:
+            out.write(f'<p><img src="{html.escape(image.group(2))}" alt="{html.escape(image.group(1))}"></p>\n')
+        elif text.strip():
+            out.write(f'<p>{_inline_html(text)}</p>\n')
+
+    def table(self, name, df, columns):
+        """
+        Writes df as a table with the given (header, column, format) spec.
+        """
+        headers = [header for header, _, _ in columns]
+        cells = table_cells(df, columns) if len(df) else None
+
+        if 'md' in self._files:
+            out = self._files['md']
+            out.write('| ' + ' | '.join(headers) + ' |\n')
+            out.write('|' + '---|' * len(headers) + '\n')
+            if cells:
+                out.write(_join_rows(cells, '| ', ' | ', ' |') + '\n')
+
+        if 'html' in self._files:
+            self._close_list()
+            out = self._files['html']
+            out.write('<table>\n<thead><tr>' + ''.join(f'<th>{html.escape(h)}</th>' for h in headers)
+                      + '</tr></thead>\n<tbody>\n')
+            if cells:
+                cells = [_escape_cells(c) if fmt == '%s' else c for c, (_, _, fmt) in zip(cells, columns)]
+                out.write(_join_rows(cells, '<tr><td>', '</td><td>', '</td></tr>') + '\n')
+            out.write('</tbody>\n</table>\n')
+
+        if 'csv' in self.formats:
+            frame = pd.DataFrame({
+                header: (np.arange(1, len(df) + 1) if source is None else df[source].to_numpy())
+                for header, source, _ in columns
+            })
+            path = os.path.join(self.csv_dir, f"{os.path.basename(self.stem)}_{name}.csv")
+            os.makedirs(self.csv_dir, exist_ok=True)
+            frame.to_csv(path, index=False)
+            self.paths[f'csv:{name}'] = path
+
+def render(template, writer, values, tables):
+    """
+    Streams a template through writer: placeholders are filled from values
+    and each '@table <name>' line renders tables[name] = (df, columns).
+    """
+    for line in template.splitlines():
+        if line.startswith('@table '):
+            name = line.split(None, 1)[1].strip()
+            df, columns = tables[name]
+            writer.table(name, df, columns)
+        else:
+            writer.line(line.format_map(values))
+
+def write_analysis_report(top_players, team_rankings, output_file='ANALYSIS_REPORT.md',
+                          formats=FORMATS, csv_dir='output', season=2024, simulation=None, sims=None):
+    """
+    Writes the top-players / Super Bowl prediction report. Returns the
+    paths written, keyed by format.
+
+    With a simulation (simulator.simulate_season output over sims
+    seasons), the predicted winner is its most likely champion and the
+    report adds the top teams' playoff and title probabilities.
+    """
+    predicted_winner = team_rankings.iloc[0]
+    if simulation is not None:
+        favourite = simulation.iloc[0]
+        predicted_winner = team_rankings[team_rankings['team'].astype(str) == favourite['team']].iloc[0]
+    values = {'season': season, **predicted_winner.to_dict()}
+    with ReportWriter(output_file, formats, csv_dir, title=f'NFL {season} Quantitative Analysis Report') as writer:
+        render(ANALYSIS_TEMPLATE, writer, values, {'top_players': (top_players, PLAYER_COLUMNS)})
+        if simulation is not None:
+            render(SIMULATION_TEMPLATE, writer, {**values, 'sims': sims, 'p_champion': favourite['p_champion']},
+                   {'simulation': (simulation.head(10), SIMULATION_COLUMNS)})
+    return writer.paths
+
+def write_league_report(all_players, team_rankings, output_file='output/LEAGUE_REPORT.md',
+                        formats=FORMATS, csv_dir=None):
+    """
+    Writes every qualifying player and team. Frames with a 'season' column
+    (several seasons stacked) are ranked within each season.
+    """
+    def by_season(df, score, columns):
+        if 'season' not in df.columns:
+            return df.sort_values(score, ascending=False), columns
+        df = df.sort_values(['season', score], ascending=[True, False])
+        df = df.assign(season_rank=df.groupby('season').cumcount() + 1)
+        return df, [('Rank', 'season_rank', '%d'), ('Season', 'season', '%d')] + columns[1:]
+
+    all_players, player_columns = by_season(all_players, 'impressiveness_score', PLAYER_COLUMNS)
+    team_rankings, team_columns = by_season(team_rankings, 'prediction_score', TEAM_COLUMNS)
+
+    seasons = sorted(all_players['season'].unique()) if 'season' in all_players.columns else []
+    label = f"{seasons[0]}-{seasons[-1]}" if len(seasons) > 1 else (str(seasons[0]) if seasons else '2024')
+    with ReportWriter(output_file, formats, csv_dir, title=f'NFL {label} League Report') as writer:
+        render(LEAGUE_TEMPLATE, writer, {'seasons': label},
+               {'players': (all_players, player_columns), 'teams': (team_rankings, team_columns)})
+    return writer.paths
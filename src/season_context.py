@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import Future
+
+class SeasonContext:
+    """
+    Wraps one frame of play-by-play and memoizes the filtered views and
+    aggregates that the analyses share, so the frame is filtered and
+    grouped once per season instead of once per analysis.
+
+    Analysis modules store their aggregates with memo(name, build);
+    invalidate() drops memoized results when the underlying data changes.
+    A context may be shared between threads (see src/service.py).
+    """
+
+    def __init__(self, pbp):
+        self.pbp = pbp
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def memo(self, name, build):
+        """
+        Returns the memoized value for name, computing it with build() on
+        first use. Values are held as futures: concurrent callers for the
+        same name wait for the first one's build instead of repeating it,
+        and a failed build is not kept.
+        """
+        with self._lock:
+            future = self._memo.get(name)
+            owner = future is None
+            if owner:
+                future = self._memo[name] = Future()
+        if owner:
+            try:
+                future.set_result(build())
+            except BaseException as e:
+                with self._lock:
+                    if self._memo.get(name) is future:
+                        del self._memo[name]
+                future.set_exception(e)
+        return future.result()
+
+    def invalidate(self, *names):
+        """
+        Drops the given memoized results, or all of them if none are named.
+        """
+        with self._lock:
+            if not names:
+                self._memo.clear()
+            for name in names:
+                self._memo.pop(name, None)
+
+    def set_pbp(self, pbp):
+        """
+        Replaces the underlying play-by-play and invalidates everything.
+        """
+        self.pbp = pbp
+        self.invalidate()
+
+    @property
+    def plays(self):
+        """Pass and run plays."""
+        return self.memo('plays', lambda: self.pbp[self.pbp['play_type'].isin(['pass', 'run'])])
+
+    @property
+    def pass_plays(self):
+        return self.memo('pass_plays', lambda: self.plays[self.plays['play_type'] == 'pass'])
+
+    @property
+    def run_plays(self):
+        return self.memo('run_plays', lambda: self.plays[self.plays['play_type'] == 'run'])
+
+    @property
+    def current_week(self):
+        return self.memo('current_week', lambda: self.pbp['week'].max())
@@ -0,0 +1,133 @@
+import pandas as pd
+import argparse
+import json
+import os
+import sys
+
+# Allow running as a script (python src/season_state.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_loader, player_analysis, team_analysis
+
+# Persisted running aggregates for in-season refreshes:
+#   cache/state/<season>/players_qb.parquet, ..., teams_off.parquet
+#   cache/state/<season>/state.json   (which (season, week) pairs have been folded)
+STATE_DIR = os.path.join(data_loader.CACHE_DIR, 'state')
+STATE_FILE = 'state.json'
+
+def empty_state():
+    """
+    Returns an aggregate state with nothing folded in yet.
+    """
+    return {'players': None, 'teams': None, 'folded': []}
+
+def load_state(state_dir=STATE_DIR):
+    """
+    Loads the persisted aggregate state, or an empty one if none exists.
+    """
+    meta_path = os.path.join(state_dir, STATE_FILE)
+    if not os.path.exists(meta_path):
+        return empty_state()
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    def read(prefix, names):
+        return {name: pd.read_parquet(os.path.join(state_dir, f'{prefix}_{name}.parquet')) for name in names}
+
+    return {
+        'players': read('players', player_analysis.PLAYER_GROUPS),
+        'teams': read('teams', ('off', 'def')),
+        'folded': [tuple(pair) for pair in meta['folded']],
+    }
+
+def save_state(state, state_dir=STATE_DIR):
+    """
+    Writes the aggregate state to state_dir (Parquet tables + JSON metadata).
+    """
+    os.makedirs(state_dir, exist_ok=True)
+    for prefix in ('players', 'teams'):
+        for name, table in state[prefix].items():
+            table.to_parquet(os.path.join(state_dir, f'{prefix}_{name}.parquet'))
+    meta_path = os.path.join(state_dir, STATE_FILE)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump({'folded': sorted(state['folded'])}, f, indent=2)
+    os.replace(meta_path + '.tmp', meta_path)
+
+def fold(state, pbp_df):
+    """
+    Folds new plays into the aggregate state and returns the new state.
+
+    Weeks that were already folded are dropped (with a warning) so that
+    re-running an update for the same week does not double count. The
+    state holds one season: plays from any other season raise ValueError.
+    """
+    folded = list(state['folded'])
+    if {'season', 'week'} <= set(pbp_df.columns):
+        weeks = pbp_df[['season', 'week']].drop_duplicates()
+        pairs = [(int(s), int(w)) for s, w in weeks.itertuples(index=False)]
+        seasons = {season for season, _ in folded + pairs}
+        if len(seasons) > 1:
+            raise ValueError(f"Cannot fold seasons {sorted(seasons)} into one state; "
+                             f"use a separate state directory per season")
+        repeated = [pair for pair in pairs if pair in folded]
+        if repeated:
+            print(f"Skipping already folded weeks: {repeated}")
+            keep = ~pd.Series(list(zip(pbp_df['season'], pbp_df['week'])), index=pbp_df.index).isin(repeated)
+            pbp_df = pbp_df[keep]
+        folded += [pair for pair in pairs if pair not in folded]
+
+    return {
+        'players': player_analysis.combine_player_aggregates(
+            [state['players'], player_analysis.aggregate_players(pbp_df)]),
+        'teams': team_analysis.combine_team_aggregates(
+            [state['teams'], team_analysis.aggregate_teams(pbp_df)]),
+        'folded': folded,
+    }
+
+def update(week_pbp, state_dir=STATE_DIR):
+    """
+    Folds one new week of play-by-play into the persisted state and
+    re-derives player and team rankings from it, with each player's and
+    team's per-play EPA spread (epa_sd, off_epa_sd, def_epa_sd) from the
+    state's sums of squares.
+
+    Cost is proportional to the new plays, not the season so far.
+    Returns (top_10, qb_stats, all_players, team_rankings).
+    """
+    print("Updating aggregate state...")
+    state = fold(load_state(state_dir), week_pbp)
+    save_state(state, state_dir)
+
+    top_10, qb_stats, all_players = player_analysis.rank_players(state['players'], spread=True)
+    team_rankings = team_analysis.rank_teams(state['teams'], spread=True)
+    return top_10, qb_stats, all_players, team_rankings
+
+def main():
+    parser = argparse.ArgumentParser(description="Fold one week of play-by-play into the running rankings.")
+    parser.add_argument('--season', type=int, required=True)
+    parser.add_argument('--week', type=int, required=True)
+    parser.add_argument('--state-dir', default=None, help="Defaults to a directory per season under the cache.")
+    parser.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+    args = parser.parse_args()
+    if args.state_dir is None:
+        args.state_dir = os.path.join(STATE_DIR, str(args.season))
+
+    columns = data_loader.schema_columns(player_analysis.PBP_COLUMNS, team_analysis.PBP_COLUMNS)
+    try:
+        week_pbp = data_loader.load_week(args.season, args.week, columns=columns, offline=args.offline)
+    except Exception as e:
+        print(f"Error loading week {args.week} of {args.season}: {e}")
+        return
+    try:
+        top_10, _, _, team_rankings = update(week_pbp, args.state_dir)
+    except ValueError as e:
+        print(f"Error updating {args.state_dir}: {e}")
+        return
+
+    print("\nTop 10 Players:")
+    print(top_10[['player_name', 'position', 'impressiveness_score', 'epa_sd']])
+    print("\nTop 5 Teams:")
+    print(team_rankings[['team', 'off_epa', 'off_epa_sd', 'def_epa', 'def_epa_sd', 'prediction_score']].head())
+
+if __name__ == "__main__":
+    main()
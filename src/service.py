@@ -0,0 +1,286 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Allow running as a script (python src/service.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import championship_analysis, data_loader, player_analysis, team_analysis
+from src.player_index import PlayerIndex
+from src.season_context import SeasonContext
+
+# Play-by-play columns every endpoint can need.
+PBP_COLUMNS = data_loader.schema_columns(
+    player_analysis.PBP_COLUMNS, team_analysis.PBP_COLUMNS, championship_analysis.PBP_COLUMNS)
+
+# Responses kept in the cache (least recently used are dropped first).
+CACHE_SIZE = 512
+
+class SeasonStore:
+    """
+    Keeps each requested season resident: its SeasonContext (and with it
+    every memoized aggregate), player index and schedule index, plus an
+    LRU cache of rendered JSON responses. Seasons load on first use (or
+    up front with warm()); reload() drops a season and its responses.
+
+    Seasons and responses are held as futures: the lock only guards the
+    tables, the first request for a key builds it outside the lock, and
+    concurrent requests for the same key wait on its future, so one slow
+    season load does not block requests for other seasons.
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE, **load_opts):
+        self.load_opts = load_opts
+        self.cache_size = cache_size
+        self._seasons = {}
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _once(self, table, key, build):
+        """
+        The result of build() for key, shared through a future in table.
+        Failed builds are not kept, so the next request retries them.
+        """
+        with self._lock:
+            future = table.get(key)
+            owner = future is None
+            if owner:
+                future = table[key] = Future()
+                if table is self._responses:
+                    self.misses += 1
+                    while len(table) > self.cache_size:
+                        table.popitem(last=False)
+            elif table is self._responses:
+                self.hits += 1
+                table.move_to_end(key)
+        if owner:
+            try:
+                future.set_result(build())
+            except BaseException as e:
+                with self._lock:
+                    if table.get(key) is future:
+                        del table[key]
+                future.set_exception(e)
+        return future.result()
+
+    def _load_season(self, year):
+        data = data_loader.load_all([year], kinds=('pbp', 'roster', 'schedule'),
+                                    columns=PBP_COLUMNS, **self.load_opts)
+        if data['pbp'] is None:
+            raise LookupError(f"No play-by-play data for {year}")
+        roster, schedule = data['roster'], data['schedule']
+        return {
+            'ctx': SeasonContext(data['pbp']),
+            'index': PlayerIndex(roster, data['pbp']) if roster is not None else None,
+            'schedule_index': championship_analysis.build_schedule_index(schedule) if schedule is not None else None,
+        }
+
+    def season(self, year):
+        """
+        {'ctx', 'index', 'schedule_index'} for a season, loading it on first use.
+        """
+        return self._once(self._seasons, year, lambda: self._load_season(year))
+
+    def seasons(self):
+        """
+        The years loaded (or loading) so far.
+        """
+        with self._lock:
+            return sorted(self._seasons)
+
+    def warm(self, years):
+        """
+        Loads seasons and precomputes the aggregates behind every endpoint.
+        """
+        for year in years:
+            season = self.season(year)
+            ctx = season['ctx']
+            player_analysis.context_player_aggregates(ctx, season['index'])
+            team_analysis.context_team_aggregates(ctx)
+            championship_analysis.context_form_engine(ctx, by_id=season['index'] is not None)
+            championship_analysis.load_defense_table(ctx)
+
+    def reload(self, year=None):
+        """
+        Drops one season (or all of them) and every cached response. Loads
+        and builds still in flight finish for their waiters but are not kept.
+        """
+        with self._lock:
+            if year is None:
+                self._seasons.clear()
+            else:
+                self._seasons.pop(year, None)
+            self._responses.clear()
+
+    def cached(self, key, build):
+        """
+        The cached response body for key, built with build() on a miss.
+        """
+        return self._once(self._responses, key, build)
+
+def _records(df):
+    return json.loads(df.to_json(orient='records'))
+
+def _arg(query, name, default=None, type=str):
+    if name not in query:
+        return default
+    try:
+        return type(query[name][-1])
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {query[name][-1]}")
+
+def players_endpoint(store, query):
+    """
+    GET /players?season=2024&top=10[&position=QB]: ranked players.
+    """
+    year = _arg(query, 'season', 2024, int)
+    top = _arg(query, 'top', 10, int)
+    position = _arg(query, 'position')
+    season = store.season(year)
+    ranked = season['ctx'].memo('ranked_players', lambda: player_analysis.rank_players(
+        player_analysis.context_player_aggregates(season['ctx'], season['index']), season['index'])[2]
+        .sort_values('impressiveness_score', ascending=False))
+    if position:
+        ranked = ranked[ranked['position'] == position.upper()]
+    return {'season': year, 'players': _records(ranked.head(top))}
+
+def teams_endpoint(store, query):
+    """
+    GET /teams?season=2024[&method=adjusted]: teams by prediction score.
+    """
+    year = _arg(query, 'season', 2024, int)
+    method = _arg(query, 'method', 'raw')
+    if method not in team_analysis.METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    rankings = team_analysis.analyze_teams(store.season(year)['ctx'], method=method)
+    return {'season': year, 'method': method, 'teams': _records(rankings)}
+
+def matchups_endpoint(store, query):
+    """
+    GET /matchups?season=2025&week=17[&players=B.Purdy,C.McCaffrey]
+    [&form_weeks=5][&halflife=2]: start/sit scores for a fantasy roster
+    (championship_analysis.get_roster_config by default).
+    """
+    year = _arg(query, 'season', 2025, int)
+    week = _arg(query, 'week', 17, int)
+    form_weeks = _arg(query, 'form_weeks', 5, int)
+    halflife = _arg(query, 'halflife', None, float)
+    season = store.season(year)
+    if season['schedule_index'] is None:
+        raise LookupError(f"No schedule for {year}")
+
+    roster = championship_analysis.get_roster_config()
+    player_pos = {name: pos for pos, names in roster.items() for name in names}
+    names = _arg(query, 'players')
+    players = names.split(',') if names else list(player_pos)
+    index = season['index']
+    if index is not None:
+        # Positions of players outside the configured roster come from the rosters
+        keys = index.resolve(players, [player_pos.get(name) for name in players])
+        for name, position in zip(players, index.positions(keys)):
+            if name not in player_pos and position is not None:
+                player_pos[name] = position
+
+    ctx = season['ctx']
+    form = championship_analysis.analyze_recent_form(
+        ctx, players, weeks=form_weeks, halflife=halflife, index=index, positions=player_pos)
+    matchups = championship_analysis.score_matchups(
+        form, player_pos, championship_analysis.load_defense_table(ctx), season['schedule_index'], [week])
+    matchups = matchups.sort_values('Composite_Score', ascending=False)
+    return {'season': year, 'week': week, 'matchups': _records(matchups)}
+
+ENDPOINTS = {
+    '/players': players_endpoint,
+    '/teams': teams_endpoint,
+    '/matchups': matchups_endpoint,
+}
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints over a shared SeasonStore (set as server.store).
+    """
+
+    def _send(self, status, body):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        store = self.server.store
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/health':
+            self._send(200, {'status': 'ok', 'seasons': store.seasons(),
+                             'cache': {'hits': store.hits, 'misses': store.misses}})
+            return
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            self._send(404, {'error': f"Unknown endpoint: {url.path}"})
+            return
+
+        key = (url.path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        try:
+            body = store.cached(key, lambda: json.dumps(endpoint(store, query)).encode('utf-8'))
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+            return
+        except LookupError as e:
+            self._send(404, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, body)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/reload':
+            self._send(404, {'error': f"Unknown endpoint: {url.path}"})
+            return
+        try:
+            year = _arg(parse_qs(url.query), 'season', None, int)
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+            return
+        self.server.store.reload(year)
+        self._send(200, {'status': 'reloaded', 'season': year})
+
+def serve(store, host='127.0.0.1', port=8000):
+    """
+    Creates (but does not start) the HTTP server for a store.
+    """
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.store = store
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve player, team and matchup analysis as JSON over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--seasons', type=int, nargs='*', default=[2024],
+                        help="Seasons to load and precompute at startup (others load on first request).")
+    parser.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+    args = parser.parse_args()
+
+    store = SeasonStore(offline=args.offline)
+    store.warm(args.seasons)
+    server = serve(store, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} (GET /players, /teams, /matchups, /health; POST /reload)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Allow running as a script (python src/simulator.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_loader
+
+# Monte Carlo season and playoff simulator. Every game's home margin is
+# drawn as Normal(expected margin, MARGIN_SD), with the expected margin
+# taken from the teams' offense/defense EPA per play (raw or adjusted,
+# see team_analysis.analyze_teams). Simulations run as NumPy arrays
+# (one row per simulated season) in batches, optionally across processes.
+
+# Divisions (2002 alignment), in nflverse abbreviations.
+DIVISIONS = {
+    'AFC East': ['BUF', 'MIA', 'NE', 'NYJ'],
+    'AFC North': ['BAL', 'CIN', 'CLE', 'PIT'],
+    'AFC South': ['HOU', 'IND', 'JAX', 'TEN'],
+    'AFC West': ['DEN', 'KC', 'LAC', 'LV'],
+    'NFC East': ['DAL', 'NYG', 'PHI', 'WAS'],
+    'NFC North': ['CHI', 'DET', 'GB', 'MIN'],
+    'NFC South': ['ATL', 'CAR', 'NO', 'TB'],
+    'NFC West': ['ARI', 'LA', 'SEA', 'SF'],
+}
+CONFERENCES = ['AFC', 'NFC']
+
+# Older abbreviations of relocated teams, mapped onto DIVISIONS.
+ALIASES = {'OAK': 'LV', 'SD': 'LAC', 'STL': 'LA', 'LAR': 'LA'}
+
+# Plays per team per game: turns an EPA/play edge into a points margin.
+PLAYS_PER_GAME = 62
+# Home-field advantage and the spread of game margins around the expectation, in points.
+HOME_FIELD = 1.5
+MARGIN_SD = 13.5
+
+# Simulated seasons per pool task, and per vectorized batch within a task.
+TASK_SIZE = 20000
+BATCH_SIZE = 10000
+
+# Output columns: share of simulations in which each team...
+ROUNDS = ['p_playoffs', 'p_division', 'p_top_seed', 'p_divisional_round',
+          'p_conference_round', 'p_super_bowl', 'p_champion']
+
+TEAMS = [team for division in DIVISIONS.values() for team in division]
+
+def playoff_seeds(season):
+    """
+    Playoff teams per conference: 7 since 2020, 6 before.
+    """
+    return 7 if season >= 2020 else 6
+
+def team_strength(team_ratings):
+    """
+    Net EPA/play (offense EPA minus defense EPA allowed) per TEAMS entry,
+    from a frame with team, off_epa and def_epa columns. Teams without a
+    rating count as average.
+    """
+    teams = team_ratings['team'].astype(str).replace(ALIASES)
+    net = pd.Series((team_ratings['off_epa'] - team_ratings['def_epa']).to_numpy(dtype=float), index=teams)
+    net = net.groupby(level=0).mean().reindex(TEAMS)
+    return (net - net.mean()).fillna(0.0).to_numpy()
+
+def season_state(schedule, season):
+    """
+    Splits a season's regular-season schedule into the standings so far
+    (wins, with ties as half wins, and point differential per TEAMS entry)
+    and the remaining games as (home, away) team codes.
+    """
+    codes = {team: i for i, team in enumerate(TEAMS)}
+    games = schedule[(schedule['season'] == season) & (schedule['game_type'] == 'REG')]
+    home = games['home_team'].replace(ALIASES).map(codes)
+    away = games['away_team'].replace(ALIASES).map(codes)
+    unknown = home.isna() | away.isna()
+    if unknown.any():
+        print(f"Skipping {int(unknown.sum())} games with unknown teams.")
+    played = games['home_score'].notna() & games['away_score'].notna() & ~unknown
+    remaining = games['home_score'].isna() & ~unknown
+
+    margin = (games['home_score'] - games['away_score'])[played].to_numpy(dtype=float)
+    h, a = home[played].to_numpy(dtype=int), away[played].to_numpy(dtype=int)
+    n = len(TEAMS)
+    wins = np.bincount(h, (margin > 0) + 0.5 * (margin == 0), n) + np.bincount(a, (margin < 0) + 0.5 * (margin == 0), n)
+    points = np.bincount(h, margin, n) - np.bincount(a, margin, n)
+    return {
+        'wins': wins,
+        'points': points,
+        'home': home[remaining].to_numpy(dtype=int),
+        'away': away[remaining].to_numpy(dtype=int),
+        'neutral': (games['location'] == 'Neutral')[remaining].to_numpy() if 'location' in games.columns
+                   else np.zeros(int(remaining.sum()), dtype=bool),
+    }
+
+def expected_margin(net, home, away, neutral=False):
+    """
+    Expected home margin in points of games between team code arrays.
+    """
+    return PLAYS_PER_GAME * (net[home] - net[away]) + np.where(neutral, 0.0, HOME_FIELD)
+
+def simulate_regular_season(state, net, rng, sims):
+    """
+    Final wins and point differential per simulated season, (sims, teams)
+    each: the remaining games are drawn at once and credited to teams with
+    one matrix product.
+    """
+    n = len(TEAMS)
+    games = len(state['home'])
+    mean = expected_margin(net, state['home'], state['away'], state['neutral']).astype(np.float32)
+    margin = rng.standard_normal((sims, games), dtype=np.float32)
+    margin *= MARGIN_SD
+    margin += mean
+    # games x teams: +1 for the home team, -1 for the away team
+    sides = np.zeros((games, n), dtype=np.float32)
+    sides[np.arange(games), state['home']] = 1
+    sides[np.arange(games), state['away']] = -1
+    home_won = (margin > 0).astype(np.float32)
+    wins = state['wins'] + home_won @ (sides > 0) + (1 - home_won) @ (sides < 0)
+    points = state['points'] + margin.round() @ sides
+    return wins, points
+
+def seed_conferences(wins, points, rng, seeds):
+    """
+    Playoff seeds per simulated season, (sims, conferences, seeds) team
+    codes: division winners seeded first, then wild cards, each by wins.
+    Ties in wins are broken by point differential, then at random (a
+    stand-in for the NFL tiebreakers).
+    """
+    sims = len(wins)
+    key = wins + points / 1e4 + rng.random(wins.shape) / 1e6
+    divisions = np.arange(len(TEAMS)).reshape(len(DIVISIONS), -1)        # divisions x teams
+    per_conference = len(DIVISIONS) // len(CONFERENCES)
+
+    out = np.empty((sims, len(CONFERENCES), seeds), dtype=np.int64)
+    for c in range(len(CONFERENCES)):
+        teams = divisions[c * per_conference:(c + 1) * per_conference]   # divisions x teams
+        div_keys = key[:, teams]                                         # sims x divisions x teams
+        winners = teams[np.arange(per_conference), div_keys.argmax(axis=2)]  # sims x divisions
+        order = np.argsort(-np.take_along_axis(key, winners, axis=1), axis=1)
+        out[:, c, :per_conference] = np.take_along_axis(winners, order, axis=1)
+
+        conf_teams = teams.ravel()
+        won_division = (conf_teams[None, :, None] == winners[:, None, :]).any(axis=2)
+        wild_keys = np.where(won_division, -np.inf, key[:, conf_teams])
+        wild = np.argsort(-wild_keys, axis=1)[:, :seeds - per_conference]
+        out[:, c, per_conference:] = conf_teams[wild]
+    return out
+
+def _play(net, home, away, rng, neutral=False):
+    """
+    Winners (team codes) of one game per simulation.
+    """
+    margin = expected_margin(net, home, away, neutral) + rng.normal(0, MARGIN_SD, len(home))
+    return np.where(margin > 0, home, away)
+
+def _play_seeds(seeds, net, better, worse, rng):
+    """
+    Winning seed positions of games between seed positions better and
+    worse, the better seed at home.
+    """
+    rows = np.arange(len(seeds))
+    home = seeds[rows, better]
+    won = _play(net, home, seeds[rows, worse], rng) == home
+    return np.where(won, better, worse)
+
+def simulate_playoffs(seeds, net, rng):
+    """
+    Plays out the bracket for seeds from seed_conferences. The top
+    8 - seeds per conference get byes (so that four teams per conference
+    reach the divisional round: one bye with 7 seeds, two with 6), and the
+    divisional round is reseeded so the best remaining seed hosts the worst.
+    Returns {round: team codes reaching it}, champion included.
+    """
+    sims, _, n_seeds = seeds.shape
+    byes = 8 - n_seeds
+    reached = {'p_divisional_round': [], 'p_conference_round': [], 'p_super_bowl': []}
+    finalists = []
+    for c in range(len(CONFERENCES)):
+        conf = seeds[:, c]
+        rows = np.arange(sims)
+        wild_card = [_play_seeds(conf, net, byes + i, n_seeds - 1 - i, rng)
+                     for i in range((n_seeds - byes) // 2)]
+        remaining = np.sort(np.column_stack([np.broadcast_to(np.arange(byes), (sims, byes))] + wild_card), axis=1)
+        reached['p_divisional_round'].append(conf[rows[:, None], remaining])
+
+        semis = np.column_stack([_play_seeds(conf, net, remaining[:, 0], remaining[:, 3], rng),
+                                 _play_seeds(conf, net, remaining[:, 1], remaining[:, 2], rng)])
+        semis.sort(axis=1)
+        reached['p_conference_round'].append(conf[rows[:, None], semis])
+
+        champion = conf[rows, _play_seeds(conf, net, semis[:, 0], semis[:, 1], rng)]
+        reached['p_super_bowl'].append(champion[:, None])
+        finalists.append(champion)
+    reached = {name: np.concatenate(codes, axis=1) for name, codes in reached.items()}
+    reached['p_champion'] = _play(net, finalists[0], finalists[1], rng, neutral=True)
+    return reached
+
+# Simulation inputs shared with pool workers once, via the initializer.
+_STATE = {}
+
+def _init_worker(state):
+    global _STATE
+    _STATE = state
+
+def _run_task(task):
+    seed, count = task
+    state = _STATE
+    rng = np.random.default_rng(seed)
+    n = len(TEAMS)
+    counts = {name: np.zeros(n) for name in ROUNDS}
+    wins_sum = np.zeros(n)
+    for start in range(0, count, BATCH_SIZE):
+        batch = min(BATCH_SIZE, count - start)
+        wins, points = simulate_regular_season(state, state['net'], rng, batch)
+        seeds = seed_conferences(wins, points, rng, state['seeds'])
+        per_conference = len(DIVISIONS) // len(CONFERENCES)
+        reached = simulate_playoffs(seeds, state['net'], rng)
+        reached.update({
+            'p_playoffs': seeds,
+            'p_division': seeds[:, :, :per_conference],
+            'p_top_seed': seeds[:, :, 0],
+        })
+        for name in ROUNDS:
+            counts[name] += np.bincount(reached[name].ravel(), minlength=n)
+        wins_sum += wins.sum(axis=0)
+    return counts, wins_sum
+
+def simulate_season(team_ratings, schedule, season, sims=100000, seed=0, workers=1):
+    """
+    Simulates the rest of a season and its playoffs sims times from team
+    ratings (team, off_epa, def_epa; e.g. analyze_teams output) and the
+    season's schedule, with completed regular-season games kept as played.
+
+    Batches fan out across a process pool when workers > 1 (None uses
+    every CPU). Task seeds are spawned from seed, so results do not depend
+    on workers. Returns one row per team with its mean final wins and the
+    share of simulations in which it reached each of ROUNDS, sorted by
+    championship probability.
+    """
+    state = season_state(schedule, season)
+    state['net'] = team_strength(team_ratings)
+    state['seeds'] = playoff_seeds(season)
+
+    counts = [min(TASK_SIZE, sims - start) for start in range(0, sims, TASK_SIZE)]
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(counts)), counts))
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        _init_worker(state)
+        results = [_run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,)) as pool:
+            results = list(pool.map(_run_task, tasks))
+
+    division = {team: name for name, teams in DIVISIONS.items() for team in teams}
+    out = pd.DataFrame({
+        'team': TEAMS,
+        'conference': [division[team].split()[0] for team in TEAMS],
+        'division': [division[team] for team in TEAMS],
+        'wins': state['wins'],
+        'mean_wins': sum(wins for _, wins in results) / sims,
+    })
+    for name in ROUNDS:
+        out[name] = sum(c[name] for c, _ in results) / sims
+    return out.sort_values(['p_champion', 'p_super_bowl', 'p_playoffs'], ascending=False, ignore_index=True)
+
+def run(season=2024, sims=100000, method='raw', seed=0, workers=1, **kwargs):
+    """
+    Rates the season's teams from its cached game table (see
+    game_tables.load_season_game_table) and simulates it. kwargs go to
+    the data loaders. Returns None if the schedule cannot be loaded.
+    """
+    from src import game_tables, team_analysis
+
+    schedule = data_loader.load_schedule([season], **kwargs)
+    if schedule is None:
+        return None
+    games = game_tables.load_season_game_table(season, **kwargs)
+    ratings = team_analysis.rank_game_table(games[games['season_type'] == 'REG'], method)
+    return simulate_season(ratings, schedule, season, sims, seed, workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo rest-of-season and playoff simulation.")
+    parser.add_argument('--season', type=int, default=2024)
+    parser.add_argument('--sims', type=int, default=100000)
+    parser.add_argument('--method', choices=['raw', 'adjusted'], default='raw',
+                        help="Rate teams on raw mean EPA or on opponent-adjusted ratings.")
+    parser.add_argument('--workers', type=int, default=1, help="Processes to simulate on (0 = every CPU).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--offline', action='store_true', help="Only use the local season cache or fixtures.")
+    args = parser.parse_args()
+
+    print(f"Simulating {args.season} {args.sims:,} times...")
+    table = run(args.season, args.sims, args.method, args.seed, args.workers or None, offline=args.offline)
+    if table is None:
+        return
+    pd.set_option('display.width', 160)
+    print(table.round(3).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
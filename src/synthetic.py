@@ -0,0 +1,267 @@
+import pandas as pd
+import numpy as np
+import argparse
+import os
+import sys
+
+# Allow running as a script (python src/synthetic.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_loader
+
+# Synthetic nflverse-shaped play-by-play, rosters and schedules for
+# benchmarks and offline runs. Distributions are rough but realistic:
+# ~45k plays per season, pass EPA centred slightly above zero with fat
+# tails, run EPA slightly below, per-team and per-player skill offsets.
+
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE',
+    'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+    'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+    'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS',
+]
+
+# Players per team and position.
+DEFAULT_ROSTER = {'QB': 2, 'RB': 3, 'WR': 5, 'TE': 2}
+
+SURNAMES = [
+    'Adams', 'Allen', 'Bailey', 'Baker', 'Bell', 'Brooks', 'Brown', 'Butler',
+    'Carter', 'Clark', 'Collins', 'Cook', 'Cooper', 'Davis', 'Diggs', 'Edwards',
+    'Evans', 'Fields', 'Fisher', 'Ford', 'Foster', 'Gibbs', 'Graham', 'Gray',
+    'Green', 'Hall', 'Harris', 'Hill', 'Hughes', 'Jackson', 'James', 'Johnson',
+    'Jones', 'Kelly', 'King', 'Lewis', 'Martin', 'Miller', 'Mitchell', 'Moore',
+    'Morgan', 'Murray', 'Nelson', 'Parker', 'Perry', 'Price', 'Reed', 'Robinson',
+    'Ross', 'Russell', 'Sanders', 'Scott', 'Smith', 'Stewart', 'Taylor', 'Thomas',
+    'Turner', 'Walker', 'Ward', 'Watson', 'White', 'Williams', 'Wilson', 'Young',
+]
+
+PLAY_TYPES = ['pass', 'run', 'punt', 'kickoff', 'field_goal', 'extra_point', 'no_play', 'qb_kneel', None]
+PLAY_TYPE_P = [0.42, 0.31, 0.05, 0.06, 0.02, 0.02, 0.06, 0.01, 0.05]
+
+def generate_roster(seasons=(2024,), roster=None, seed=0):
+    """
+    One row per player per season, shaped like nfl.import_seasonal_rosters
+    (season, team, position, player_id, player_name, first_name, last_name).
+    The same players are kept across seasons.
+    """
+    roster = roster or DEFAULT_ROSTER
+    rng = np.random.default_rng(seed)
+    per_team = sum(roster.values())
+    n_players = per_team * len(TEAMS)
+    capacity = 26 * len(SURNAMES)
+    if n_players > capacity:
+        raise ValueError(f"Roster of {n_players} players exceeds {capacity} unique names.")
+
+    combos = rng.permutation(capacity)[:n_players]
+    initials = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))[combos // len(SURNAMES)]
+    last_names = np.array(SURNAMES)[combos % len(SURNAMES)]
+    positions = np.tile(np.repeat(list(roster), list(roster.values())), len(TEAMS))
+
+    players = pd.DataFrame({
+        'team': np.repeat(TEAMS, per_team),
+        'position': positions,
+        'player_id': [f'00-00{i:05d}' for i in range(n_players)],
+        'player_name': np.char.add(np.char.add(initials, '.'), last_names),
+        'first_name': initials,
+        'last_name': last_names,
+    })
+    return pd.concat([players.assign(season=s) for s in seasons], ignore_index=True)[
+        ['season', 'team', 'position', 'player_id', 'player_name', 'first_name', 'last_name']
+    ]
+
+def _team_strength(rng):
+    return pd.DataFrame({
+        'off': rng.normal(0, 0.08, len(TEAMS)),
+        'def': rng.normal(0, 0.06, len(TEAMS)),
+    }, index=TEAMS)
+
+def generate_schedule(seasons=(2024,), seed=0, strength=None):
+    """
+    An 18-week, 17-game regular season per season (one bye per team in
+    weeks 5-12) plus a Super Bowl, shaped like nfl.import_schedules.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for season in seasons:
+        teams = np.array(TEAMS)
+        s = strength[season] if strength is not None else _team_strength(rng)
+        byes = rng.permutation(len(teams)).reshape(8, 4)
+        for week in range(1, 19):
+            on_bye = set(byes[week - 5]) if 5 <= week <= 12 else set()
+            playing = [t for t in rng.permutation(len(teams)) if t not in on_bye]
+            for home, away in zip(playing[::2], playing[1::2]):
+                rows.append(_game(rng, s, season, week, 'REG', teams[home], teams[away]))
+        contenders = (s['off'] - s['def'] + rng.normal(0, 0.05, len(teams))).nlargest(2).index
+        rows.append(_game(rng, s, season, 22, 'SB', contenders[0], contenders[1], neutral=True))
+    return pd.DataFrame(rows)
+
+def _game(rng, s, season, week, game_type, home, away, neutral=False):
+    home_score = int(rng.poisson(22 + 60 * (s.at[home, 'off'] - s.at[away, 'def']) + (0 if neutral else 1.5)))
+    away_score = int(rng.poisson(22 + 60 * (s.at[away, 'off'] - s.at[home, 'def'])))
+    if game_type != 'REG' and home_score == away_score:
+        home_score += 3
+    return {
+        'game_id': f'{season}_{week:02d}_{away}_{home}',
+        'season': season, 'game_type': game_type, 'week': week,
+        'away_team': away, 'home_team': home,
+        'away_score': away_score, 'home_score': home_score,
+        'result': home_score - away_score,
+        'location': 'Neutral' if neutral else 'Home',
+    }
+
+def _pick(rng, team_idx, team_size, offset, weights):
+    """
+    Picks one roster slot per play among a team's players at one position.
+    """
+    slot = rng.choice(len(weights), size=len(team_idx), p=np.asarray(weights) / np.sum(weights))
+    return team_idx * team_size + offset + slot
+
+def generate_season_pbp(season, roster_df, schedule, strength, rng, plays_per_game=160):
+    """
+    Play-by-play for one season's games in schedule.
+    """
+    roster_df = roster_df[roster_df['season'] == season]
+    games = schedule[schedule['season'] == season].reset_index(drop=True)
+    counts = roster_df[roster_df['team'] == TEAMS[0]]['position'].value_counts()
+    per_team = int(counts.sum())
+    offsets, acc = {}, 0
+    for pos in roster_df['position'].drop_duplicates():
+        offsets[pos] = acc
+        acc += int(counts.get(pos, 0))
+
+    ids = roster_df['player_id'].to_numpy()
+    names = roster_df['player_name'].to_numpy()
+    skill = rng.normal(0, 0.06, len(ids))
+
+    n_per_game = rng.poisson(plays_per_game, len(games))
+    game_idx = np.repeat(np.arange(len(games)), n_per_game)
+    n = len(game_idx)
+    play_in_game = np.arange(n) - np.repeat(np.cumsum(n_per_game) - n_per_game, n_per_game)
+
+    home = games['home_team'].to_numpy()[game_idx]
+    away = games['away_team'].to_numpy()[game_idx]
+    home_has_ball = rng.random(n) < 0.5
+    posteam = np.where(home_has_ball, home, away)
+    defteam = np.where(home_has_ball, away, home)
+    pos_idx = pd.Index(TEAMS).get_indexer(posteam)
+
+    play_type = rng.choice(np.array(PLAY_TYPES, dtype=object), size=n, p=PLAY_TYPE_P)
+    is_pass = play_type == 'pass'
+    is_run = play_type == 'run'
+
+    off = strength['off'].reindex(posteam).to_numpy()
+    dfn = strength['def'].reindex(defteam).to_numpy()
+
+    passer = _pick(rng, pos_idx, per_team, offsets['QB'], [0.92] + [0.08] * (counts['QB'] - 1))
+    rb_weights = [0.6, 0.3, 0.1, 0.05, 0.05][:counts['RB']]
+    rusher = _pick(rng, pos_idx, per_team, offsets['RB'], rb_weights)
+    qb_run = rng.random(n) < 0.12
+    rusher = np.where(qb_run, passer, rusher)
+    target_pos = rng.choice(['WR', 'TE', 'RB'], size=n, p=[0.62, 0.2, 0.18])
+    receiver = np.select(
+        [target_pos == 'WR', target_pos == 'TE'],
+        [_pick(rng, pos_idx, per_team, offsets['WR'], np.linspace(1, 0.3, counts['WR'])),
+         _pick(rng, pos_idx, per_team, offsets['TE'], np.linspace(1, 0.3, counts['TE']))],
+        _pick(rng, pos_idx, per_team, offsets['RB'], rb_weights),
+    )
+    targeted = is_pass & (rng.random(n) < 0.88)
+
+    cp = rng.beta(7, 3, n)
+    complete = targeted & (rng.random(n) < np.clip(cp + skill[passer], 0, 1))
+    cpoe = np.where(targeted, 100 * (complete - cp), np.nan)
+
+    epa = np.where(
+        is_pass,
+        0.05 + off - dfn + skill[passer] + np.where(targeted, skill[receiver], 0) + 1.3 * rng.standard_t(4, n),
+        np.where(is_run, -0.05 + 0.5 * (off - dfn) + skill[rusher] + 0.9 * rng.standard_t(5, n),
+                 0.4 * rng.standard_normal(n)),
+    )
+    epa[rng.random(n) < 0.005] = np.nan
+    xyac_epa = np.where(complete, rng.normal(0.35, 0.45, n), np.nan)
+
+    week = games['week'].to_numpy()[game_idx]
+    return pd.DataFrame({
+        'play_id': play_in_game + 1,
+        'game_id': games['game_id'].to_numpy()[game_idx],
+        'home_team': home,
+        'away_team': away,
+        'season_type': np.where(games['game_type'].to_numpy()[game_idx] == 'REG', 'REG', 'POST'),
+        'week': week,
+        'posteam': posteam,
+        'posteam_type': np.where(home_has_ball, 'home', 'away'),
+        'defteam': defteam,
+        'qtr': 1 + (4 * play_in_game) // np.repeat(n_per_game, n_per_game),
+        'down': rng.choice([1.0, 2.0, 3.0, 4.0], size=n, p=[0.44, 0.32, 0.2, 0.04]),
+        'ydstogo': rng.integers(1, 16, n),
+        'yardline_100': rng.integers(1, 100, n).astype(float),
+        'drive': 1 + play_in_game // 6,
+        'play_type': play_type,
+        'pass_attempt': is_pass.astype(float),
+        'rush_attempt': is_run.astype(float),
+        'complete_pass': complete.astype(float),
+        'epa': epa,
+        'success': np.where(is_pass | is_run, (epa > 0).astype(float), 0.0),
+        'cpoe': cpoe,
+        'xyac_epa': xyac_epa,
+        'passer_player_id': np.where(is_pass, ids[passer], None),
+        'passer_player_name': np.where(is_pass, names[passer], None),
+        'rusher_player_id': np.where(is_run, ids[rusher], None),
+        'rusher_player_name': np.where(is_run, names[rusher], None),
+        'receiver_player_id': np.where(targeted, ids[receiver], None),
+        'receiver_player_name': np.where(targeted, names[receiver], None),
+        'season': season,
+    })
+
+def generate(seasons=(2024,), roster=None, plays_per_game=160, seed=0):
+    """
+    Generates matching (pbp, roster, schedule) frames for the given seasons.
+    """
+    rng = np.random.default_rng(seed)
+    strength = {s: _team_strength(rng) for s in seasons}
+    roster_df = generate_roster(seasons, roster, seed)
+    schedule = generate_schedule(seasons, seed, strength)
+    pbp = pd.concat(
+        [generate_season_pbp(s, roster_df, schedule, strength[s], rng, plays_per_game) for s in seasons],
+        ignore_index=True,
+    )
+    return pbp, roster_df, schedule
+
+def generate_pbp(seasons=1, roster=None, seed=0, first_season=2024):
+    """
+    Convenience wrapper: play-by-play for a number of consecutive seasons
+    ending with first_season + seasons - 1.
+    """
+    years = range(first_season, first_season + seasons)
+    return generate(years, roster, seed=seed)[0]
+
+def write_fixtures(fixture_dir, seasons=(2024,), roster=None, seed=0):
+    """
+    Writes synthetic seasons in the data_loader fixture layout, so the
+    pipeline can run with --offline and no network.
+    """
+    pbp, roster_df, schedule = generate(seasons, roster, seed=seed)
+    for kind, df in (('pbp', pbp), ('roster', roster_df), ('schedule', schedule)):
+        for season in seasons:
+            path = data_loader._season_path(fixture_dir, kind, season)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df[df['season'] == season].to_parquet(path, index=False)
+    print(f"Wrote synthetic fixtures for {list(seasons)} to {fixture_dir}")
+
+def parse_roster(spec):
+    """
+    Parses 'QB=2,RB=3,WR=5,TE=2' into a roster dict.
+    """
+    roster = {}
+    for part in spec.split(','):
+        pos, count = part.split('=')
+        roster[pos.strip().upper()] = int(count)
+    return roster
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic play-by-play fixtures.")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2024])
+    parser.add_argument('--roster', type=parse_roster, default=None, help="e.g. QB=2,RB=3,WR=5,TE=2")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=data_loader.FIXTURE_DIR)
+    args = parser.parse_args()
+    write_fixtures(args.output, args.seasons, args.roster, args.seed)
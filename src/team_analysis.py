@@ -1,34 +1,222 @@
 import pandas as pd
 import numpy as np
 
-def analyze_teams(pbp_df):
+from src import aggregates, game_tables
+from src.season_context import SeasonContext
+
+# Play-by-play columns this analysis reads (see data_loader.schema_columns).
+# Only posteam, defteam and epa are required: a missing tracked metric
+# (older seasons have no xyac_epa) aggregates as NaN, and the game and
+# drive columns are only read by the game-table paths (src/game_tables.py).
+PBP_COLUMNS = [
+    'posteam', 'defteam', 'epa', 'cpoe', 'success', 'xyac_epa',
+    'season_type', 'game_id', 'drive', 'play_type',
+]
+
+def aggregate_teams(pbp_df):
     """
-    Analyzes team performance to predict the Super Bowl winner.
+    Builds mergeable per-team partial sums (offense and defense EPA) for
+    one chunk of plays.
     """
-    print("Analyzing team performance...")
-    
     # Filter for regular season (optional, but usually better for prediction base)
     # pbp_df = pbp_df[pbp_df['season_type'] == 'REG'] # Assuming data might have post-season if late in year
-    
+    missing = [metric for metric in aggregates.TRACKED_METRICS if metric not in pbp_df.columns]
+    if missing:
+        pbp_df = pbp_df.assign(**{metric: np.nan for metric in missing})
+    return {
+        'off': aggregates.partial_stats(pbp_df, ['posteam'], aggregates.TRACKED_METRICS),
+        'def': aggregates.partial_stats(pbp_df, ['defteam'], aggregates.TRACKED_METRICS),
+    }
+
+def team_aggregates_from_games(games):
+    """
+    Offense and defense EPA partial sums rolled up from the game table
+    (see src/game_tables.py), for rank_teams.
+    """
+    return {
+        'off': aggregates.rollup(games, ['posteam'], ['epa']),
+        'def': aggregates.rollup(games, ['defteam'], ['epa']),
+    }
+
+def combine_team_aggregates(parts):
+    """
+    Merges several aggregate_teams results into one.
+    """
+    parts = [p for p in parts if p is not None]
+    return {
+        side: aggregates.combine_partials([p[side] for p in parts])
+        for side in ('off', 'def')
+    }
+
+# Default weights of offense and defense in the prediction score
+# (see src/backtest.py for how other weightings would have done).
+OFF_WEIGHT = 0.6
+DEF_WEIGHT = 0.4
+
+def rank_teams(team_aggs, off_weight=OFF_WEIGHT, def_weight=DEF_WEIGHT, spread=False):
+    """
+    Scores teams from aggregated partial sums. With spread=True, also
+    reports the per-play standard deviation of EPA (off_epa_sd, def_epa_sd).
+    """
+    epa = ['epa', 'epa_sd'] if spread else ['epa']
+
     # Offensive EPA
-    off_stats = pbp_df.groupby('posteam')['epa'].mean().reset_index().rename(columns={'epa': 'off_epa'})
-    
+    off_stats = aggregates.finalize(team_aggs['off'], ['epa'], spread)[['posteam'] + epa].rename(
+        columns={'epa': 'off_epa', 'epa_sd': 'off_epa_sd'})
+
     # Defensive EPA (lower is better)
-    def_stats = pbp_df.groupby('defteam')['epa'].mean().reset_index().rename(columns={'epa': 'def_epa', 'defteam': 'team'})
-    
+    def_stats = aggregates.finalize(team_aggs['def'], ['epa'], spread)[['defteam'] + epa].rename(
+        columns={'epa': 'def_epa', 'epa_sd': 'def_epa_sd', 'defteam': 'team'})
+
     # Merge
     team_stats = off_stats.rename(columns={'posteam': 'team'}).merge(def_stats, on='team')
-    
+
+    return score_teams(team_stats, off_weight, def_weight)
+
+def score_teams(team_stats, off_weight=OFF_WEIGHT, def_weight=DEF_WEIGHT):
+    """
+    Adds z-scores and the prediction score to per-team off_epa / def_epa
+    (z-scored within each season when there is a 'season' column) and
+    sorts by it.
+    """
     # Normalize
-    team_stats['off_z'] = (team_stats['off_epa'] - team_stats['off_epa'].mean()) / team_stats['off_epa'].std()
-    team_stats['def_z'] = (team_stats['def_epa'] - team_stats['def_epa'].mean()) / team_stats['def_epa'].std()
-    
+    for side in ('off', 'def'):
+        epa = team_stats[f'{side}_epa']
+        if 'season' in team_stats.columns:
+            by_season = epa.groupby(team_stats['season'])
+            team_stats[f'{side}_z'] = (epa - by_season.transform('mean')) / by_season.transform('std')
+        else:
+            team_stats[f'{side}_z'] = (epa - epa.mean()) / epa.std()
+
     # Prediction Score: Higher Offense is good, Lower Defense is good
     # We negate def_z because negative EPA is good for defense.
     # If def_z is -2 (very good), -(-2) = +2.
-    team_stats['prediction_score'] = (0.6 * team_stats['off_z']) + (0.4 * (team_stats['def_z'] * -1))
-    
+    team_stats['prediction_score'] = (off_weight * team_stats['off_z']) + (def_weight * (team_stats['def_z'] * -1))
+
     # Sort by prediction score
     team_rankings = team_stats.sort_values('prediction_score', ascending=False)
-    
+
     return team_rankings
+
+# Columns needed for the per-week team charts.
+WEEKLY_PBP_COLUMNS = ['week', 'posteam', 'defteam', 'epa']
+
+def weekly_team_stats(pbp_df):
+    """
+    Offensive and defensive EPA/play per team and week.
+    """
+    off = pbp_df.groupby(['posteam', 'week'], observed=True)['epa'].agg(off_epa='mean', off_plays='size')
+    off.index = off.index.set_names(['team', 'week'])
+    dfn = pbp_df.groupby(['defteam', 'week'], observed=True)['epa'].agg(def_epa='mean', def_plays='size')
+    dfn.index = dfn.index.set_names(['team', 'week'])
+    weekly = off.join(dfn, how='outer').reset_index()
+    weekly['team'] = weekly['team'].astype(str)
+    return weekly.sort_values(['team', 'week'], ignore_index=True)
+
+def weekly_team_stats_from_games(games):
+    """
+    weekly_team_stats, rolled up from the game table.
+    """
+    weekly = None
+    for side, key in (('off', 'posteam'), ('def', 'defteam')):
+        sums = aggregates.rollup(games, [key, 'week'], ['epa'])
+        stats = pd.DataFrame({f'{side}_epa': sums['epa_sum'] / sums['epa_n'], f'{side}_plays': sums['plays']})
+        stats.index = stats.index.set_names(['team', 'week'])
+        weekly = stats if weekly is None else weekly.join(stats, how='outer')
+    weekly = weekly.reset_index()
+    weekly['team'] = weekly['team'].astype(str)
+    return weekly.sort_values(['team', 'week'], ignore_index=True)
+
+def team_drive_stats(drives):
+    """
+    Offensive and defensive EPA per drive and drive success rate (share of
+    drives with positive total EPA) per team, from the drive table (see
+    src/game_tables.py).
+    """
+    per_drive = drives.assign(drive_success=drives['epa_sum'] > 0)
+    stats = None
+    for side, key in (('off', 'posteam'), ('def', 'defteam')):
+        grouped = per_drive.groupby(key, observed=True).agg(
+            drives=('plays', 'size'), epa=('epa_sum', 'mean'), success=('drive_success', 'mean'))
+        grouped.columns = [f'{side}_drives', f'{side}_epa_per_drive', f'{side}_drive_success']
+        grouped.index = grouped.index.rename('team')
+        stats = grouped if stats is None else stats.join(grouped, how='outer')
+    stats = stats.reset_index()
+    stats['team'] = stats['team'].astype(str)
+    return stats.sort_values('team', ignore_index=True)
+
+def context_weekly_team_stats(ctx):
+    """
+    Per-week team stats for a SeasonContext, built once per season from
+    its game table.
+    """
+    return ctx.memo('weekly_team_stats', lambda: weekly_team_stats_from_games(game_tables.load_game_table(ctx)))
+
+def context_team_aggregates(ctx):
+    """
+    Team aggregates for a SeasonContext, rolled up once per season from
+    its game table.
+    """
+    return ctx.memo('team_aggregates', lambda: team_aggregates_from_games(game_tables.load_game_table(ctx)))
+
+def context_team_drive_stats(ctx):
+    """
+    Per-team drive stats for a SeasonContext, built once per season.
+    """
+    return ctx.memo('team_drive_stats', lambda: team_drive_stats(game_tables.load_drive_table(ctx)))
+
+# Team scorers behind analyze_teams.
+METHODS = ('raw', 'adjusted')
+
+def rank_game_table(games, method='raw', ridge=None):
+    """
+    Scores teams straight from a game table (see src/game_tables.py), on
+    raw mean EPA or on opponent-adjusted ratings (ridge defaults to
+    ratings.RIDGE).
+    """
+    if method == 'adjusted':
+        # scipy is only needed (and imported) for adjusted ratings
+        from src import ratings
+        return score_teams(ratings.adjusted_ratings(games, ratings.RIDGE if ridge is None else ridge))
+    return rank_teams(team_aggregates_from_games(games))
+
+def adjusted_team_stats(pbp_df, ridge=None):
+    """
+    Opponent-adjusted team ratings (see src/ratings.py) scored like
+    rank_teams. pbp_df may be a DataFrame, a SeasonContext or an iterable
+    of chunks, whose game tables are stacked.
+    """
+    if isinstance(pbp_df, SeasonContext):
+        games = game_tables.load_game_table(pbp_df)
+    elif isinstance(pbp_df, pd.DataFrame):
+        games = game_tables.build_game_table(pbp_df)
+    else:
+        games = pd.concat([game_tables.build_game_table(chunk) for chunk in pbp_df], ignore_index=True)
+    return rank_game_table(games, 'adjusted', ridge)
+
+def analyze_teams(pbp_df, method='raw', ridge=None):
+    """
+    Analyzes team performance to predict the Super Bowl winner.
+
+    pbp_df may be a DataFrame, a SeasonContext, or an iterable of
+    DataFrame chunks (see data_loader.iter_data). method='adjusted' scores
+    opponent-adjusted ratings (ridge-regularized, see src/ratings.py)
+    instead of raw mean EPA, so schedule strength is accounted for.
+    """
+    print("Analyzing team performance...")
+
+    if method == 'adjusted':
+        return adjusted_team_stats(pbp_df, ridge)
+    if method != 'raw':
+        print(f"Unknown team rating method: {method}")
+        return None
+
+    if isinstance(pbp_df, SeasonContext):
+        return rank_teams(context_team_aggregates(pbp_df))
+
+    chunks = [pbp_df] if isinstance(pbp_df, pd.DataFrame) else pbp_df
+    team_aggs = None
+    for chunk in chunks:
+        team_aggs = combine_team_aggregates([team_aggs, aggregate_teams(chunk)])
+
+    return rank_teams(team_aggs)
@@ -1,104 +1,383 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import contextlib
+import hashlib
+import inspect
+import json
 import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+from matplotlib.transforms import offset_copy
+import seaborn as sns
+
+# Charts are drawn on standalone Agg figures rather than through pyplot, so
+# nothing is kept in global state and each chart can render in any process.
+
+# Charts rendered by render_charts are recorded with the hash of their
+# inputs in this sidecar file, so unchanged charts are not redrawn.
+CHART_MANIFEST = 'charts.json'
 
-def plot_top_players(top_10_df, output_dir='output'):
+# Part of every chart hash: bump it when the plotting code changes so
+# existing PNGs are redrawn.
+CHART_STYLE_VERSION = 2
+
+# seaborn's "deep" red, which is what 'r' resolved to under the old global theme.
+QUADRANT_COLOR = sns.color_palette("deep")[3]
+
+@contextlib.contextmanager
+def _theme(style="whitegrid"):
+    """
+    Applies the seaborn theme for the duration of one chart only.
+    """
+    with sns.axes_style(style), sns.plotting_context("notebook"), sns.color_palette("deep"):
+        yield
+
+def _new_figure(figsize=(12, 8)):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+def _save(fig, output_dir, filename):
+    path = os.path.join(output_dir, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+def plot_top_players(top_10_df, output_dir='output', filename='top_10_players.png'):
     """
     Plots a bar chart of the top 10 most impressive players.
     """
-    plt.figure(figsize=(12, 8))
-    sns.set_theme(style="whitegrid")
-    
-    # Create bar plot
-    ax = sns.barplot(
-        x='impressiveness_score', 
-        y='player_name', 
-        data=top_10_df, 
-        hue='position', 
-        dodge=False,
-        palette='viridis'
-    )
-    
-    plt.title('Top 10 Most Impressive NFL Players (2024)', fontsize=16)
-    plt.xlabel('Impressiveness Score (Composite EPA & Efficiency)', fontsize=12)
-    plt.ylabel('Player Name', fontsize=12)
-    
-    # Save
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/top_10_players.png')
-    plt.close()
-
-def plot_qb_efficiency(qb_stats, output_dir='output'):
+    with _theme():
+        fig, ax = _new_figure()
+
+        # Create bar plot
+        sns.barplot(
+            x='impressiveness_score',
+            y='player_name',
+            data=top_10_df,
+            hue='position',
+            dodge=False,
+            palette='viridis',
+            ax=ax
+        )
+
+        ax.set_title('Top 10 Most Impressive NFL Players (2024)', fontsize=16)
+        ax.set_xlabel('Impressiveness Score (Composite EPA & Efficiency)', fontsize=12)
+        ax.set_ylabel('Player Name', fontsize=12)
+
+        return _save(fig, output_dir, filename)
+
+# Candidate label positions around a point, tried in order:
+# (dx, dy) offset in points, horizontal and vertical alignment.
+LABEL_POSITIONS = [
+    (6, 0, 'left', 'center'), (-6, 0, 'right', 'center'),
+    (0, 6, 'center', 'bottom'), (0, -6, 'center', 'top'),
+    (5, 5, 'left', 'bottom'), (5, -5, 'left', 'top'),
+    (-5, 5, 'right', 'bottom'), (-5, -5, 'right', 'top'),
+]
+_H_SHIFT = {'left': 0.0, 'center': 0.5, 'right': 1.0}
+_V_SHIFT = {'bottom': 0.0, 'center': 0.5, 'top': 1.0}
+
+def place_labels(ax, x, y, labels, priority=None, fontsize=9, drop_overlaps=True,
+                 obstacles=None, marker_size=10):
+    """
+    Labels points without overlapping labels.
+
+    Labels are placed greedily in priority order (highest first), each at
+    the first of LABEL_POSITIONS whose box does not hit an already placed
+    label. Boxes are estimated in display space and looked up through a
+    uniform grid hash, so placement is O(n log n) for the sort plus
+    roughly constant work per label. Labels with no free position are
+    dropped, or put at the first position if drop_overlaps is False.
+    obstacles is an optional (xs, ys) pair of marker positions (marker_size
+    points wide) that labels also keep clear of. Returns the number of
+    labels drawn.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    labels = np.asarray(labels).astype(str)
+    if len(labels) == 0:
+        return 0
+
+    fig = ax.figure
+    # Settle the layout and limits so display coordinates match the saved figure.
+    fig.tight_layout()
+    ax.autoscale_view()
+    scale = fig.dpi / 72
+    points = ax.transData.transform(np.column_stack([x, y]))
+    widths = (np.char.str_len(labels) * 0.6 * fontsize + 2) * scale
+    height = (1.2 * fontsize + 2) * scale
+    cell_w, cell_h = widths.max(), height
+
+    order = np.arange(len(labels)) if priority is None else np.argsort(-np.asarray(priority, dtype=float), kind='stable')
+    transforms = [offset_copy(ax.transData, fig=fig, x=dx, y=dy, units='points') for dx, dy, _, _ in LABEL_POSITIONS]
+    grid = defaultdict(list)
+    boxes = []
+    drawn = 0
+
+    def register(box):
+        for cx in range(int(box[0] // cell_w), int(box[2] // cell_w) + 1):
+            for cy in range(int(box[1] // cell_h), int(box[3] // cell_h) + 1):
+                grid[(cx, cy)].append(len(boxes))
+        boxes.append(box)
+
+    if obstacles is not None:
+        markers = ax.transData.transform(np.column_stack([np.asarray(obstacles[0], dtype=float),
+                                                          np.asarray(obstacles[1], dtype=float)]))
+        half = marker_size * scale / 2
+        for mx, my in markers[np.isfinite(markers).all(axis=1)]:
+            register((mx - half, my - half, mx + half, my + half))
+
+    for i in order:
+        if not np.isfinite(points[i]).all():
+            continue
+        choice = None
+        for k, (dx, dy, ha, va) in enumerate(LABEL_POSITIONS):
+            left = points[i, 0] + dx * scale - _H_SHIFT[ha] * widths[i]
+            bottom = points[i, 1] + dy * scale - _V_SHIFT[va] * height
+            box = (left, bottom, left + widths[i], bottom + height)
+            cells = [(cx, cy)
+                     for cx in range(int(box[0] // cell_w), int(box[2] // cell_w) + 1)
+                     for cy in range(int(box[1] // cell_h), int(box[3] // cell_h) + 1)]
+            hit = any(
+                box[0] < boxes[j][2] and boxes[j][0] < box[2] and box[1] < boxes[j][3] and boxes[j][1] < box[3]
+                for cell in cells for j in grid[cell]
+            )
+            if not hit:
+                choice = (k, box)
+                break
+            if k == 0:
+                first = (k, box)
+        if choice is None:
+            if drop_overlaps:
+                continue
+            choice = first
+
+        k, box = choice
+        register(box)
+        _, _, ha, va = LABEL_POSITIONS[k]
+        ax.text(x[i], y[i], labels[i], transform=transforms[k], ha=ha, va=va, fontsize=fontsize)
+        drawn += 1
+    return drawn
+
+def scatter_with_labels(ax, data, x, y, label, mask=None, priority=None, fontsize=9,
+                        drop_overlaps=True, **scatter_kws):
+    """
+    Scatter plot of data[x] vs data[y] with collision-free text labels.
+
+    mask selects the rows to label (a boolean array/Series, default all)
+    and priority (a column name or array) decides who wins when labels
+    collide. Set the title, axis labels and orientation of ax first: label
+    positions are computed from the final layout.
+    """
+    sns.scatterplot(x=x, y=y, data=data, ax=ax, **scatter_kws)
+
+    selected = np.ones(len(data), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    if isinstance(priority, str):
+        priority = data[priority].to_numpy()
+    if priority is not None:
+        priority = np.asarray(priority)[selected]
+    xs, ys = data[x].to_numpy(), data[y].to_numpy()
+    return place_labels(ax, xs[selected], ys[selected], data[label].to_numpy()[selected],
+                        priority=priority, fontsize=fontsize, drop_overlaps=drop_overlaps,
+                        obstacles=(xs, ys), marker_size=np.sqrt(scatter_kws.get('s', 36)))
+
+# QBs that are always labelled on the efficiency chart.
+FEATURED_QBS = ['P.Mahomes', 'J.Allen', 'L.Jackson', 'J.Burrow']
+
+def plot_qb_efficiency(qb_stats, output_dir='output', filename='qb_efficiency.png'):
     """
     Plots QB EPA/play vs CPOE.
     """
-    plt.figure(figsize=(12, 8))
-    sns.set_theme(style="whitegrid")
-    
-    # Scatter plot
-    ax = sns.scatterplot(
-        x='cpoe', 
-        y='epa', 
-        data=qb_stats, 
-        s=100, 
-        hue='passer_player_name', # Just to color, legend might be too big
-        legend=False
-    )
-    
-    # Add labels for top QBs
-    for i, point in qb_stats.iterrows():
-        if point['impressiveness_score'] > 1.0 or point['passer_player_name'] in ['P.Mahomes', 'J.Allen', 'L.Jackson', 'J.Burrow']:
-            ax.text(point['cpoe']+0.1, point['epa'], point['passer_player_name'], fontsize=9)
-            
-    plt.title('QB Efficiency: EPA/Play vs CPOE (2024)', fontsize=16)
-    plt.xlabel('Completion % Over Expected (CPOE)', fontsize=12)
-    plt.ylabel('Expected Points Added (EPA) per Play', fontsize=12)
-    
-    # Add quadrants
-    plt.axhline(y=qb_stats['epa'].mean(), color='r', linestyle='--')
-    plt.axvline(x=qb_stats['cpoe'].mean(), color='r', linestyle='--')
-    
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/qb_efficiency.png')
-    plt.close()
-
-def plot_team_tiers(team_stats, output_dir='output'):
+    with _theme():
+        fig, ax = _new_figure()
+
+        ax.set_title('QB Efficiency: EPA/Play vs CPOE (2024)', fontsize=16)
+        ax.set_xlabel('Completion % Over Expected (CPOE)', fontsize=12)
+        ax.set_ylabel('Expected Points Added (EPA) per Play', fontsize=12)
+
+        # Add quadrants
+        ax.axhline(y=qb_stats['epa'].mean(), color=QUADRANT_COLOR, linestyle='--')
+        ax.axvline(x=qb_stats['cpoe'].mean(), color=QUADRANT_COLOR, linestyle='--')
+
+        # Scatter plot, with labels for top QBs
+        scatter_with_labels(
+            ax, qb_stats, 'cpoe', 'epa', 'passer_player_name',
+            mask=(qb_stats['impressiveness_score'] > 1.0) | qb_stats['passer_player_name'].isin(FEATURED_QBS),
+            priority='impressiveness_score',
+            s=100,
+            hue='passer_player_name', # Just to color, legend might be too big
+            legend=False
+        )
+
+        return _save(fig, output_dir, filename)
+
+def plot_team_tiers(team_stats, output_dir='output', filename='team_tiers.png',
+                    title='Team Tiers: Offense vs Defense EPA (2024)'):
     """
     Plots Team Offense EPA vs Defense EPA.
     """
-    plt.figure(figsize=(12, 8))
-    sns.set_theme(style="whitegrid")
-    
-    # Scatter plot
-    # Note: Invert Y axis for Defense? No, let's keep EPA as is but label it.
-    # Actually, standard is usually: X=Offense, Y=Defense (reversed).
-    
-    ax = sns.scatterplot(
-        x='off_epa', 
-        y='def_epa', 
-        data=team_stats, 
-        s=100
-    )
-    
-    # Add labels
-    for i, point in team_stats.iterrows():
-        ax.text(point['off_epa']+0.005, point['def_epa'], point['team'], fontsize=9)
-        
-    plt.title('Team Tiers: Offense vs Defense EPA (2024)', fontsize=16)
-    plt.xlabel('Offensive EPA/Play (Higher is Better)', fontsize=12)
-    plt.ylabel('Defensive EPA/Play (Lower is Better)', fontsize=12)
-    
-    # Invert Y axis so top-right is best (Good Offense, Good Defense)? 
-    # No, usually Top-Right is Good Offense, Bad Defense.
-    # Let's Invert Y axis so that "Up" is "Good Defense" (Lower EPA).
-    plt.gca().invert_yaxis()
-    
-    # Add quadrants
-    plt.axhline(y=team_stats['def_epa'].mean(), color='r', linestyle='--')
-    plt.axvline(x=team_stats['off_epa'].mean(), color='r', linestyle='--')
-    
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/team_tiers.png')
-    plt.close()
+    with _theme():
+        fig, ax = _new_figure()
+
+        # Note: Invert Y axis for Defense? No, let's keep EPA as is but label it.
+        # Actually, standard is usually: X=Offense, Y=Defense (reversed).
+        ax.set_title(title, fontsize=16)
+        ax.set_xlabel('Offensive EPA/Play (Higher is Better)', fontsize=12)
+        ax.set_ylabel('Defensive EPA/Play (Lower is Better)', fontsize=12)
+
+        # Invert Y axis so top-right is best (Good Offense, Good Defense)?
+        # No, usually Top-Right is Good Offense, Bad Defense.
+        # Let's Invert Y axis so that "Up" is "Good Defense" (Lower EPA).
+        ax.invert_yaxis()
+
+        # Add quadrants
+        ax.axhline(y=team_stats['def_epa'].mean(), color=QUADRANT_COLOR, linestyle='--')
+        ax.axvline(x=team_stats['off_epa'].mean(), color=QUADRANT_COLOR, linestyle='--')
+
+        # Scatter plot, labelling every team
+        scatter_with_labels(
+            ax, team_stats, 'off_epa', 'def_epa', 'team',
+            priority=team_stats['off_epa'] - team_stats['def_epa'],
+            drop_overlaps=False,
+            s=100
+        )
+
+        return _save(fig, output_dir, filename)
+
+def plot_team_weekly(team_weekly, team, output_dir='output', filename=None):
+    """
+    Plots one team's offensive and defensive EPA/play by week.
+    """
+    with _theme():
+        fig, ax = _new_figure(figsize=(10, 5))
+
+        ax.plot(team_weekly['week'], team_weekly['off_epa'], marker='o', label='Offense EPA/Play')
+        ax.plot(team_weekly['week'], team_weekly['def_epa'], marker='o', label='Defense EPA/Play Allowed')
+        ax.axhline(y=0, color=QUADRANT_COLOR, linestyle='--')
+
+        ax.set_title(f'{team}: Weekly EPA/Play (2024)', fontsize=16)
+        ax.set_xlabel('Week', fontsize=12)
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.set_ylabel('EPA per Play', fontsize=12)
+        ax.legend()
+
+        return _save(fig, output_dir, filename or f'teams/{team}.png')
+
+def team_chart_jobs(weekly):
+    """
+    One plot_team_weekly job per team from team_analysis.weekly_team_stats.
+    """
+    return [
+        (plot_team_weekly, rows.reset_index(drop=True), {'team': team, 'filename': f'teams/{team}.png'})
+        for team, rows in weekly.groupby('team', sort=True)
+    ]
+
+def week_chart_jobs(weekly):
+    """
+    One team-tiers job per week from team_analysis.weekly_team_stats.
+    """
+    return [
+        (plot_team_tiers, rows.reset_index(drop=True), {
+            'filename': f'weeks/week_{int(week):02d}_tiers.png',
+            'title': f'Team Tiers: Week {int(week)} Offense vs Defense EPA (2024)',
+        })
+        for week, rows in weekly.groupby('week', sort=True)
+    ]
+
+def chart_filename(plot, kwargs):
+    """
+    The file a job writes, relative to the output directory.
+    """
+    return kwargs.get('filename') or inspect.signature(plot).parameters['filename'].default
+
+def chart_hash(plot, data, kwargs):
+    """
+    Hash of everything that determines a chart's pixels: the plot
+    function, its options, and the input data's columns, dtypes and values.
+    """
+    h = hashlib.sha256()
+    options = {k: v for k, v in kwargs.items() if k != 'output_dir'}
+    h.update(f"{CHART_STYLE_VERSION}|{plot.__name__}|{sorted(options.items())!r}".encode())
+    h.update(repr([(col, str(dtype)) for col, dtype in data.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+def read_chart_manifest(output_dir='output'):
+    """
+    Returns {filename: hash} for the charts last rendered into output_dir.
+    """
+    path = os.path.join(output_dir, CHART_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def _write_chart_manifest(manifest, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, CHART_MANIFEST)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _render(job):
+    """
+    Draws one chart; returns its (wall, CPU) seconds.
+    """
+    plot, data, kwargs = job
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    plot(data, **kwargs)
+    return time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+def render_charts(jobs, output_dir='output', workers=None, force=False, profiler=None, stage='render_charts'):
+    """
+    Draws a batch of independent charts in parallel worker processes.
+
+    jobs is a list of (plot_function, data) or (plot_function, data, kwargs)
+    tuples using the plot_* functions above. A chart is skipped when its PNG
+    exists and was rendered from inputs with the same chart_hash (unless
+    force=True). Returns the chart paths in job order. workers=1 (or a
+    single chart to draw) renders in-process.
+
+    With a profiler, every chart is recorded as a stage named after its
+    plot function (timed where it was drawn, zero if up to date), nested
+    in stage.
+    """
+    jobs = [(job[0], job[1], {'output_dir': output_dir, **(job[2] if len(job) > 2 else {})})
+            for job in jobs]
+    manifest = read_chart_manifest(output_dir)
+    paths, stale, hashes = [], [], {}
+    for job in jobs:
+        filename = chart_filename(job[0], job[2])
+        digest = chart_hash(*job)
+        paths.append(os.path.join(output_dir, filename))
+        if force or manifest.get(filename) != digest or not os.path.exists(paths[-1]):
+            stale.append(job)
+            hashes[filename] = digest
+
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    if workers <= 1:
+        timings = [_render(job) for job in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            timings = list(pool.map(_render, stale))
+
+    if profiler is not None:
+        drawn = {id(job): timing for job, timing in zip(stale, timings)}
+        for job in jobs:
+            wall, cpu = drawn.get(id(job), (0.0, 0.0))
+            profiler.add(job[0].__name__, wall, cpu, rows=len(job[1]), parent=stage,
+                         chart=chart_filename(job[0], job[2]), up_to_date=id(job) not in drawn)
+
+    if stale:
+        manifest.update(hashes)
+        _write_chart_manifest(manifest, output_dir)
+    print(f"Rendered {len(stale)} of {len(jobs)} charts ({len(jobs) - len(stale)} up to date).")
+    return paths
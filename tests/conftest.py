@@ -0,0 +1,26 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+# Make `from src import ...` work when pytest is run from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Point the season cache and fixtures at a scratch directory before src is
+# imported, so tests never read or write the real cache
+SCRATCH_DIR = tempfile.mkdtemp(prefix='nfl-tests-')
+atexit.register(shutil.rmtree, SCRATCH_DIR, ignore_errors=True)
+os.environ['NFL_CACHE_DIR'] = os.path.join(SCRATCH_DIR, 'cache')
+os.environ['NFL_FIXTURE_DIR'] = os.path.join(SCRATCH_DIR, 'fixtures')
+
+@pytest.fixture
+def cache_dir():
+    """
+    The (emptied) season cache directory the loaders default to.
+    """
+    from src import data_loader
+    shutil.rmtree(data_loader.CACHE_DIR, ignore_errors=True)
+    return data_loader.CACHE_DIR
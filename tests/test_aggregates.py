@@ -0,0 +1,26 @@
+from src import aggregates, data_loader, player_analysis, synthetic
+
+def _season():
+    pbp, _, _ = synthetic.generate([2024], seed=1)
+    return data_loader.optimize_dtypes(pbp)
+
+def test_combine_partials_stays_at_distinct_keys():
+    pbp = _season()
+    weeks = [week for _, week in pbp.groupby('week', sort=True)]
+    streamed = player_analysis.combine_player_aggregates(
+        [player_analysis.aggregate_players(week) for week in weeks])
+    whole = player_analysis.aggregate_players(pbp)
+    for name, (keys, _) in player_analysis.PLAYER_GROUPS.items():
+        assert len(streamed[name]) == len(whole[name])
+        assert len(streamed[name]) == len(pbp[keys].dropna().drop_duplicates())
+
+def test_streamed_partials_match_whole_season():
+    pbp = _season()
+    streamed = player_analysis.combine_player_aggregates(
+        [player_analysis.aggregate_players(week) for _, week in pbp.groupby('week', sort=True)])
+    whole = player_analysis.aggregate_players(pbp)
+    for name in player_analysis.PLAYER_GROUPS:
+        a = streamed[name].sort_index()
+        b = whole[name].sort_index()
+        columns = aggregates.partial_columns(aggregates.TRACKED_METRICS)
+        assert (a[columns] - b[columns]).abs().max().max() < 1e-6
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from src import backtest, data_loader, synthetic, team_analysis
+
+SEASONS = [2020, 2021, 2022, 2023]
+
+def test_weight_grid_includes_current_weighting():
+    grid = backtest.weight_grid(100)
+    assert np.isclose(grid[:, 0], team_analysis.OFF_WEIGHT).any()
+    assert np.allclose(grid.sum(axis=1), 1)
+
+def test_parallel_backtest_matches_serial(cache_dir):
+    pbp, _, schedule = synthetic.generate(SEASONS, seed=1)
+    for season in SEASONS:
+        data_loader._store_season(pbp[pbp['season'] == season], 'pbp', season, cache_dir)
+        data_loader._store_season(schedule[schedule['season'] == season], 'schedule', season, cache_dir)
+
+    weights = backtest.weight_grid(20)
+    parallel, _ = backtest.run_backtest(SEASONS, weights, workers=2, chunk_size=7, offline=True)
+    # every worker's cached season stats made it into the shared manifest
+    manifest = data_loader.read_manifest(cache_dir)
+    assert all(f'team_season_stats/{season}' in manifest for season in SEASONS)
+
+    serial, _ = backtest.run_backtest(SEASONS, weights, workers=1, offline=True)
+    assert len(parallel) == len(weights)
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from src import benchmark, championship_analysis, data_loader, player_analysis, synthetic, team_analysis
+
+def test_synthetic_seasons_carry_the_analysed_schema():
+    pbp, roster, schedule = synthetic.generate([2023, 2024], seed=3)
+    columns = data_loader.schema_columns(
+        player_analysis.PBP_COLUMNS, team_analysis.PBP_COLUMNS, championship_analysis.PBP_COLUMNS)
+    assert set(columns) <= set(pbp.columns)
+    assert sorted(pbp['season'].unique()) == [2023, 2024]
+    assert set(pbp['posteam'].dropna()) <= set(synthetic.TEAMS)
+    # every named player is on the season's roster
+    passers = pbp[['season', 'passer_player_id']].dropna().drop_duplicates()
+    assert len(passers.merge(roster, left_on=['season', 'passer_player_id'],
+                             right_on=['season', 'player_id'])) == len(passers)
+    assert set(schedule['season']) == {2023, 2024}
+
+def test_synthetic_data_is_reproducible_per_seed():
+    a = synthetic.generate([2024], seed=5)[0]
+    pd.testing.assert_frame_equal(a, synthetic.generate([2024], seed=5)[0])
+    assert not a['epa'].equals(synthetic.generate([2024], seed=6)[0]['epa'])
+
+def test_roster_size_is_configurable():
+    roster = synthetic.generate_roster([2024], synthetic.parse_roster('qb=1,RB=2,WR=3'))
+    counts = roster.groupby('team')['position'].value_counts().unstack()
+    assert (counts[['QB', 'RB', 'WR']] == [1, 2, 3]).all().all()
+    assert len(roster) == 6 * len(synthetic.TEAMS)
+    assert roster['player_name'].is_unique
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {'1': {'analyze_teams': {'wall_s': 1.0, 'peak_rss_mb': 100.0},
+                      'visualizer': {'wall_s': 0.0, 'peak_rss_mb': 0.0}}}
+    results = {'1': {'analyze_teams': {'wall_s': 1.2, 'peak_rss_mb': 130.0},
+                     'visualizer': {'wall_s': 5.0, 'peak_rss_mb': 5.0},
+                     'new_stage': {'wall_s': 9.0, 'peak_rss_mb': 900.0}},
+               '5': {'analyze_teams': {'wall_s': 9.0, 'peak_rss_mb': 900.0}}}
+    regressions = benchmark.compare(results, baseline, tolerance=0.25)
+    assert regressions == ["1 seasons / analyze_teams: peak_rss_mb 130.0 vs baseline 100.0"]
+    assert benchmark.compare(results, baseline, tolerance=0.5) == []
@@ -0,0 +1,75 @@
+import urllib.error
+
+import pytest
+
+from src import data_loader, fixture_server, synthetic
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    """
+    A mirror directory holding synthetic 2023 and 2024 seasons, with
+    backoff shortened and every download attempt recorded.
+    """
+    pbp, roster, schedule = synthetic.generate([2023, 2024], seed=1)
+    for kind, df in (('pbp', pbp), ('roster', roster), ('schedule', schedule)):
+        for year in (2023, 2024):
+            data_loader._store_season(df[df['season'] == year], kind, year, str(tmp_path / 'mirror'))
+    monkeypatch.setattr(data_loader, 'FETCH_BACKOFF', 0.001)
+    attempts = []
+    fetch_url = data_loader._fetch_url
+    def counted(url):
+        attempts.append(url)
+        return fetch_url(url)
+    monkeypatch.setattr(data_loader, '_fetch_url', counted)
+    return str(tmp_path / 'mirror'), {'pbp': pbp, 'roster': roster, 'schedule': schedule}, attempts
+
+def test_failures_are_retried_with_backoff(mirror):
+    directory, data, attempts = mirror
+    server, url = fixture_server.serve(directory, fail_rate=1.0)
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            data_loader.fetch_season('pbp', 2024, url)
+    finally:
+        server.shutdown()
+    assert error.value.code == 503
+    assert len(attempts) == data_loader.FETCH_RETRIES + 1
+
+def test_flaky_mirror_eventually_serves_the_season(mirror, monkeypatch):
+    directory, data, attempts = mirror
+    monkeypatch.setattr(data_loader, 'FETCH_RETRIES', 30)
+    server, url = fixture_server.serve(directory, fail_rate=0.5)
+    try:
+        df = data_loader.fetch_season('roster', 2024, url)
+    finally:
+        server.shutdown()
+    assert len(df) == (data['roster']['season'] == 2024).sum()
+    assert set(attempts) == {f'{url}/roster/season=2024.parquet'}
+
+def test_missing_season_is_not_retried(mirror):
+    directory, _, attempts = mirror
+    server, url = fixture_server.serve(directory)
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            data_loader.fetch_season('pbp', 1999, url)
+    finally:
+        server.shutdown()
+    assert error.value.code == 404
+    assert len(attempts) == 1
+
+def test_load_all_fetches_concurrently_through_failures(mirror, tmp_path, monkeypatch):
+    directory, data, attempts = mirror
+    monkeypatch.setattr(data_loader, 'FETCH_RETRIES', 30)
+    server, url = fixture_server.serve(directory, latency=0.02, fail_rate=0.3)
+    options = dict(base_url=url, cache_dir=str(tmp_path / 'cache'), fixture_dir=str(tmp_path / 'none'), workers=6)
+    try:
+        datasets = data_loader.load_all([2023, 2024], **options)
+        missing = data_loader.load_all([2024, 1999], kinds=('schedule',), **options)
+    finally:
+        server.shutdown()
+
+    for kind, df in data.items():
+        assert len(datasets[kind]) == len(df)
+        assert sorted(datasets[kind]['season'].unique()) == [2023, 2024]
+    # the six seasons, then 1999 (2024 is cached by then), under one url each
+    assert len(set(attempts)) == 7
+    assert missing['schedule'] is None
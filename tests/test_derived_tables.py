@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src import championship_analysis, data_loader, synthetic
+
+@pytest.fixture
+def cached_season(cache_dir):
+    """
+    A synthetic 2024 season stored in the cache, loaded back as the
+    analyses would load it.
+    """
+    pbp, _, _ = synthetic.generate([2024], seed=1)
+    data_loader._store_season(pbp, 'pbp', 2024, cache_dir)
+    return data_loader.load_season('pbp', 2024, offline=True)
+
+def _epa_allowed(table):
+    return table.set_index(['defteam', 'position'])['epa_allowed'].sort_index()
+
+def test_defense_table_of_filtered_season_is_not_cached(cached_season, cache_dir):
+    early = cached_season[cached_season['week'] <= 5]
+    first = championship_analysis.load_defense_table(early)
+    assert np.allclose(_epa_allowed(first), _epa_allowed(championship_analysis.build_defense_table(early)))
+    assert 'defense/2024' not in data_loader.read_manifest(cache_dir)
+
+    full = championship_analysis.load_defense_table(cached_season)
+    assert np.allclose(_epa_allowed(full), _epa_allowed(championship_analysis.build_defense_table(cached_season)))
+    assert 'defense/2024' in data_loader.read_manifest(cache_dir)
+    # the cached full-season table is not served for a filtered frame
+    again = championship_analysis.load_defense_table(early)
+    assert np.allclose(_epa_allowed(again), _epa_allowed(first))
+
+def test_defense_table_of_several_seasons_is_not_cached(cached_season, cache_dir):
+    other = cached_season.assign(season=2023)
+    both = championship_analysis.load_defense_table(
+        data_loader._concat_seasons([other, cached_season]))
+    assert both['plays'].sum() == 2 * championship_analysis.build_defense_table(cached_season)['plays'].sum()
+    assert 'defense/2024' not in data_loader.read_manifest(cache_dir)
+
+def test_week_filtered_context_is_not_served_the_season_table(cached_season, cache_dir):
+    from src import game_tables, team_analysis
+    from src.season_context import SeasonContext
+
+    def ranked(pbp):
+        teams = team_analysis.rank_teams(team_analysis.aggregate_teams(pbp))
+        return teams.assign(team=teams['team'].astype(str)).set_index('team')['prediction_score'].sort_index()
+
+    early = cached_season[cached_season['week'] <= 5]
+    # the filtered context first, then the full season, then filtered again
+    for pbp in (early, cached_season, early):
+        got = team_analysis.analyze_teams(SeasonContext(pbp))
+        got = got.assign(team=got['team'].astype(str)).set_index('team')['prediction_score'].sort_index()
+        assert np.allclose(got, ranked(pbp))
+
+    games = data_loader.read_manifest(cache_dir)['games/2024']
+    cached = game_tables.load_game_table(cached_season)
+    assert games['rows'] == len(cached) == len(game_tables.build_game_table(cached_season))
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from src.form import FormEngine
+
+def _roles(rows):
+    return pd.DataFrame(rows, columns=['player', 'role', 'week', 'posteam']).assign(epa=0.1, success=1.0)
+
+def test_window_team_is_first_play_in_role_order():
+    roles = _roles([
+        # passing rows first, as melt_player_roles orders them
+        ('Q.Back', 'passer', 5, 'BUF'),
+        ('Q.Back', 'rusher', 3, 'MIA'),
+        ('T.Traded', 'rusher', 1, 'NYJ'),
+        ('T.Traded', 'rusher', 3, 'NYJ'),
+        ('T.Traded', 'rusher', 4, 'PIT'),
+        ('T.Traded', 'rusher', 5, 'PIT'),
+        ('W.Out', 'receiver', 2, 'DAL'),
+    ])
+    engine = FormEngine(roles)
+    teams = lambda form: dict(zip(form['player'], form['team']))
+
+    assert teams(engine.window(5, week=5)) == {'Q.Back': 'BUF', 'T.Traded': 'NYJ', 'W.Out': 'DAL'}
+    assert teams(engine.window(2, week=5)) == {'Q.Back': 'BUF', 'T.Traded': 'PIT'}
+    assert teams(engine.window(3, week=3)) == {'Q.Back': 'MIA', 'T.Traded': 'NYJ', 'W.Out': 'DAL'}
+    # decayed form has no window start: latest week's team
+    assert teams(engine.decayed(2, week=5))['T.Traded'] == 'PIT'
+
+def _random_roles(seed=0):
+    rng = np.random.default_rng(seed)
+    n = 3000
+    weeks = rng.integers(1, 19, n)
+    return pd.DataFrame({
+        'player': rng.choice(['A', 'B', 'C', 'D', 'E'], n),
+        'role': 'rusher',
+        'season': rng.choice([2023, 2024], n),
+        'week': np.where(weeks == 9, 10, weeks),      # a league-wide bye in week 9
+        'posteam': 'BUF',
+        'epa': np.where(rng.random(n) < 0.1, np.nan, rng.normal(0, 1, n)),
+        'success': rng.integers(0, 2, n).astype(float),
+    })
+
+def _direct(plays, weights=None):
+    plays = plays.assign(w=1.0 if weights is None else weights)
+    grouped = plays.assign(we=plays['w'] * plays['epa'], ws=plays['w'] * plays['success'],
+                           wn=plays['w'] * plays['epa'].notna()).groupby('player')
+    return pd.DataFrame({'avg_epa': grouped['we'].sum() / grouped['wn'].sum(),
+                         'success_rate': grouped['ws'].sum() / grouped['w'].sum(),
+                         'usage_count': grouped['w'].sum()})
+
+def test_windows_match_plays_in_the_last_weeks_of_the_season():
+    roles = _random_roles()
+    engine = FormEngine(roles)
+    for weeks, week in ((3, 18), (5, 12), (8, 4)):
+        form = engine.window(weeks, week=week, season=2024).set_index('player')
+        plays = roles[(roles['season'] == 2024) & roles['week'].between(week - weeks + 1, week)]
+        expected = _direct(plays)
+        assert np.allclose(form[['avg_epa', 'success_rate', 'usage_count']], expected.loc[form.index])
+
+def test_windows_stop_at_the_season_boundary():
+    roles = _random_roles()
+    engine = FormEngine(roles)
+    # week 2 of 2024 with an 8-week window: only 2024 weeks 1-2, unless crossing seasons
+    within = engine.window(8, week=2, season=2024).set_index('player')
+    plays = roles[(roles['season'] == 2024) & (roles['week'] <= 2)]
+    assert (within['usage_count'] == _direct(plays).loc[within.index, 'usage_count']).all()
+
+    across = engine.window(8, week=2, season=2024, cross_seasons=True).set_index('player')
+    # eight timeline slots: 2024 weeks 1-2 and the last six weeks 2023 played
+    plays = roles[((roles['season'] == 2024) & (roles['week'] <= 2))
+                  | ((roles['season'] == 2023) & (roles['week'] >= 13))]
+    assert (across['usage_count'] == _direct(plays).loc[across.index, 'usage_count']).all()
+
+def test_decayed_form_weights_weeks_by_halflife():
+    roles = _random_roles()
+    engine = FormEngine(roles)
+    form = engine.decayed(2.0, week=12, season=2024).set_index('player')
+    plays = roles[(roles['season'] == 2024) & (roles['week'] <= 12)]
+    # decay runs over the weeks that had plays, so the week 9 bye is skipped
+    played = np.sort(plays['week'].unique())
+    age = len(played) - 1 - np.searchsorted(played, plays['week'])
+    expected = _direct(plays, 0.5 ** (age / 2.0))
+    assert np.allclose(form[['avg_epa', 'success_rate', 'usage_count']], expected.loc[form.index])
+
+def test_compare_lines_up_windows_per_player():
+    engine = FormEngine(_random_roles())
+    table = engine.compare((3, 5), halflife=2, week=12, season=2024, players=['B', 'A', 'Z'])
+    assert table['player'].tolist() == ['B', 'A']
+    assert {'epa_3w', 'epa_5w', 'epa_hl2', 'usage_3w', 'success_hl2'} <= set(table.columns)
+    assert (table['usage_5w'] >= table['usage_3w']).all()
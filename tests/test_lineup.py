@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src import lineup
+
+SLOTS = {'QB': 1, 'RB': 1, 'WR': 1, 'TE': 1, 'FLEX': 1}
+
+def _roster(rows, team=''):
+    return pd.DataFrame([(team,) + row for row in rows], columns=['team', 'player', 'position', 'projection'])
+
+def _slots(lineups):
+    return dict(zip(lineups['player'], lineups['slot']))
+
+def test_flex_takes_the_best_remaining_rb_wr_or_te():
+    roster = _roster([
+        ('Q1', 'QB', 20.0), ('Q2', 'QB', 30.0),
+        ('R1', 'RB', 10.0), ('R2', 'RB', 8.0),
+        ('W1', 'WR', 12.0), ('W2', 'WR', 5.0),
+        ('T1', 'TE', 6.0),
+    ])
+    slots = _slots(lineup.optimize_rosters(roster, SLOTS))
+    assert slots == {'Q2': 'QB', 'R1': 'RB', 'W1': 'WR', 'T1': 'TE', 'R2': 'FLEX',
+                     'Q1': 'BENCH', 'W2': 'BENCH'}
+
+def test_flex_never_takes_a_qb():
+    mask = lineup.eligibility(['QB', 'RB', 'WR', 'TE', 'K'], ['FLEX', 'QB'])
+    assert mask[:, 0].tolist() == [False, True, True, True, False]
+    assert mask[:, 1].tolist() == [True, False, False, False, False]
+
+def test_slots_without_an_eligible_player_stay_empty():
+    roster = _roster([('Q1', 'QB', 20.0), ('W1', 'WR', 12.0), ('W2', 'WR', 3.0)])
+    lineups = lineup.optimize_rosters(roster, SLOTS)
+    assert _slots(lineups) == {'Q1': 'QB', 'W1': 'WR', 'W2': 'FLEX'}
+    assert lineup.lineup_totals(lineups)[['starters', 'total']].values.tolist() == [[3, 35.0]]
+
+def test_players_without_a_projection_are_never_started():
+    roster = _roster([('Q1', 'QB', np.nan), ('R1', 'RB', np.nan), ('R2', 'RB', 1.0), ('W1', 'WR', -2.0)])
+    slots = _slots(lineup.optimize_rosters(roster, SLOTS))
+    assert slots['Q1'] == 'BENCH' and slots['R1'] == 'BENCH'
+    # R2 is worth the same in RB and FLEX; a negative projection still starts
+    assert slots['R2'] in ('RB', 'FLEX') and slots['W1'] == 'WR'
+
+def test_rosters_are_optimized_per_team():
+    a = _roster([('A-Q', 'QB', 10.0), ('A-R', 'RB', 5.0), ('A-R2', 'RB', 4.0)], 'a')
+    b = _roster([('B-Q', 'QB', 30.0), ('B-R', 'RB', 1.0)], 'b')
+    league = lineup.optimize_rosters(pd.concat([b, a], ignore_index=True), SLOTS)
+    assert list(league['team'].unique()) == ['a', 'b']
+    for team, roster in (('a', a), ('b', b)):
+        alone = lineup.optimize_rosters(roster, SLOTS)
+        pd.testing.assert_frame_equal(league[league['team'] == team].reset_index(drop=True), alone)
+    totals = lineup.lineup_totals(league)
+    assert totals['team'].tolist() == ['b', 'a']
+    assert totals['total'].tolist() == [31.0, 19.0]
+
+def test_load_rosters_from_csv(tmp_path):
+    path = tmp_path / 'league.csv'
+    path.write_text("Team,Player,Position,Projection\nA,J.Allen,qb,22.5\n,S.Barkley,RB,18\n")
+    entries = lineup.load_rosters(str(path))
+    assert entries['team'].tolist() == ['A', '']
+    assert entries['position'].tolist() == ['QB', 'RB']
+    assert entries['projection'].tolist() == [22.5, 18.0]
+
+    single = tmp_path / 'roster.csv'
+    single.write_text("player,position\nJ.Allen,QB\n")
+    assert 'team' not in lineup.load_rosters(str(single)).columns
+
+def test_load_rosters_reports_missing_columns(tmp_path, capsys):
+    path = tmp_path / 'bad.csv'
+    path.write_text("team,name,position\nA,J.Allen,QB\n")
+    assert lineup.load_rosters(str(path)) is None
+    assert "missing columns ['player']" in capsys.readouterr().out
+    assert lineup.load_rosters(str(tmp_path / 'absent.csv')) is None
+
+def test_load_rosters_from_json(tmp_path):
+    one = tmp_path / 'one.json'
+    one.write_text(json.dumps({'qb': ['J.Allen'], 'WR': ['J.Chase', 'A.Brown']}))
+    entries = lineup.load_rosters(str(one))
+    assert entries.values.tolist() == [['', 'J.Allen', 'QB'], ['', 'J.Chase', 'WR'], ['', 'A.Brown', 'WR']]
+
+    league = tmp_path / 'league.json'
+    league.write_text(json.dumps({'A': {'QB': ['J.Allen']}, 'B': {'RB': ['S.Barkley']}}))
+    assert lineup.load_rosters(str(league))[['team', 'player']].values.tolist() == [['A', 'J.Allen'], ['B', 'S.Barkley']]
+
+    bad = tmp_path / 'bad.json'
+    bad.write_text('{"QB": ')
+    assert lineup.load_rosters(str(bad)) is None
@@ -0,0 +1,12 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_importing_main_does_not_load_plotting():
+    code = ("import sys, main; "
+            "print(sorted(m for m in ('matplotlib', 'seaborn', 'src.visualizer', 'src.report', 'src.simulator') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from src import data_loader, player_analysis, synthetic
+from src.season_context import SeasonContext
+
+def _sorted(players, drop=()):
+    players = players.drop(columns=list(drop)).astype({'player_name': str, 'posteam': str})
+    return players.sort_values(['player_name', 'impressiveness_score'], ignore_index=True)
+
+def test_roster_labels_positions_without_dropping_players():
+    pbp, roster, _ = synthetic.generate([2024], seed=1)
+    pbp = data_loader.optimize_dtypes(pbp)
+    _, _, unlabelled = player_analysis.analyze_players(pbp, None)
+    _, qb_stats, labelled = player_analysis.analyze_players(pbp, roster)
+
+    # grouped on PlayerIndex keys, same players and scores as by id/name
+    assert 'passer_player_key' in qb_stats.columns
+    pd.testing.assert_frame_equal(_sorted(labelled, ['position']), _sorted(unlabelled, ['position']))
+    assert set(labelled['position']) <= {'QB', 'RB', 'WR', 'TE', 'WR/TE'}
+    # rushing QBs stay in the rushing table, under its label, so one
+    # player's rows never share a position
+    assert (labelled['position'] == 'QB').sum() == len(qb_stats)
+    assert not labelled.duplicated(['player_name', 'position']).any()
+
+    _, _, from_context = player_analysis.analyze_players(SeasonContext(pbp), roster)
+    pd.testing.assert_frame_equal(_sorted(from_context), _sorted(labelled))
+    weeks = (week for _, week in pbp.groupby('week'))
+    _, _, streamed = player_analysis.analyze_players(weeks, roster)
+    pd.testing.assert_frame_equal(_sorted(streamed), _sorted(labelled))
+
+def test_thresholds_and_weights_come_from_the_scoring_tables(monkeypatch):
+    pbp, _, _ = synthetic.generate([2024], seed=1)
+    aggs = player_analysis.aggregate_players(data_loader.optimize_dtypes(pbp))
+    monkeypatch.setitem(player_analysis.MIN_PLAYS, 'qb', 200)
+    monkeypatch.setitem(player_analysis.SCORE_WEIGHTS, 'qb', {'epa': 1.0, 'cpoe': 0.0})
+    _, qb_stats, _ = player_analysis.rank_players(aggs)
+    assert (qb_stats['play_id'] >= 200).all()
+    assert (qb_stats['impressiveness_score'] - qb_stats['epa_z']).abs().max() < 1e-12
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from src import visualizer
+from src.profiling import Profiler
+
+def test_render_charts_records_a_stage_per_chart(tmp_path):
+    teams = pd.DataFrame({'team': ['KC', 'BUF', 'PHI'], 'off_epa': [0.1, 0.2, 0.0], 'def_epa': [0.0, -0.1, 0.1],
+                          'prediction_score': [1.0, 2.0, 0.5]})
+    profiler = Profiler()
+    jobs = [(visualizer.plot_team_tiers, teams)]
+    with profiler.stage('render_charts'):
+        visualizer.render_charts(jobs, output_dir=str(tmp_path), workers=1, profiler=profiler)
+    with profiler.stage('render_charts_again'):
+        visualizer.render_charts(jobs, output_dir=str(tmp_path), workers=1, profiler=profiler)
+
+    plots = [s for s in profiler.stages if s['stage'] == 'plot_team_tiers']
+    assert [s['up_to_date'] for s in plots] == [False, True]
+    assert plots[0]['wall_s'] > 0 and plots[0]['parent'] == 'render_charts'
+    # nested stages are not counted twice
+    top = [s for s in profiler.stages if 'parent' not in s]
+    assert profiler.trace()['total_wall_s'] == round(sum(s['wall_s'] for s in top), 4)
+    assert 'plot_team_tiers' in profiler.summary()
@@ -0,0 +1,63 @@
+import numpy as np
+
+from src import data_loader, game_tables, ratings, synthetic
+
+def _schedule(rng, n_teams=8, n_seasons=2, weeks=14):
+    """
+    Random (offense, defense, season) rows, each team facing others
+    every week, with per-row play counts.
+    """
+    off, dfn, season = [], [], []
+    for s in range(n_seasons):
+        for _ in range(weeks):
+            order = rng.permutation(n_teams)
+            for a, b in zip(order[::2], order[1::2]):
+                off += [a, b]
+                dfn += [b, a]
+                season += [s, s]
+    n = rng.integers(40, 80, len(off)).astype(float)
+    return np.array(off), np.array(dfn), np.array(season), n
+
+def test_sparse_fit_matches_dense_solve():
+    rng = np.random.default_rng(0)
+    off, dfn, season, n = _schedule(rng)
+    epa_sum = rng.normal(0, 0.2, len(off)) * n
+    fitted = ratings.fit_ratings(off, dfn, season, epa_sum, n, 8, 2, ridge=50.0)
+
+    X = ratings.design_matrix(off, dfn, season, 8, 2).toarray()
+    penalty = np.r_[np.full(16, 50.0), np.zeros(2)]
+    beta = np.linalg.solve(X.T @ (n[:, None] * X) + np.diag(penalty), X.T @ epa_sum)
+    assert np.allclose(np.concatenate(fitted), beta)
+
+def test_recovers_known_ratings_on_a_noise_free_schedule():
+    rng = np.random.default_rng(1)
+    off, dfn, season, n = _schedule(rng)
+    true_off = rng.normal(0, 0.1, 8)
+    true_def = rng.normal(0, 0.1, 8)
+    average = np.array([0.02, -0.01])
+    epa = average[season] + true_off[off] + true_def[dfn]
+    fit_off, fit_def, intercepts = ratings.fit_ratings(off, dfn, season, epa * n, n, 8, 2, ridge=1e-6)
+
+    # Only contrasts between teams (and each row's total) are identified
+    assert np.allclose(fit_off - fit_off.mean(), true_off - true_off.mean(), atol=1e-6)
+    assert np.allclose(fit_def - fit_def.mean(), true_def - true_def.mean(), atol=1e-6)
+    assert np.allclose(intercepts[season] + fit_off[off] + fit_def[dfn], epa, atol=1e-6)
+
+def test_ridge_shrinks_toward_the_average():
+    rng = np.random.default_rng(2)
+    off, dfn, season, n = _schedule(rng)
+    epa_sum = rng.normal(0, 0.2, len(off)) * n
+    spread = [np.ptp(ratings.fit_ratings(off, dfn, season, epa_sum, n, 8, 2, ridge)[0])
+              for ridge in (1.0, 100.0, 1e6)]
+    assert spread[0] > spread[1] > spread[2]
+    assert spread[2] < 1e-3
+
+def test_game_table_fit_matches_play_fit():
+    pbp, _, _ = synthetic.generate([2023, 2024], seed=1)
+    pbp = data_loader.optimize_dtypes(pbp)
+    by_game = ratings.adjusted_ratings(game_tables.build_game_table(pbp)).sort_values(['season', 'team'])
+    by_play = ratings.play_ratings(pbp).sort_values(['season', 'team'])
+    assert by_game['team'].tolist() == by_play['team'].tolist()
+    for col in ('off_epa', 'def_epa'):
+        assert np.allclose(by_game[col], by_play[col], atol=1e-5)
+    assert (by_game['off_plays'].to_numpy() == by_play['off_plays'].to_numpy()).all()
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src import championship_analysis, synthetic
+from src.player_index import PlayerIndex
+
+NAME_COLUMNS = {'passer_player_id': 'passer_player_name', 'rusher_player_id': 'rusher_player_name',
+                'receiver_player_id': 'receiver_player_name'}
+
+def _rename(pbp, roster, ids, name):
+    pbp, roster = pbp.copy(), roster.copy()
+    for id_col, name_col in NAME_COLUMNS.items():
+        pbp.loc[pbp[id_col].isin(ids), name_col] = name
+    first, last = name.split('.')
+    roster.loc[roster['player_id'].isin(ids), ['player_name', 'first_name', 'last_name']] = [name, first, last]
+    return pbp, roster
+
+def _usage(form):
+    return dict(zip(form['player'], form['usage_count']))
+
+def test_ambiguous_and_unresolved_names_fall_back_to_play_by_play_names():
+    pbp, roster, _ = synthetic.generate([2024], seed=1)
+    rb = roster.loc[roster['position'] == 'RB', 'player_id'].iloc[0]
+    wr = roster.loc[roster['position'] == 'WR', 'player_id'].iloc[0]
+    pbp, roster = _rename(pbp, roster, [rb, wr], 'X.Same')
+    by_name = _usage(championship_analysis.analyze_recent_form(pbp, ['X.Same'], weeks=20))
+    assert by_name['X.Same'] > 0
+
+    # two rostered players share the name: ambiguous, so matched by name
+    index = PlayerIndex(roster, pbp)
+    assert index.resolve(['X.Same'])[0] == -1
+    form = championship_analysis.analyze_recent_form(pbp, ['X.Same'], weeks=20, index=index)
+    assert _usage(form) == by_name
+
+    # the fantasy roster's position picks one of them
+    assert index.players['player_id'][index.resolve(['X.Same'], ['RB'])[0]] == rb
+    form = championship_analysis.analyze_recent_form(pbp, ['X.Same'], weeks=20, index=index,
+                                                     positions={'X.Same': 'RB'})
+    only_rb = _usage(championship_analysis.analyze_recent_form(pbp, [rb], weeks=20, index=index))
+    assert _usage(form) == {'X.Same': only_rb[rb]}
+    assert 0 < only_rb[rb] < by_name['X.Same']
+
+    # not on the roster and the index has no play-by-play: unresolved
+    index = PlayerIndex(roster[~roster['player_id'].isin([rb, wr])])
+    assert index.resolve(['X.Same'])[0] == -1
+    form = championship_analysis.analyze_recent_form(pbp, ['X.Same'], weeks=20, index=index)
+    assert _usage(form) == by_name
@@ -0,0 +1,87 @@
+import pandas as pd
+
+from src import report
+
+TOP_PLAYERS = pd.DataFrame({
+    'player_name': ['J.Allen', 'S.Barkley', "J.Ja'Marr & <Co>"],
+    'position': ['QB', 'RB', 'WR'],
+    'posteam': ['BUF', 'PHI', 'CIN'],
+    'impressiveness_score': [2.345, 1.5, 0.125],
+})
+
+TEAMS = pd.DataFrame({
+    'team': ['DET', 'BAL'],
+    'off_epa': [0.1234, 0.1111],
+    'def_epa': [-0.0567, -0.02],
+    'off_z': [1.876, 1.5],
+    'def_z': [-1.234, -0.5],
+    'prediction_score': [1.6192, 1.1],
+})
+
+def _legacy_report(top_players, team_rankings):
+    """
+    The Markdown the original main.generate_report wrote.
+    """
+    predicted_winner = team_rankings.iloc[0]
+    out = ["# NFL 2024 Quantitative Analysis Report\n\n",
+           "## Top 10 Most Impressive Players\n",
+           "This ranking is based on a composite score of Advanced Metrics:\n",
+           "- **QBs**: EPA/Play (60%) + CPOE (40%)\n",
+           "- **RBs**: EPA/Play (50%) + Success Rate (50%)\n",
+           "- **WRs/TEs**: EPA/Target (60%) + Expected YAC EPA (40%)\n\n",
+           "| Rank | Player | Position | Team | Impressiveness Score |\n",
+           "|---|---|---|---|---|\n"]
+    for i, (_, row) in enumerate(top_players.iterrows()):
+        out.append(f"| {i+1} | {row['player_name']} | {row['position']} | {row['posteam']} | {row['impressiveness_score']:.2f} |\n")
+    out += ["\n![Top 10 Players](output/top_10_players.png)\n\n",
+            "## Super Bowl Prediction Thesis\n",
+            f"### Predicted Winner: **{predicted_winner['team']}**\n\n",
+            "**Quantitative Reasoning:**\n",
+            "The prediction model values a balanced team with a slight bias towards elite offense.\n",
+            f"- **Offensive EPA/Play**: {predicted_winner['off_epa']:.3f} (Z-Score: {predicted_winner['off_z']:.2f})\n",
+            f"- **Defensive EPA/Play**: {predicted_winner['def_epa']:.3f} (Z-Score: {predicted_winner['def_z']:.2f})\n",
+            f"- **Composite Prediction Score**: {predicted_winner['prediction_score']:.2f}\n\n",
+            "Historically, teams with top-tier efficiency in both passing offense and pass defense correlate strongly with Super Bowl success.\n",
+            f"The **{predicted_winner['team']}** currently exhibit the best combination of these metrics.\n\n",
+            "### Team Tiers\n",
+            "The following chart visualizes the offensive vs defensive efficiency of all teams.\n",
+            "![Team Tiers](output/team_tiers.png)\n\n",
+            "### QB Efficiency\n",
+            "Quarterback play is the single most important factor. Here is how the league's QBs stack up:\n",
+            "![QB Efficiency](output/qb_efficiency.png)\n"]
+    return ''.join(out)
+
+def _write(tmp_path, formats=report.FORMATS):
+    return report.write_analysis_report(TOP_PLAYERS, TEAMS, str(tmp_path / 'ANALYSIS_REPORT.md'),
+                                        formats, csv_dir=str(tmp_path / 'csv'))
+
+def test_markdown_matches_the_original_report(tmp_path):
+    paths = _write(tmp_path)
+    with open(paths['md'], encoding='utf-8') as f:
+        assert f.read() == _legacy_report(TOP_PLAYERS, TEAMS)
+
+def test_html_has_the_same_sections(tmp_path):
+    paths = _write(tmp_path)
+    with open(paths['html'], encoding='utf-8') as f:
+        page = f.read()
+    assert page.startswith('<!DOCTYPE html>') and page.endswith('</body>\n</html>\n')
+    for heading in ('<h1>NFL 2024 Quantitative Analysis Report</h1>',
+                    '<h2>Top 10 Most Impressive Players</h2>',
+                    '<h3>Predicted Winner: <strong>DET</strong></h3>',
+                    '<h3>Team Tiers</h3>', '<h3>QB Efficiency</h3>'):
+        assert heading in page
+    assert page.count('<li>') == 6 and page.count('<ul>') == page.count('</ul>') == 2
+    assert '<li><strong>Offensive EPA/Play</strong>: 0.123 (Z-Score: 1.88)</li>' in page
+    assert '<tr><td>1</td><td>J.Allen</td><td>QB</td><td>BUF</td><td>2.35</td></tr>' in page
+    assert "<td>J.Ja'Marr &amp; &lt;Co&gt;</td>" in page
+    assert '<p><img src="output/team_tiers.png" alt="Team Tiers"></p>' in page
+
+def test_csv_holds_the_unformatted_table(tmp_path):
+    paths = _write(tmp_path, formats=('csv',))
+    assert set(paths) == {'csv:top_players'}
+    table = pd.read_csv(paths['csv:top_players'])
+    assert list(table.columns) == ['Rank', 'Player', 'Position', 'Team', 'Impressiveness Score']
+    assert table['Rank'].tolist() == [1, 2, 3]
+    assert table['Player'].tolist() == TOP_PLAYERS['player_name'].tolist()
+    assert table['Impressiveness Score'].tolist() == TOP_PLAYERS['impressiveness_score'].tolist()
+    assert not (tmp_path / 'ANALYSIS_REPORT.md').exists()
@@ -0,0 +1,46 @@
+import numpy as np
+
+from src import data_loader, player_analysis, synthetic, team_analysis
+from src.season_context import SeasonContext
+
+def _season():
+    pbp, _, _ = synthetic.generate([2024], seed=1)
+    return data_loader.optimize_dtypes(pbp)
+
+def test_memo_builds_once_until_invalidated():
+    ctx = SeasonContext(None)
+    builds = []
+    build = lambda: builds.append(1) or len(builds)
+    assert ctx.memo('a', build) == ctx.memo('a', build) == 1
+    assert ctx.memo('b', build) == 2
+    ctx.invalidate('a')
+    assert ctx.memo('a', build) == 3 and ctx.memo('b', build) == 2
+    ctx.invalidate()
+    assert ctx.memo('b', build) == 4
+
+def test_views_are_filtered_once_and_reset_with_the_frame():
+    pbp = _season()
+    ctx = SeasonContext(pbp)
+    assert ctx.plays is ctx.plays
+    assert set(ctx.plays['play_type'].astype(str)) == {'pass', 'run'}
+    assert len(ctx.pass_plays) + len(ctx.run_plays) == len(ctx.plays)
+    assert ctx.current_week == pbp['week'].max()
+
+    first = pbp[pbp['week'] <= 4]
+    ctx.set_pbp(first)
+    assert ctx.current_week == 4
+    assert len(ctx.plays) == first['play_type'].isin(['pass', 'run']).sum()
+
+def test_analyses_share_the_context_aggregates():
+    pbp = _season()
+    ctx = SeasonContext(pbp)
+    assert player_analysis.context_player_aggregates(ctx) is player_analysis.context_player_aggregates(ctx)
+
+    assert team_analysis.context_team_aggregates(ctx) is team_analysis.context_team_aggregates(ctx)
+    # the context rolls teams up from its game table instead of the plays
+    from_context = team_analysis.analyze_teams(ctx)
+    from_frame = team_analysis.analyze_teams(pbp)
+    from_context.index = from_context['team'].astype(str)
+    from_frame.index = from_frame['team'].astype(str)
+    for col in ('off_epa', 'def_epa', 'prediction_score'):
+        assert np.allclose(from_context[col], from_frame.loc[from_context.index, col])
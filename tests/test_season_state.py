@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src import data_loader, player_analysis, season_state, synthetic, team_analysis
+
+def _season():
+    pbp, _, _ = synthetic.generate([2024], seed=1)
+    return data_loader.optimize_dtypes(pbp)
+
+def test_weekly_updates_match_full_season(tmp_path):
+    pbp = _season()
+    for week in (1, 2, 3):
+        season_state.update(pbp[pbp['week'] == week], str(tmp_path))
+    state = season_state.load_state(str(tmp_path))
+    first = pbp[pbp['week'] <= 3]
+
+    whole = player_analysis.aggregate_players(first)
+    for name in player_analysis.PLAYER_GROUPS:
+        assert len(state['players'][name]) == len(whole[name])
+
+    _, _, _, teams = season_state.update(first.iloc[:0], str(tmp_path))
+    direct = first.groupby('posteam', observed=True)['epa'].agg(['mean', 'std'])
+    teams = teams.assign(team=teams['team'].astype(str)).set_index('team')
+    direct.index = direct.index.astype(str)
+    assert np.allclose(teams['off_epa'], direct.loc[teams.index, 'mean'])
+    assert np.allclose(teams['off_epa_sd'], direct.loc[teams.index, 'std'], atol=1e-5)
+
+def test_refolding_a_week_is_skipped(tmp_path):
+    pbp = _season()
+    week = pbp[pbp['week'] == 1]
+    season_state.update(week, str(tmp_path))
+    _, _, _, again = season_state.update(week, str(tmp_path))
+    once = team_analysis.rank_teams(team_analysis.aggregate_teams(week))
+    assert np.allclose(again.set_index('team')['off_epa'], once.set_index('team')['off_epa'])
+
+def test_load_week_reads_one_week_from_cache(tmp_path):
+    pbp, _, _ = synthetic.generate([2024], seed=1)
+    data_loader._store_season(pbp, 'pbp', 2024, str(tmp_path))
+    week = data_loader.load_week(2024, 5, columns=['week', 'epa'], offline=True, cache_dir=str(tmp_path))
+    assert len(week) == (pbp['week'] == 5).sum()
+    assert set(week['week'].unique()) == {5}
+
+def test_folding_another_season_raises(tmp_path):
+    pbp, _, _ = synthetic.generate([2023, 2024], seed=1)
+    season_state.update(pbp[(pbp['season'] == 2023) & (pbp['week'] == 1)], str(tmp_path))
+    with pytest.raises(ValueError):
+        season_state.update(pbp[(pbp['season'] == 2024) & (pbp['week'] == 1)], str(tmp_path))
+    with pytest.raises(ValueError):
+        season_state.fold(season_state.empty_state(), pbp[pbp['week'] == 2])
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from src import service
+from src.season_context import SeasonContext
+
+def test_season_load_does_not_block_other_requests():
+    store = service.SeasonStore()
+    started, release = threading.Event(), threading.Event()
+    loads = []
+
+    def load(year):
+        loads.append(year)
+        started.set()
+        release.wait(10)
+        return {'year': year}
+
+    store._load_season = load
+    loaders = [threading.Thread(target=store.season, args=(2024,)) for _ in range(3)]
+    for thread in loaders:
+        thread.start()
+    assert started.wait(10)
+
+    other = threading.Thread(target=store.cached, args=('other', lambda: b'ok'))
+    other.start()
+    other.join(2)
+    assert not other.is_alive()
+
+    release.set()
+    for thread in loaders:
+        thread.join(10)
+    assert loads == [2024]
+    assert store.season(2024) == {'year': 2024}
+    assert (store.hits, store.misses) == (0, 1)
+
+def test_failed_build_is_retried():
+    store = service.SeasonStore()
+
+    def fail():
+        raise LookupError("no data")
+
+    with pytest.raises(LookupError):
+        store.cached('key', fail)
+    assert store.cached('key', lambda: b'ok') == b'ok'
+    assert store.cached('key', lambda: b'other') == b'ok'
+    assert (store.hits, store.misses) == (1, 2)
+
+def test_response_cache_holds_at_most_cache_size_entries():
+    store = service.SeasonStore(cache_size=3)
+    for key in range(10):
+        store.cached(key, lambda key=key: key)
+        assert len(store._responses) <= 3
+    assert list(store._responses) == [7, 8, 9]
+    # a hit makes the key most recent, so the next miss evicts 8
+    store.cached(7, lambda: None)
+    store.cached(10, lambda: 10)
+    assert list(store._responses) == [9, 7, 10]
+
+def test_concurrent_memo_builds_once():
+    ctx = SeasonContext(None)
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.set()
+        release.wait(10)
+        return 'table'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(ctx.memo('table', build))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(10)
+    # other names are not held up by the build in flight
+    assert ctx.memo('other', lambda: 'other') == 'other'
+    release.set()
+    for thread in threads:
+        thread.join(10)
+    assert builds == [1] and results == ['table'] * 4
+
+    def fail():
+        raise LookupError("no data")
+
+    with pytest.raises(LookupError):
+        ctx.memo('broken', fail)
+    assert ctx.memo('broken', lambda: 'fixed') == 'fixed'
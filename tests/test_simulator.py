@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from src import simulator, synthetic, team_analysis
+
+@pytest.mark.parametrize('season', [2019, 2024])
+def test_bracket_plays_every_slot(season):
+    n_seeds = simulator.playoff_seeds(season)
+    byes = 8 - n_seeds
+    sims = 500
+    rng = np.random.default_rng(0)
+    seeds = np.stack([rng.permutation(len(simulator.TEAMS))[:2 * n_seeds].reshape(2, n_seeds)
+                      for _ in range(sims)])
+    net = rng.normal(0, 0.1, len(simulator.TEAMS))
+    reached = simulator.simulate_playoffs(seeds, net, rng)
+
+    divisional = reached['p_divisional_round']
+    assert divisional.shape == (sims, 8)
+    for c in range(2):
+        conf = seeds[:, c]
+        teams = divisional[:, 4 * c:4 * (c + 1)]
+        # bye seeds all advance; exactly one team of each wild-card game does
+        for seed in range(byes):
+            assert (teams == conf[:, [seed]]).any(axis=1).all()
+        for i in range((n_seeds - byes) // 2):
+            home = (teams == conf[:, [byes + i]]).any(axis=1)
+            away = (teams == conf[:, [n_seeds - 1 - i]]).any(axis=1)
+            assert (home ^ away).all()
+    assert reached['p_conference_round'].shape == (sims, 4)
+    assert reached['p_super_bowl'].shape == (sims, 2)
+
+@pytest.mark.parametrize('season', [2019, 2024])
+def test_round_probabilities_sum_to_bracket_size(season):
+    pbp, _, schedule = synthetic.generate([season], seed=1)
+    ratings = team_analysis.analyze_teams(pbp)
+    out = simulator.simulate_season(ratings, schedule, season, sims=2000, seed=0)
+    n_seeds = simulator.playoff_seeds(season)
+    expected = {'p_playoffs': 2 * n_seeds, 'p_division': 8, 'p_top_seed': 2, 'p_divisional_round': 8,
+                'p_conference_round': 4, 'p_super_bowl': 2, 'p_champion': 1}
+    for name, total in expected.items():
+        assert np.isclose(out[name].sum(), total), name
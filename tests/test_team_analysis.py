@@ -0,0 +1,28 @@
+import numpy as np
+
+from src import aggregates, data_loader, synthetic, team_analysis
+
+def _season():
+    pbp, _, _ = synthetic.generate([2024], seed=1)
+    return data_loader.optimize_dtypes(pbp)
+
+def test_analyze_teams_needs_only_epa_columns():
+    pbp = _season()
+    full = team_analysis.analyze_teams(pbp).set_index('team')
+    bare = team_analysis.analyze_teams(pbp[['posteam', 'defteam', 'epa']]).set_index('team')
+    assert np.allclose(bare['off_epa'], full.loc[bare.index, 'off_epa'])
+    assert np.allclose(bare['prediction_score'], full.loc[bare.index, 'prediction_score'])
+
+def test_missing_metric_aggregates_as_nan():
+    pbp = _season()
+    older = pbp.drop(columns=['xyac_epa'])
+    aggs = team_analysis.aggregate_teams(older)
+    means = aggregates.finalize(aggs['off'], aggregates.TRACKED_METRICS)
+    assert means['xyac_epa'].isna().all()
+    assert means['epa'].notna().all()
+
+    # A season with the metric still merges with one without it
+    both = team_analysis.combine_team_aggregates([aggs, team_analysis.aggregate_teams(pbp)])
+    merged = aggregates.finalize(both['off'], ['xyac_epa'])
+    whole = aggregates.finalize(team_analysis.aggregate_teams(pbp)['off'], ['xyac_epa'])
+    assert np.allclose(merged['xyac_epa'], whole['xyac_epa'])
@@ -0,0 +1,48 @@
+import numpy as np
+
+from src import visualizer
+
+def _place(x, y, labels, **kwargs):
+    fig, ax = visualizer._new_figure((8, 6))
+    ax.scatter(x, y)
+    drawn = visualizer.place_labels(ax, x, y, labels, **kwargs)
+    fig.canvas.draw()
+    renderer = fig.canvas.get_renderer()
+    texts = ax.texts
+    return drawn, [t.get_text() for t in texts], [t.get_window_extent(renderer) for t in texts]
+
+def _overlaps(boxes):
+    return [(a, b) for a in range(len(boxes)) for b in range(a + 1, len(boxes))
+            if boxes[a].overlaps(boxes[b])]
+
+def test_placed_labels_never_overlap():
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=(2, 200))
+    labels = [f'Player {i}' for i in range(200)]
+    drawn, texts, boxes = _place(x, y, labels, priority=-np.arange(200))
+    assert drawn == len(texts) > 0
+    assert not _overlaps(boxes)
+    # the highest-priority label always has a free position
+    assert 'Player 0' in texts
+
+def test_sparse_points_are_all_labelled():
+    x = np.arange(10.0)
+    labels = [f'T{i}' for i in range(10)]
+    drawn, texts, boxes = _place(x, x, labels)
+    assert drawn == 10 and sorted(texts) == sorted(labels)
+    assert not _overlaps(boxes)
+
+def test_crowded_labels_are_dropped_or_kept():
+    x = np.zeros(20)
+    labels = [f'Same spot {i}' for i in range(20)]
+    drawn, texts, _ = _place(x, x, labels)
+    # at most one label per candidate position; the rest are dropped
+    assert 0 < drawn <= len(visualizer.LABEL_POSITIONS) and len(texts) == drawn
+
+    drawn, texts, _ = _place(x, x, labels, drop_overlaps=False)
+    assert drawn == 20 and sorted(texts) == sorted(labels)
+
+def test_points_off_the_chart_are_skipped():
+    x = np.array([0.0, np.nan, 2.0])
+    drawn, texts, _ = _place(x, np.array([0.0, 1.0, 2.0]), ['a', 'b', 'c'])
+    assert drawn == 2 and sorted(texts) == ['a', 'c']